@@ -2,10 +2,13 @@
 """
 CSV 파일에 GitHub Pages 이미지 URL 컬럼을 추가하는 스크립트
 """
-import csv
-import shutil
 from pathlib import Path
 
+import asset_store
+import csv_stream
+import instrumentation
+
+@instrumentation.timed('url_columns')
 def add_github_urls_to_csv():
     """CSV에 GitHub Pages URL 컬럼 추가"""
     print("🔗 GitHub Pages URL 컬럼 추가 중...")
@@ -15,54 +18,27 @@ def add_github_urls_to_csv():
     github_base_url = "https://USERNAME.github.io/REPOSITORY"
 
     csv_file = Path("flag_quiz_data.csv")
-    updated_csv_file = Path("flag_quiz_data_with_urls.csv")
+    backup_file = Path("flag_quiz_data_before_github_urls.csv")
 
     if not csv_file.exists():
         print(f"❌ CSV 파일을 찾을 수 없습니다: {csv_file}")
         return False
 
-    # CSV 파일 읽기
-    with open(csv_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        headers = reader.fieldnames
-        rows = list(reader)
-
-    print(f"📊 읽어온 데이터: {len(rows)}개 행")
-
-    # 새 헤더에 image_url 컬럼 추가
-    new_headers = list(headers)
-    if 'image_url' not in new_headers:
+    def plan(headers):
+        """image_url 컬럼 위치를 정하고 행 변환 함수 반환"""
+        path_index = headers.index('flag_image_path')
+        url_prefix = f"{github_base_url}/canva_upload_ready/flag_images/svg/"
+        if 'image_url' in headers:
+            # 이미 있으면 URL만 다시 생성
+            url_index = headers.index('image_url')
+            return headers, lambda row: row[:url_index] + (url_prefix + row[path_index],) + row[url_index + 1:]
         # flag_image_path 다음에 image_url 추가
-        flag_path_index = new_headers.index('flag_image_path')
-        new_headers.insert(flag_path_index + 1, 'image_url')
-
-    # 각 행에 GitHub URL 추가
-    updated_rows = []
-    for row in rows:
-        new_row = {}
-        for header in new_headers:
-            if header == 'image_url':
-                # GitHub Pages URL 생성
-                flag_path = row['flag_image_path']
-                github_url = f"{github_base_url}/canva_upload_ready/flag_images/svg/{flag_path}"
-                new_row[header] = github_url
-            else:
-                new_row[header] = row.get(header, '')
-        updated_rows.append(new_row)
-
-    # 새 CSV 파일 저장
-    with open(updated_csv_file, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=new_headers)
-        writer.writeheader()
-        writer.writerows(updated_rows)
-
-    # 백업 후 원본 파일 교체
-    backup_file = Path("flag_quiz_data_before_github_urls.csv")
-    if backup_file.exists():
-        backup_file.unlink()
+        new_headers = headers[:path_index + 1] + ['image_url'] + headers[path_index + 1:]
+        return new_headers, lambda row: row[:path_index + 1] + (url_prefix + row[path_index],) + row[path_index + 1:]
 
-    shutil.move(csv_file, backup_file)
-    shutil.move(updated_csv_file, csv_file)
+    # 한 행씩 읽어서 URL을 넣고 바로 쓴 뒤 백업 후 원본 파일 교체
+    count = csv_stream.rewrite_csv(csv_file, plan, backup_file)
+    print(f"📊 처리한 데이터: {count}개 행")
 
     print("✅ GitHub Pages URL 컬럼 추가 완료!")
     print(f"  - 백업: {backup_file}")
@@ -70,7 +46,7 @@ def add_github_urls_to_csv():
 
     # 샘플 출력
     print("\n🔗 URL 샘플:")
-    for i, row in enumerate(updated_rows[:3]):
+    for row in csv_stream.head(csv_file):
         print(f"  {row['quiz_id']:3s}: {row['image_url']}")
     print("  ...")
 
@@ -87,7 +63,7 @@ def update_canva_csv():
     dest_csv = Path("canva_upload_ready/csv_data/flag_quiz_data.csv")
 
     if source_csv.exists() and dest_csv.parent.exists():
-        shutil.copy2(source_csv, dest_csv)
+        asset_store.publish(source_csv, dest_csv)
         print("✅ Canva 업로드 폴더 CSV 동기화 완료")
 
 def main():
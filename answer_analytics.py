@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+퀴즈 응답 로그 분석 → 국기별 실제 난이도 구간 산출
+- 응답 이벤트(문제 ID, 선택한 보기, 응답 시간)를 한 줄씩 스트리밍으로 집계 (수백만 줄도 메모리 일정)
+- 국기별 오답률(전체 평균으로 보정), 응답 시간 분포, 어떤 오답 보기와 헷갈렸는지 집계
+- 결과를 difficulty_tiers.json으로 저장 → classify_flags_by_difficulty.py가 하드코딩 목록 대신 사용
+
+입력 형식 (CSV 헤더 또는 JSON Lines 키, .gz 압축 가능):
+  question_id  퀴즈 CSV의 quiz_id 또는 country_filename
+  chosen       선택한 보기 (A~D 또는 보기 텍스트)
+  latency_ms   응답 시간 (선택)
+"""
+import argparse
+import csv
+import gzip
+import io
+import json
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+import catalog_cache
+import instrumentation
+
+QUIZ_CSV = Path("canva_upload_ready/csv_data/flag_quiz_data.csv")
+TIERS_FILE = Path("difficulty_tiers.json")
+
+TIER_NAMES = ['beginner', 'intermediate', 'high']
+OPTION_LETTERS = 'ABCD'
+MIN_ANSWERS = 30            # 이보다 응답이 적은 국기는 구간 산출에서 제외
+PRIOR_ANSWERS = 20          # 오답률 보정 강도 (전체 평균 오답률을 이만큼의 가상 응답으로 섞음)
+LATENCY_BUCKET_MS = 250     # 응답 시간 히스토그램 버킷 폭
+LATENCY_BUCKETS = 120       # 30초 이상은 마지막 버킷에 누적
+TOP_CONFUSIONS = 3
+
+class FlagStats:
+    """국기 1개의 누적 통계 (크기 고정: 카운터 + 고정 버킷 히스토그램 + 보기별 선택 수)"""
+
+    __slots__ = ('answers', 'correct', 'latency_total', 'latency_count', 'latency_buckets', 'chosen')
+
+    def __init__(self):
+        self.answers = 0
+        self.correct = 0
+        self.latency_total = 0.0
+        self.latency_count = 0
+        self.latency_buckets = [0] * LATENCY_BUCKETS
+        self.chosen = [0, 0, 0, 0]
+
+    def add(self, option_index, is_correct, latency_ms):
+        """응답 1건 반영"""
+        self.answers += 1
+        self.correct += is_correct
+        self.chosen[option_index] += 1
+        if latency_ms is not None and latency_ms >= 0:
+            self.latency_total += latency_ms
+            self.latency_count += 1
+            bucket = min(int(latency_ms // LATENCY_BUCKET_MS), LATENCY_BUCKETS - 1)
+            self.latency_buckets[bucket] += 1
+
+    def median_latency_ms(self):
+        """버킷 중앙값 기준 근사 중앙 응답 시간"""
+        if not self.latency_count:
+            return None
+        target = self.latency_count / 2
+        seen = 0
+        for bucket, count in enumerate(self.latency_buckets):
+            seen += count
+            if seen >= target:
+                return (bucket + 0.5) * LATENCY_BUCKET_MS
+        return LATENCY_BUCKETS * LATENCY_BUCKET_MS
+
+def load_questions(quiz_csv=QUIZ_CSV):
+    """문제 ID(quiz_id, country_filename) → (국기 이름, 보기 4개, 정답 번호)"""
+    questions = {}
+    for row in catalog_cache.load_rows(quiz_csv):
+        options = [row['option_a'], row['option_b'], row['option_c'], row['option_d']]
+        entry = (row['country_filename'], options, OPTION_LETTERS.index(row['correct_option']))
+        questions[row['quiz_id']] = entry
+        questions[row['country_filename']] = entry
+    return questions
+
+def open_log(path):
+    """로그 파일을 텍스트 스트림으로 열기 (.gz는 압축 해제하며 읽음)"""
+    if str(path).endswith('.gz'):
+        return io.TextIOWrapper(gzip.open(path, 'rb'), encoding='utf-8', newline='')
+    return open(path, 'r', encoding='utf-8', newline='')
+
+def iter_events(path):
+    """로그 한 줄씩 (question_id, chosen, latency_ms) 이터레이터"""
+    with open_log(path) as stream:
+        jsonl = '.jsonl' in Path(path).name or '.json' in Path(path).suffixes
+        rows = (json.loads(line) for line in stream if line.strip()) if jsonl else csv.DictReader(stream)
+        for row in rows:
+            latency = row.get('latency_ms')
+            try:
+                latency = float(latency) if latency not in (None, '') else None
+            except ValueError:
+                latency = None
+            yield str(row.get('question_id', '')).strip(), str(row.get('chosen', '')).strip(), latency
+
+def resolve_option(chosen, options):
+    """선택 값(A~D 또는 보기 텍스트) → 보기 번호 (알 수 없으면 None)"""
+    if len(chosen) == 1 and chosen.upper() in OPTION_LETTERS:
+        return OPTION_LETTERS.index(chosen.upper())
+    try:
+        return options.index(chosen)
+    except ValueError:
+        return None
+
+@instrumentation.timed('answer_analytics')
+def aggregate(log_paths, questions):
+    """로그 파일들을 스트리밍 집계 → ({국기: FlagStats}, 처리 통계)"""
+    stats = {}
+    counters = {'events': 0, 'unknown_question': 0, 'unknown_option': 0}
+
+    for path in log_paths:
+        for question_id, chosen, latency in iter_events(path):
+            counters['events'] += 1
+            question = questions.get(question_id)
+            if question is None:
+                counters['unknown_question'] += 1
+                continue
+            slug, options, correct_index = question
+            option_index = resolve_option(chosen, options)
+            if option_index is None:
+                counters['unknown_option'] += 1
+                continue
+            flag = stats.get(slug)
+            if flag is None:
+                flag = stats[slug] = FlagStats()
+            flag.add(option_index, option_index == correct_index, latency)
+
+    return stats, counters
+
+def score_flags(stats, questions, min_answers=MIN_ANSWERS):
+    """국기별 난이도 지표 (보정 오답률, 중앙 응답 시간, 자주 헷갈린 보기)"""
+    total_answers = sum(flag.answers for flag in stats.values())
+    total_wrong = sum(flag.answers - flag.correct for flag in stats.values())
+    global_error = total_wrong / total_answers if total_answers else 0.0
+
+    scores = {}
+    for slug, flag in stats.items():
+        _, options, correct_index = questions[slug]
+        wrong = flag.answers - flag.correct
+        confusions = sorted(
+            ((options[i], count) for i, count in enumerate(flag.chosen) if i != correct_index and count),
+            key=lambda item: -item[1],
+        )[:TOP_CONFUSIONS]
+        scores[slug] = {
+            'answers': flag.answers,
+            'error_rate': round(wrong / flag.answers, 4),
+            'difficulty': round((wrong + global_error * PRIOR_ANSWERS) / (flag.answers + PRIOR_ANSWERS), 4),
+            'median_latency_ms': flag.median_latency_ms(),
+            'mean_latency_ms': round(flag.latency_total / flag.latency_count, 1) if flag.latency_count else None,
+            'confused_with': [[name, count] for name, count in confusions],
+            'scored': flag.answers >= min_answers,
+        }
+    return scores, global_error
+
+def assign_tiers(scores):
+    """난이도 순 정렬 후 3등분 (쉬운 순 beginner → high, 동점은 응답 시간이 짧은 쪽이 쉬움)"""
+    ranked = sorted(
+        (slug for slug, score in scores.items() if score['scored']),
+        key=lambda slug: (scores[slug]['difficulty'], scores[slug]['median_latency_ms'] or 0, slug),
+    )
+    size = len(ranked) // len(TIER_NAMES)
+    return {
+        'beginner': ranked[:size],
+        'intermediate': ranked[size:size * 2],
+        'high': ranked[size * 2:],
+    }
+
+def write_tiers(data, path=TIERS_FILE):
+    """임시 파일에 쓴 뒤 원자적으로 교체"""
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent if str(path.parent) else '.', suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+def load_tiers(path=TIERS_FILE):
+    """저장된 난이도 구간 로드 (없거나 손상되면 None)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    tiers = data.get('tiers')
+    if not tiers or not all(name in tiers for name in TIER_NAMES):
+        return None
+    return data
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="퀴즈 응답 로그로 국기 난이도 구간 산출")
+    parser.add_argument('logs', nargs='+', help="응답 로그 파일 (CSV / JSON Lines, .gz 가능)")
+    parser.add_argument('--min-answers', type=int, default=MIN_ANSWERS, help="구간 산출 최소 응답 수")
+    parser.add_argument('--output', default=str(TIERS_FILE), help="결과 JSON 경로")
+    parser.add_argument('--quiet', action='store_true', help="국기별 출력 생략")
+    args = parser.parse_args()
+    if args.quiet:
+        instrumentation.set_quiet()
+
+    print("📈 퀴즈 응답 로그 분석 시작...")
+    print("=" * 60)
+
+    if not QUIZ_CSV.exists():
+        print(f"❌ 퀴즈 CSV를 찾을 수 없습니다: {QUIZ_CSV}")
+        return False
+    missing = [path for path in args.logs if not Path(path).exists()]
+    if missing:
+        print(f"❌ 로그 파일을 찾을 수 없습니다: {', '.join(missing)}")
+        return False
+
+    # 1. 문제 정보 로드 후 로그 스트리밍 집계
+    questions = load_questions()
+    stats, counters = aggregate(args.logs, questions)
+    print(f"✅ 이벤트 {counters['events']:,}건 처리 (국기 {len(stats)}개)")
+    if counters['unknown_question'] or counters['unknown_option']:
+        print(f"⚠️  알 수 없는 문제 {counters['unknown_question']:,}건, 알 수 없는 보기 {counters['unknown_option']:,}건 제외")
+
+    # 2. 국기별 난이도 지표
+    scores, global_error = score_flags(stats, questions, args.min_answers)
+    scored = sum(1 for score in scores.values() if score['scored'])
+    print(f"📊 전체 오답률: {global_error:.1%}, 구간 산출 대상: {scored}개 (응답 {args.min_answers}건 이상)")
+    if not scored:
+        print("❌ 구간을 산출할 만큼 응답이 쌓인 국기가 없습니다.")
+        return False
+
+    # 3. 구간 배정 및 저장
+    tiers = assign_tiers(scores)
+    write_tiers({
+        'source': 'answer_logs',
+        'generated': datetime.now().isoformat(),
+        'logs': [str(path) for path in args.logs],
+        'events': counters['events'],
+        'min_answers': args.min_answers,
+        'global_error_rate': round(global_error, 4),
+        'tiers': tiers,
+        'flags': dict(sorted(scores.items())),
+    }, args.output)
+
+    for name in TIER_NAMES:
+        print(f"  - {name}: {len(tiers[name])}개")
+    if not args.quiet:
+        print("\n🤔 가장 많이 헷갈린 국기:")
+        for slug in sorted(scores, key=lambda s: -scores[s]['difficulty'])[:10]:
+            confused = ', '.join(f"{name}({count})" for name, count in scores[slug]['confused_with'])
+            print(f"  {slug}: 오답률 {scores[slug]['error_rate']:.1%} → {confused or '-'}")
+
+    print(f"\n📁 결과 파일: {args.output}")
+    return True
+
+if __name__ == "__main__":
+    if main():
+        print("\n🎉 난이도 분석이 완료되었습니다!")
+    else:
+        print("\n💥 분석 중 오류가 발생했습니다.")
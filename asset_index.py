@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+에셋 파일시스템 스냅샷 인덱스
+- os.scandir 한 번으로 모든 에셋의 경로, 크기, 수정시각, 해시를 기록해 .asset_index.json에 저장
+- 각 단계는 os.listdir / glob 대신 이 인덱스를 읽음
+- 폴더 수정시각이 그대로면 다시 나열하지 않고, 바뀐 폴더만 다시 스캔 (변경되지 않은 파일의 해시는 재사용)
+- 해시는 필요할 때만 계산: 목록 조회(list_dir/files/count)는 해시하지 않고,
+  entry() / walk(hashes=True)는 파일별 stat을 확인해 제자리 수정된 파일도 다시 해시
+"""
+import atexit
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from asset_store import hash_file
+
+INDEX_FILE = Path(".asset_index.json")
+DEFAULT_ROOTS = ("country-flags", "canva_upload_ready")
+INDEX_VERSION = 1
+
+def _key(path):
+    """인덱스 키 (작업 폴더 기준 POSIX 경로)"""
+    return Path(os.path.normpath(path)).as_posix()
+
+class AssetIndex:
+    """폴더별 파일 목록 + (크기, 수정시각, 해시) 인덱스
+
+    dirs 구조: {폴더: {'mtime_ns': int, 'files': {이름: [크기, 수정시각, 해시]}, 'subdirs': [이름]}}
+    해시가 아직 계산되지 않은 파일은 None (entry() / walk(hashes=True)에서 채움)
+
+    폴더 수정시각은 파일 추가·삭제·이름 변경에만 바뀌므로, 목록은 항상 최신이지만
+    저장된 크기·수정시각은 제자리 수정을 반영하지 않을 수 있다 (해시를 돌려줄 때는 파일별 stat으로 확인).
+    """
+
+    def __init__(self, path=INDEX_FILE):
+        self.path = Path(path)
+        self.dirs = {}
+        self.dirty = False
+        self.hashed = 0
+
+    def load(self):
+        """저장된 인덱스 로드 (버전이 다르거나 손상되면 빈 인덱스)"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == INDEX_VERSION:
+                self.dirs = data.get('dirs', {})
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.dirs = {}
+        return self
+
+    def save(self):
+        """변경 사항이 있으면 임시 파일에 쓴 뒤 원자적으로 교체"""
+        if not self.dirty:
+            return
+        directory = self.path.parent if str(self.path.parent) else Path('.')
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_VERSION, 'dirs': self.dirs}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    def _scan_dir(self, key, dir_mtime_ns):
+        """폴더 1개를 scandir로 다시 나열 (크기·수정시각이 같은 파일은 해시 재사용, 새 파일은 나중에 해시)"""
+        previous = self.dirs.get(key, {}).get('files', {})
+        files = {}
+        subdirs = []
+        with os.scandir(key) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.name)
+                elif entry.is_file():
+                    st = entry.stat()
+                    old = previous.get(entry.name)
+                    if old and old[0] == st.st_size and old[1] == st.st_mtime_ns:
+                        files[entry.name] = old
+                    else:
+                        files[entry.name] = [st.st_size, st.st_mtime_ns, None]
+        self.dirs[key] = {'mtime_ns': dir_mtime_ns, 'files': files, 'subdirs': sorted(subdirs)}
+        self.dirty = True
+
+    def _check_files(self, key):
+        """폴더 목록은 그대로지만 파일 내용이 바뀌었을 수 있을 때 파일별 stat 확인"""
+        files = self.dirs[key]['files']
+        for name, entry in files.items():
+            try:
+                st = os.stat(os.path.join(key, name))
+            except FileNotFoundError:
+                continue
+            if entry[0] != st.st_size or entry[1] != st.st_mtime_ns:
+                files[name] = [st.st_size, st.st_mtime_ns, None]
+                self.dirty = True
+
+    def _fresh_entry(self, key, name):
+        """파일 1개의 stat을 확인해 (크기, 수정시각, 해시) 반환 (바뀌었거나 해시가 없으면 해시) - 없으면 None"""
+        files = self.dirs[key]['files']
+        entry = files.get(name)
+        if entry is None:
+            return None
+        path = os.path.join(key, name)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        if entry[2] is None or entry[0] != st.st_size or entry[1] != st.st_mtime_ns:
+            entry = files[name] = [st.st_size, st.st_mtime_ns, hash_file(path)]
+            self.hashed += 1
+            self.dirty = True
+        return entry
+
+    def refresh_dir(self, path, recursive=False, check_files=False):
+        """폴더 1개 갱신: 폴더 수정시각이 같으면 다시 나열하지 않음"""
+        key = _key(path)
+        try:
+            dir_mtime_ns = os.stat(key).st_mtime_ns
+        except FileNotFoundError:
+            if key in self.dirs:
+                self._forget(key)
+            return False
+
+        cached = self.dirs.get(key)
+        if cached is None or cached['mtime_ns'] != dir_mtime_ns:
+            self._scan_dir(key, dir_mtime_ns)
+        elif check_files:
+            self._check_files(key)
+
+        if recursive:
+            # 하위 폴더 변경은 상위 폴더 수정시각에 반영되지 않으므로 하위 폴더도 각각 확인
+            for name in self.dirs[key]['subdirs']:
+                self.refresh_dir(os.path.join(key, name), recursive=True, check_files=check_files)
+        return True
+
+    def _forget(self, key):
+        """사라진 폴더와 그 하위 폴더 항목 제거"""
+        prefix = key + '/'
+        for existing in [k for k in self.dirs if k == key or k.startswith(prefix)]:
+            del self.dirs[existing]
+        self.dirty = True
+
+    def refresh(self, roots=DEFAULT_ROOTS, check_files=False):
+        """루트 폴더들 전체 갱신"""
+        for root in roots:
+            self.refresh_dir(root, recursive=True, check_files=check_files)
+        return self
+
+    def list_dir(self, path, suffix=None):
+        """폴더의 파일 이름 목록 (os.listdir 대체, 정렬됨, 해시하지 않음)"""
+        if not self.refresh_dir(path):
+            raise FileNotFoundError(path)
+        names = self.dirs[_key(path)]['files']
+        if suffix:
+            return sorted(name for name in names if name.endswith(suffix))
+        return sorted(names)
+
+    def files(self, path, suffix=None):
+        """폴더의 파일 Path 목록 (glob 대체)"""
+        base = Path(path)
+        return [base / name for name in self.list_dir(path, suffix)]
+
+    def count(self, path, suffix=None):
+        """폴더의 파일 수 (없는 폴더는 0)"""
+        try:
+            return len(self.list_dir(path, suffix))
+        except FileNotFoundError:
+            return 0
+
+    def entry(self, path):
+        """파일 1개의 (크기, 수정시각, 해시) - 제자리 수정도 반영, 없으면 None"""
+        path = Path(path)
+        key = _key(path.parent)
+        if not self.refresh_dir(key):
+            return None
+        return self._fresh_entry(key, path.name)
+
+    def walk(self, root, hashes=False):
+        """root 아래 모든 파일의 (경로, [크기, 수정시각, 해시]) 이터레이터
+
+        hashes=False면 저장된 값을 그대로 돌려줌 (해시는 None일 수 있음),
+        hashes=True면 파일별 stat을 확인하고 필요한 파일만 해시.
+        """
+        if not self.refresh_dir(root, recursive=True):
+            return
+        stack = [_key(root)]
+        while stack:
+            key = stack.pop()
+            node = self.dirs[key]
+            for name, entry in sorted(node['files'].items()):
+                if hashes:
+                    entry = self._fresh_entry(key, name)
+                    if entry is None:
+                        continue
+                yield Path(key) / name, entry
+            stack.extend(os.path.join(key, name) for name in reversed(node['subdirs']))
+
+_shared_index = None
+
+def get_index():
+    """프로세스 공용 인덱스 (종료 시 자동 저장)"""
+    global _shared_index
+    if _shared_index is None:
+        _shared_index = AssetIndex().load()
+        atexit.register(_shared_index.save)
+    return _shared_index
+
+def main():
+    """메인 실행 함수: 전체 스캔(파일별 변경 확인 포함) 후 저장"""
+    print("🗂️ 에셋 인덱스 갱신 시작...")
+    print("=" * 60)
+
+    index = get_index()
+    index.refresh(check_files=True)
+    index.save()
+
+    for root in DEFAULT_ROOTS:
+        if not Path(root).exists():
+            print(f"⚠️  폴더 없음: {root}")
+            continue
+        count = 0
+        total = 0
+        for _, (size, _, _) in index.walk(root, hashes=True):
+            count += 1
+            total += size
+        print(f"✅ {root}: {count}개 파일 ({total / 1024 / 1024:.2f}MB)")
+
+    print(f"\n🔑 새로 해시한 파일: {index.hashed}개")
+    print(f"📁 인덱스 위치: {index.path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+내용 주소 기반(content-addressed) 에셋 저장소
+- SVG/PNG/CSV 등 모든 산출물을 SHA-256 해시 기준으로 한 번만 저장
+- 사람이 읽는 경로(canva_upload_ready/..., 백업 파일 등)는 저장소 객체의 CoW 복제(reflink)로 생성,
+  지원하지 않는 파일시스템은 읽기 전용 하드링크 (다른 볼륨이라 링크도 안 되면 복사)
+- 제자리에서 다시 쓰는 작업 파일(루트 CSV)은 하드링크하지 않음 (저장소 객체까지 바뀌지 않도록)
+- 백업은 이미 저장된 객체에 대한 참조(ref) + 복제/링크 하나로 처리
+"""
+import errno
+import hashlib
+import json
+import os
+import shutil
+import stat
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: CoW 복제 불가 (하드링크로 대체)
+    fcntl = None
+
+STORE_DIR = Path(".asset_store")
+OBJECTS_DIR = STORE_DIR / "objects"
+REFS_DIR = STORE_DIR / "refs"
+INDEX_FILE = STORE_DIR / "index.json"
+
+CHUNK_SIZE = 1024 * 1024
+
+# 중복 제거 대상 확장자
+DEDUPE_SUFFIXES = {'.svg', '.png', '.csv', '.json'}
+
+FICLONE = 0x40049409            # linux/fs.h: 블록을 공유하는 복제 (btrfs, XFS 등)
+PUBLISHED_MODE = stat.S_IRUSR | stat.S_IWUSR | stat.S_IRGRP | stat.S_IROTH
+
+_index_cache = None
+
+def hash_file(path):
+    """파일 내용의 SHA-256 해시 (청크 단위로 읽음)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def object_path(digest):
+    """해시에 해당하는 객체 파일 경로 (앞 2글자로 폴더 분산)"""
+    return OBJECTS_DIR / digest[:2] / digest[2:]
+
+def _load_index():
+    """경로 → (크기, 수정시각, 해시) 인덱스 로드"""
+    global _index_cache
+    if _index_cache is None:
+        try:
+            with open(INDEX_FILE, 'r', encoding='utf-8') as f:
+                _index_cache = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            _index_cache = {}
+    return _index_cache
+
+def save_index():
+    """인덱스를 임시 파일에 쓴 뒤 원자적으로 교체 (put_file/materialize를 여러 번 호출한 뒤 한 번 저장)"""
+    if _index_cache is None:
+        return
+    STORE_DIR.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=STORE_DIR, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(_index_cache, f, ensure_ascii=False)
+    os.replace(tmp_path, INDEX_FILE)
+
+def digest_of(path):
+    """파일 해시 조회 (크기와 수정시각이 같으면 인덱스 값 재사용)"""
+    path = Path(path)
+    st = path.stat()
+    key = str(path.resolve())
+    index = _load_index()
+    entry = index.get(key)
+    if entry and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+        return entry[2]
+
+    digest = hash_file(path)
+    index[key] = [st.st_size, st.st_mtime_ns, digest]
+    return digest
+
+def put_file(path):
+    """파일을 저장소에 넣고 해시 반환 (같은 내용이 이미 있으면 저장 생략)"""
+    path = Path(path)
+    digest = digest_of(path)
+    target = object_path(digest)
+
+    if not target.exists():
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=target.parent, suffix='.tmp')
+        os.close(fd)
+        shutil.copy2(path, tmp_path)
+        # 저장소 객체는 읽기 전용으로 보관 (하드링크된 경로에서 제자리 수정되지 않도록)
+        os.chmod(tmp_path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+        os.replace(tmp_path, target)
+
+    return digest
+
+def _clone(source, dest):
+    """source를 dest(빈 파일)에 CoW 복제 → 복제했으면 True"""
+    if fcntl is None:
+        return False
+    with open(source, 'rb') as src, open(dest, 'wb') as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            return True
+        except OSError:
+            return False
+
+def place(digest, dest, link=True):
+    """저장소 객체를 dest에 배치 (임시 경로 → 원자적 교체) → 블록/inode를 공유했으면 True
+
+    CoW 복제 → (link=True면) 읽기 전용 하드링크 → 복사 순으로 시도.
+    """
+    source = object_path(digest)
+    dest = Path(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=dest.parent, suffix='.tmp')
+    os.close(fd)
+    try:
+        shared = _clone(source, tmp_path)
+        if shared:
+            os.chmod(tmp_path, PUBLISHED_MODE)
+        elif link and _link(source, tmp_path):
+            shared = True
+        else:
+            shutil.copyfile(source, tmp_path)
+            os.chmod(tmp_path, PUBLISHED_MODE)
+        os.replace(tmp_path, dest)
+    except BaseException:
+        if os.path.lexists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+    st = dest.stat()
+    _load_index()[str(dest.resolve())] = [st.st_size, st.st_mtime_ns, digest]
+    return shared
+
+def _link(source, tmp_path):
+    """tmp_path 자리에 source 하드링크 생성 → 링크했으면 True (다른 볼륨 등 불가능하면 False)"""
+    os.unlink(tmp_path)
+    try:
+        os.link(source, tmp_path)
+        return True
+    except OSError as e:
+        if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP):
+            raise
+        return False
+
+def materialize(digest, dest, link=True):
+    """저장소 객체를 사람이 읽는 경로에 배치 (이미 같은 내용이면 그대로)"""
+    dest = Path(dest)
+    if dest.exists() and not dest.is_symlink() and digest_of(dest) == digest:
+        return dest
+    place(digest, dest, link)
+    return dest
+
+def publish(source, dest):
+    """source 내용을 저장소에 넣고 dest 경로에 링크로 배치 (shutil.copy2 대체)"""
+    digest = put_file(source)
+    materialize(digest, dest)
+    save_index()
+    return dest
+
+def publish_file(source, dest):
+    """shutil.copytree(copy_function=...)용 래퍼"""
+    publish(source, dest)
+    return dest
+
+def write_ref(name, digest):
+    """이름 있는 참조 기록 (예: backup/flag_quiz_data_backup.csv)"""
+    ref_path = REFS_DIR / name
+    ref_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(ref_path, 'w', encoding='utf-8') as f:
+        json.dump({'digest': digest, 'created': datetime.now().isoformat()}, f)
+
+def read_ref(name):
+    """참조가 가리키는 해시 (없으면 None)"""
+    try:
+        with open(REFS_DIR / name, 'r', encoding='utf-8') as f:
+            return json.load(f)['digest']
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        return None
+
+def backup_file(source, backup_path):
+    """백업 생성: 저장소 참조 + 복제/링크
+
+    source가 이미 저장소를 거쳐 만들어진 파일이면 해시도 인덱스에서 재사용되고,
+    백업 경로는 파일 크기와 무관하게 CoW 복제나 하드링크 하나로 만들어진다 (내용은 저장소에 한 번만 저장).
+    """
+    digest = put_file(source)
+    materialize(digest, backup_path)
+    write_ref(f"backup/{Path(backup_path).name}", digest)
+    save_index()
+    return digest
+
+def dedupe_tree(root):
+    """기존 폴더 파일을 저장소 객체의 CoW 복제(또는 하드링크)로 교체 → (교체한 파일 수, 공유로 절약한 바이트 수)"""
+    root = Path(root)
+    saved_bytes = 0
+    replaced_count = 0
+
+    for path in sorted(root.rglob('*')):
+        if not path.is_file() or path.is_symlink() or path.suffix.lower() not in DEDUPE_SUFFIXES:
+            continue
+        if STORE_DIR.resolve() in path.resolve().parents:
+            continue
+
+        digest = put_file(path)
+        try:
+            if os.path.samefile(object_path(digest), path):
+                continue
+        except OSError:
+            pass
+
+        if place(digest, path):
+            saved_bytes += path.stat().st_size
+            replaced_count += 1
+
+    save_index()
+    return replaced_count, saved_bytes
+
+def store_stats():
+    """저장소 객체 수와 전체 크기"""
+    count = 0
+    total = 0
+    if OBJECTS_DIR.exists():
+        for path in OBJECTS_DIR.rglob('*'):
+            if path.is_file() and not path.name.endswith('.tmp'):
+                count += 1
+                total += path.stat().st_size
+    return count, total
+
+def main():
+    """메인 실행 함수: 기존 산출물을 저장소로 옮기고 중복 제거"""
+    print("🗄️ 에셋 저장소 중복 제거 시작...")
+    print("=" * 60)
+
+    targets = [Path("canva_upload_ready"), Path(".")]
+    for target in targets:
+        if not target.exists():
+            print(f"⚠️  폴더 없음: {target}")
+            continue
+
+        if target == Path("."):
+            # 루트는 하위 폴더를 제외한 CSV 스냅샷들만 처리 (다른 스크립트가 제자리에서 다시 쓰므로 하드링크 안 함)
+            stored_count = 0
+            for csv_path in sorted(target.glob("*.csv")):
+                materialize(put_file(csv_path), csv_path, link=False)
+                stored_count += 1
+            save_index()
+            print(f"✅ 루트 CSV {stored_count}개 저장소 연결")
+            continue
+
+        replaced_count, saved_bytes = dedupe_tree(target)
+        print(f"✅ {target}: {replaced_count}개 파일 복제/링크로 교체, 공유로 {saved_bytes / 1024:.1f}KB 절약")
+
+    count, total = store_stats()
+    print("\n" + "=" * 60)
+    print(f"📊 저장소 객체: {count}개 ({total / 1024 / 1024:.2f}MB)")
+    print(f"📁 저장소 위치: {STORE_DIR}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+파이프라인 단계별 성능 벤치마크 스크립트
+- 255 / 10k / 100k개 규모의 합성 카탈로그 생성 (단순 SVG + countries.json + 퀴즈 CSV)
+- rename, 분류, 퀴즈 생성, 정렬, URL 컬럼, export, 래스터화 단계를 각각 별도 프로세스에서 측정
+- 소요 시간, 최대 RSS, 파일 작업 횟수, 읽기/쓰기 바이트를 JSON으로 저장하고 이전 결과와 비교
+"""
+import argparse
+import contextlib
+import csv
+import io
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+RESULTS_DIR = Path("benchmark_results")
+DEFAULT_SIZES = [255, 10_000, 100_000]
+DEFAULT_TIMEOUT = 600   # 단계당 최대 실행 시간 (초)
+REGRESSION_THRESHOLD = 1.2
+
+DIFFICULTIES = ['beginner', 'intermediate', 'high']
+
+# 파일 작업으로 집계할 감사(audit) 이벤트
+FILE_EVENTS = {
+    'open', 'os.listdir', 'os.scandir', 'os.remove', 'os.rename', 'os.mkdir', 'os.rmdir',
+    'os.link', 'os.symlink', 'os.chmod', 'shutil.copyfile', 'shutil.copymode', 'shutil.copystat',
+    'shutil.copytree', 'shutil.move', 'shutil.rmtree', 'glob.glob',
+}
+
+# ---------------------------------------------------------------------------
+# 합성 데이터 생성
+# ---------------------------------------------------------------------------
+
+def synthetic_countries(size):
+    """합성 국가 코드 → 국가명 매핑"""
+    return {f"X{i:06d}": f"Synthland {i}" for i in range(1, size + 1)}
+
+def synthetic_svg(rng):
+    """3색 가로 줄무늬 단순 국기 SVG"""
+    colors = [f"#{rng.randrange(0x1000000):06x}" for _ in range(3)]
+    stripes = "".join(
+        f'<rect y="{i * 200}" width="900" height="200" fill="{color}"/>'
+        for i, color in enumerate(colors)
+    )
+    return f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 900 600">{stripes}</svg>'
+
+def slug_for(name):
+    """합성 국가명 → 파일명 slug (rename_flags.clean_filename과 같은 결과)"""
+    return name.lower().replace(' ', '_')
+
+def build_source_tree(base_dir, size, seed=42):
+    """규모별 원본 SVG와 countries.json 생성 (단계별 작업 폴더는 여기서 하드링크)"""
+    rng = random.Random(seed)
+    countries = synthetic_countries(size)
+    svg_dir = base_dir / "svg"
+    svg_dir.mkdir(parents=True)
+
+    for code in countries:
+        (svg_dir / f"{code.lower()}.svg").write_text(synthetic_svg(rng), encoding='utf-8')
+
+    with open(base_dir / "countries.json", 'w', encoding='utf-8') as f:
+        json.dump(countries, f, ensure_ascii=False, indent=2)
+
+    return countries
+
+def link_svgs(countries, source_dir, dest_dir, name_fn):
+    """원본 SVG를 대상 폴더에 하드링크 (복사 비용 없이 입력 준비)"""
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    for code, name in countries.items():
+        src = source_dir / "svg" / f"{code.lower()}.svg"
+        dst = dest_dir / f"{name_fn(code, name)}.svg"
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copy2(src, dst)
+
+def write_synthetic_quiz_csv(countries, path, seed=42, shuffled=True):
+    """difficulty_number가 포함된 합성 퀴즈 CSV 생성"""
+    rng = random.Random(seed)
+    names = list(countries.values())
+    rows = []
+    per_tier = {}
+    for index, name in enumerate(names):
+        difficulty = DIFFICULTIES[index % 3]
+        per_tier[difficulty] = per_tier.get(difficulty, 0) + 1
+        number = per_tier[difficulty]
+        options = [name] + rng.sample(names, 3)
+        rng.shuffle(options)
+        prefix = {'beginner': 'begin', 'intermediate': 'inter', 'high': 'high'}[difficulty]
+        rows.append({
+            'quiz_id': index + 1,
+            'difficulty': difficulty,
+            'difficulty_number': f"{difficulty}{number:02d}",
+            'country_filename': slug_for(name),
+            'country_name': name,
+            'flag_image_path': f"{difficulty}/{prefix}{number:02d}_{slug_for(name)}.svg",
+            'question_text': "Which country does this flag belong to?",
+            'option_a': options[0], 'option_b': options[1],
+            'option_c': options[2], 'option_d': options[3],
+            'correct_answer': name,
+            'correct_option': 'ABCD'[options.index(name)],
+        })
+    if shuffled:
+        rng.shuffle(rows)
+
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+    return rows
+
+# ---------------------------------------------------------------------------
+# 단계 정의: 이름 → (입력 준비 함수, 실행 함수)
+# 준비 함수는 부모 프로세스에서, 실행 함수는 측정용 자식 프로세스에서 호출
+# ---------------------------------------------------------------------------
+
+def setup_rename(workdir, source_dir, countries):
+    """rename 입력: country-flags/svg/*.svg + countries.json"""
+    flags_dir = workdir / "country-flags"
+    link_svgs(countries, source_dir, flags_dir / "svg", lambda code, name: code.lower())
+    shutil.copy2(source_dir / "countries.json", flags_dir / "countries.json")
+
+def run_rename():
+    import rename_flags
+    return rename_flags.rename_flag_files()
+
+def setup_classify(workdir, source_dir, countries):
+    """분류 입력: country-flags/svg_renamed/*.svg"""
+    link_svgs(countries, source_dir, workdir / "country-flags" / "svg_renamed",
+              lambda code, name: slug_for(name))
+
+def run_classify():
+    import classify_flags_by_difficulty
+    return classify_flags_by_difficulty.create_difficulty_classification()
+
+def setup_quiz(workdir, source_dir, countries):
+    """퀴즈 생성 입력: 난이도 폴더 3개에 1/3씩 + countries.json"""
+    flags_dir = workdir / "country-flags"
+    flags_dir.mkdir(parents=True)
+    shutil.copy2(source_dir / "countries.json", flags_dir / "countries.json")
+    items = list(countries.items())
+    for index, difficulty in enumerate(DIFFICULTIES):
+        link_svgs(dict(items[index::3]), source_dir, flags_dir / "svg_renamed" / difficulty,
+                  lambda code, name: slug_for(name))
+
+def run_quiz():
+    import create_canva_quiz_data
+    random.seed(42)
+    return create_canva_quiz_data.create_quiz_csv()
+
+def setup_quiz_csv(workdir, source_dir, countries):
+    """정렬 / URL 입력: 순서가 섞인 합성 flag_quiz_data.csv"""
+    write_synthetic_quiz_csv(countries, workdir / "flag_quiz_data.csv")
+
+def run_sort():
+    import sort_csv_by_difficulty
+    return sort_csv_by_difficulty.sort_csv_by_difficulty_number()
+
+def run_urls():
+    import add_github_urls
+    return add_github_urls.add_github_urls_to_csv()
+
+def setup_export(workdir, source_dir, countries):
+    """export 입력: 합성 CSV를 가져온 카탈로그 DB"""
+    rows = write_synthetic_quiz_csv(countries, workdir / "flag_quiz_data.csv", shuffled=False)
+    with open(workdir / "flag_quiz_data_with_sets.csv", 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['set_id', 'quiz_id', 'country_filename', 'flag_image_path'])
+        for index, row in enumerate(rows):
+            set_id = f"Set_{index // 3 + 1:02d}"
+            writer.writerow([set_id, index + 1, row['country_filename'],
+                             f"{set_id}_{index + 1:03d}_({row['country_filename']}).png"])
+
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        import quiz_catalog
+        conn = quiz_catalog.connect()
+        quiz_catalog.import_csvs(conn)
+        conn.close()
+    finally:
+        os.chdir(cwd)
+
+def run_export():
+    import quiz_catalog
+    conn = quiz_catalog.connect()
+    quiz_catalog.export_all(conn)
+    conn.close()
+    return True
+
+def setup_rasterize(workdir, source_dir, countries):
+    """래스터화 입력: canva_upload_ready/flag_images/svg/<난이도>/*.svg"""
+    svg_dir = workdir / "canva_upload_ready" / "flag_images" / "svg"
+    items = list(countries.items())
+    for index, difficulty in enumerate(['beginner', 'interm', 'high']):
+        link_svgs(dict(items[index::3]), source_dir, svg_dir / difficulty,
+                  lambda code, name: slug_for(name))
+
+def run_rasterize():
+    import convert_svg_to_png
+    return convert_svg_to_png.convert_flags_to_png()
+
+STAGES = {
+    'rename': (setup_rename, run_rename),
+    'classify': (setup_classify, run_classify),
+    'quiz': (setup_quiz, run_quiz),
+    'sort': (setup_quiz_csv, run_sort),
+    'urls': (setup_quiz_csv, run_urls),
+    'export': (setup_export, run_export),
+    'rasterize': (setup_rasterize, run_rasterize),
+}
+
+# ---------------------------------------------------------------------------
+# 측정
+# ---------------------------------------------------------------------------
+
+def read_proc_io():
+    """/proc/self/io 읽기/쓰기 바이트 (Linux 외에는 빈 값)"""
+    try:
+        with open('/proc/self/io', 'r') as f:
+            values = dict(line.split(': ') for line in f.read().splitlines())
+        return {'read_bytes': int(values['rchar']), 'write_bytes': int(values['wchar'])}
+    except (OSError, KeyError, ValueError):
+        return {}
+
+def max_rss_bytes(who):
+    """최대 RSS (바이트) - Linux는 KB, macOS는 바이트 단위로 보고"""
+    max_rss = resource.getrusage(who).ru_maxrss
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+def _measure_stage(stage, workdir, queue):
+    """자식 프로세스: 작업 폴더에서 단계 1개 실행 후 측정값 전달"""
+    os.chdir(workdir)
+    _, run = STAGES[stage]
+
+    file_ops = Counter()
+
+    def audit(event, args):
+        if event in FILE_EVENTS:
+            file_ops[event] += 1
+
+    io_before = read_proc_io()
+    children_before = resource.getrusage(resource.RUSAGE_CHILDREN)
+    sys.addaudithook(audit)
+
+    error = None
+    start = time.perf_counter()
+    try:
+        # 파일별 출력은 측정값을 왜곡하므로 버림
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            result = run()
+        if result is False:
+            lines = output.getvalue().strip().splitlines()
+            failures = [line.strip() for line in lines if line.strip().startswith('❌')]
+            error = (failures or lines or ['단계 실패'])[0]
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    elapsed = time.perf_counter() - start
+
+    io_after = read_proc_io()
+    children_after = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+    queue.put({
+        'status': 'ok' if error is None else 'error',
+        'error': error,
+        'seconds': round(elapsed, 4),
+        'peak_rss_bytes': max_rss_bytes(resource.RUSAGE_SELF),
+        'children_peak_rss_bytes': max_rss_bytes(resource.RUSAGE_CHILDREN),
+        'children_cpu_seconds': round((children_after.ru_utime + children_after.ru_stime)
+                                      - (children_before.ru_utime + children_before.ru_stime), 4),
+        'file_ops': sum(file_ops.values()),
+        'file_ops_by_type': dict(file_ops),
+        **{key: io_after[key] - io_before[key] for key in io_after},
+    })
+
+def benchmark_stage(stage, size, source_dir, countries, timeout):
+    """단계 1개를 새 작업 폴더 + spawn 자식 프로세스에서 측정"""
+    setup, _ = STAGES[stage]
+    workdir = Path(tempfile.mkdtemp(prefix=f"bench_{stage}_{size}_"))
+    try:
+        setup(workdir, source_dir, countries)
+
+        context = multiprocessing.get_context('spawn')
+        queue = context.Queue()
+        process = context.Process(target=_measure_stage, args=(stage, str(workdir), queue))
+        process.start()
+        process.join(timeout)
+
+        if process.is_alive():
+            process.terminate()
+            process.join()
+            return {'status': 'timeout', 'error': f"{timeout}초 초과", 'seconds': None}
+        if queue.empty():
+            return {'status': 'error', 'error': f"자식 프로세스 종료 코드 {process.exitcode}", 'seconds': None}
+        return queue.get()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def git_revision():
+    """현재 커밋 해시 (git 저장소가 아니면 None)"""
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                                capture_output=True, text=True, check=True)
+        return result.stdout.strip()
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return None
+
+def load_previous_results():
+    """가장 최근 벤치마크 결과 파일 로드"""
+    if not RESULTS_DIR.exists():
+        return None
+    previous = sorted(RESULTS_DIR.glob("bench_*.json"))
+    if not previous:
+        return None
+    with open(previous[-1], 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def compare_results(previous, current):
+    """이전 결과 대비 느려진 단계 목록 [(규모, 단계, 이전초, 현재초)]"""
+    if not previous:
+        return []
+    before = {(r['size'], r['stage']): r for r in previous['results']}
+    regressions = []
+    for result in current['results']:
+        old = before.get((result['size'], result['stage']))
+        if not old or not old.get('seconds') or not result.get('seconds'):
+            continue
+        if result['seconds'] > old['seconds'] * REGRESSION_THRESHOLD:
+            regressions.append((result['size'], result['stage'], old['seconds'], result['seconds']))
+    return regressions
+
+def run_benchmarks(sizes=DEFAULT_SIZES, stages=None, timeout=DEFAULT_TIMEOUT):
+    """모든 규모 × 단계 벤치마크 실행 후 결과 저장"""
+    stages = stages or list(STAGES)
+    repo_dir = Path.cwd()
+    print("⏱️ 파이프라인 벤치마크 시작...")
+    print(f"규모: {', '.join(f'{s:,}' for s in sizes)} / 단계: {', '.join(stages)}")
+    print("=" * 70)
+
+    report = {
+        'created': datetime.now().isoformat(),
+        'git_revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'timeout_seconds': timeout,
+        'results': [],
+    }
+
+    for size in sizes:
+        print(f"\n📦 합성 카탈로그 {size:,}개 생성 중...")
+        source_dir = Path(tempfile.mkdtemp(prefix=f"bench_source_{size}_"))
+        try:
+            countries = build_source_tree(source_dir, size)
+            for stage in stages:
+                os.chdir(repo_dir)
+                result = benchmark_stage(stage, size, source_dir, countries, timeout)
+                report['results'].append({'size': size, 'stage': stage, **result})
+
+                if result['status'] == 'ok':
+                    print(f"  ✅ {stage:<10} {result['seconds']:>9.3f}s  "
+                          f"RSS {result['peak_rss_bytes'] / 1024 / 1024:>7.1f}MB  "
+                          f"파일작업 {result['file_ops']:>8,}")
+                else:
+                    print(f"  ❌ {stage:<10} {result['status']}: {result['error']}")
+        finally:
+            os.chdir(repo_dir)
+            shutil.rmtree(source_dir, ignore_errors=True)
+
+    previous = load_previous_results()
+    RESULTS_DIR.mkdir(exist_ok=True)
+    output_path = RESULTS_DIR / f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print("\n" + "=" * 70)
+    print(f"💾 결과 저장: {output_path}")
+
+    regressions = compare_results(previous, report)
+    if regressions:
+        print(f"\n⚠️  이전 결과 대비 {REGRESSION_THRESHOLD}배 이상 느려진 단계:")
+        for size, stage, old, new in regressions:
+            print(f"  - {stage} ({size:,}개): {old:.3f}s → {new:.3f}s")
+    elif previous:
+        print("✅ 이전 결과 대비 성능 저하 없음")
+
+    return report
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="국기 퀴즈 파이프라인 벤치마크")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--stages', nargs='+', choices=list(STAGES))
+    parser.add_argument('--timeout', type=int, default=DEFAULT_TIMEOUT)
+    args = parser.parse_args()
+
+    run_benchmarks(args.sizes, args.stages, args.timeout)
+
+if __name__ == "__main__":
+    main()
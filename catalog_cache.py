@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+퀴즈 CSV 바이너리 사이드카 캐시 (빠른 시작용)
+- CSV는 그대로 원본이고, 파싱 결과를 .catalog_cache/ 아래 바이너리 파일로 한 번 더 저장
+- 컬럼별 타입: 정수(array 'q') / 열거형(난이도·정답 번호처럼 값 종류가 적은 컬럼, array 'B') / 문자열(중복 제거한 문자열 표 번호, array 'I')
+- CSV 크기와 수정시각이 같으면 바로 사용, 다르면 SHA-256 해시로 다시 확인하고 내용이 바뀌었으면 재생성
+- 다음 실행부터는 파일 1번 읽기로 로드 (csv.DictReader 파싱 생략)
+"""
+import csv
+import hashlib
+import json
+import os
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from pathlib import Path
+
+import asset_store
+
+CACHE_DIR = Path(".catalog_cache")
+MAGIC = b'FQC1'
+HEADER = struct.Struct('<4sI')      # 매직, 메타데이터 JSON 길이
+ENUM_MAX_VALUES = 16                # 값 종류가 이 이하면 열거형 컬럼
+SEPARATOR = '\0'                    # 문자열 표 구분자 (CSV 값에 있으면 캐시하지 않음)
+
+class CsvTable:
+    """컬럼 단위로 저장된 CSV (값은 컬럼 타입대로: int 또는 str)"""
+
+    def __init__(self, headers, columns):
+        self.headers = headers
+        self.columns = columns          # {컬럼 이름: 값 list}
+        self.row_count = len(columns[headers[0]]) if headers else 0
+
+    def column(self, name):
+        """컬럼 1개의 값 목록 (정수 컬럼은 int)"""
+        return self.columns[name]
+
+    def dict_rows(self):
+        """csv.DictReader와 같은 모양의 행 목록 (값은 모두 원래 문자열)"""
+        text_columns = [[str(v) for v in values] if values and isinstance(values[0], int) else values
+                        for values in (self.columns[name] for name in self.headers)]
+        return [dict(zip(self.headers, values)) for values in zip(*text_columns)]
+
+def cache_path(csv_file):
+    """CSV 경로 → 사이드카 경로 (절대 경로 해시로 구분)"""
+    key = hashlib.sha1(str(Path(csv_file).resolve()).encode('utf-8')).hexdigest()[:16]
+    return CACHE_DIR / f"{Path(csv_file).stem}-{key}.bin"
+
+def read_csv(csv_file):
+    """CSV 파싱 → CsvTable (짧은 행은 빈 값으로 채움)"""
+    with open(csv_file, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        headers = next(reader, [])
+        width = len(headers)
+        values = [[] for _ in headers]
+        for row in reader:
+            if len(row) < width:
+                row = row + [''] * (width - len(row))
+            for column, value in zip(values, row):
+                column.append(value)
+
+    columns = {}
+    for name, column in zip(headers, values):
+        if column and all(value.isascii() and value.isdigit() and len(value) <= 18 and str(int(value)) == value
+                          for value in column):
+            columns[name] = [int(value) for value in column]
+        else:
+            columns[name] = column
+    return CsvTable(headers, columns)
+
+def encode_table(table, source):
+    """CsvTable → 사이드카 bytes (문자열은 파일 전체에서 한 번씩만 저장)"""
+    strings = {}
+    column_specs = []
+    blocks = []
+    for name in table.headers:
+        values = table.columns[name]
+        if values and isinstance(values[0], int):
+            column_specs.append({'name': name, 'type': 'int'})
+            blocks.append(array('q', values).tobytes())
+            continue
+        distinct = list(dict.fromkeys(values))
+        if len(distinct) <= ENUM_MAX_VALUES:
+            lookup = {value: i for i, value in enumerate(distinct)}
+            column_specs.append({'name': name, 'type': 'enum', 'values': distinct})
+            blocks.append(array('B', (lookup[value] for value in values)).tobytes())
+            continue
+        column_specs.append({'name': name, 'type': 'str'})
+        blocks.append(array('I', (strings.setdefault(value, len(strings)) for value in values)).tobytes())
+
+    string_blob = SEPARATOR.join(strings).encode('utf-8')
+    meta = {
+        'source': source,
+        'byteorder': sys.byteorder,
+        'rows': table.row_count,
+        'columns': column_specs,
+        'strings': len(strings),
+        'blocks': [len(block) for block in [string_blob] + blocks],
+    }
+    meta_bytes = json.dumps(meta, ensure_ascii=False).encode('utf-8')
+    return b''.join([HEADER.pack(MAGIC, len(meta_bytes)), meta_bytes, string_blob] + blocks)
+
+def decode_meta(data):
+    """사이드카 bytes → (메타데이터, 본문 시작 위치) - 형식이 다르면 (None, 0)"""
+    if len(data) < HEADER.size:
+        return None, 0
+    magic, meta_length = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        return None, 0
+    try:
+        meta = json.loads(bytes(data[HEADER.size:HEADER.size + meta_length]))
+    except ValueError:
+        return None, 0
+    if meta.get('byteorder') != sys.byteorder:
+        return None, 0
+    return meta, HEADER.size + meta_length
+
+def _from_block(typecode, block):
+    """bytes 블록 → array (복사 1번)"""
+    values = array(typecode)
+    values.frombytes(block)
+    return values
+
+def decode_table(data, meta, offset):
+    """사이드카 본문 → CsvTable"""
+    view = memoryview(data)
+    string_length = meta['blocks'][0]
+    strings = [sys.intern(s) for s in bytes(view[offset:offset + string_length]).decode('utf-8').split(SEPARATOR)] \
+        if meta['strings'] else []
+    offset += string_length
+
+    headers = []
+    columns = {}
+    for spec, length in zip(meta['columns'], meta['blocks'][1:]):
+        block = view[offset:offset + length]
+        offset += length
+        if spec['type'] == 'int':
+            columns[spec['name']] = _from_block('q', block).tolist()
+        elif spec['type'] == 'enum':
+            values = spec['values']
+            columns[spec['name']] = [values[i] for i in block]
+        else:
+            columns[spec['name']] = [strings[i] for i in _from_block('I', block)]
+        headers.append(spec['name'])
+    return CsvTable(headers, columns)
+
+def source_stat(csv_file):
+    """CSV 검증 정보: 크기, 수정시각(ns)"""
+    st = os.stat(csv_file)
+    return {'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+def write_cache(path, data):
+    """사이드카 저장 (임시 파일 → 원자적 교체, 쓸 수 없으면 생략)"""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+def load_table(csv_file):
+    """CSV → CsvTable (유효한 사이드카가 있으면 그것을 사용, 없으면 파싱 후 생성)"""
+    csv_file = Path(csv_file)
+    path = cache_path(csv_file)
+    stat = source_stat(csv_file)
+
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
+        data = b''
+    meta, offset = decode_meta(data)
+
+    if meta is not None:
+        source = meta['source']
+        if source['size'] == stat['size'] and source['mtime_ns'] == stat['mtime_ns']:
+            return decode_table(data, meta, offset)
+        if source['size'] == stat['size'] and source['sha256'] == asset_store.hash_file(csv_file):
+            # 내용은 같고 수정시각만 바뀜 (복사/터치) → 검증 정보만 갱신
+            table = decode_table(data, meta, offset)
+            write_cache(path, encode_table(table, dict(source, **stat)))
+            return table
+
+    table = read_csv(csv_file)
+    if not any(SEPARATOR in value for values in table.columns.values() for value in values
+               if isinstance(value, str)):
+        source = dict(stat, sha256=asset_store.hash_file(csv_file))
+        write_cache(path, encode_table(table, source))
+    return table
+
+def load_rows(csv_file):
+    """list(csv.DictReader(f))와 같은 결과 (사이드카 사용)"""
+    return load_table(csv_file).dict_rows()
+
+def main():
+    """메인 실행 함수: 퀴즈 CSV 사이드카 생성 및 로드 시간 비교"""
+    print("🗂️ 퀴즈 CSV 바이너리 사이드카 캐시")
+    print("=" * 60)
+
+    candidates = [Path(arg) for arg in sys.argv[1:]] or [
+        Path("flag_quiz_data.csv"),
+        Path("canva_upload_ready/csv_data/flag_quiz_data.csv"),
+        Path("flag_quiz_data_with_sets.csv"),
+    ]
+    found = False
+    for csv_file in candidates:
+        if not csv_file.exists():
+            continue
+        found = True
+
+        start = time.perf_counter()
+        with open(csv_file, 'r', encoding='utf-8', newline='') as f:
+            list(csv.DictReader(f))
+        parse_ms = (time.perf_counter() - start) * 1000
+
+        load_table(csv_file)
+        start = time.perf_counter()
+        table = load_table(csv_file)
+        load_ms = (time.perf_counter() - start) * 1000
+
+        path = cache_path(csv_file)
+        size_kb = path.stat().st_size / 1024 if path.exists() else 0
+        print(f"✅ {csv_file}: {table.row_count}행 → {path} ({size_kb:.1f}KB)")
+        print(f"   CSV 파싱 {parse_ms:.2f}ms / 사이드카 로드 {load_ms:.2f}ms")
+
+    if not found:
+        print("❌ 퀴즈 CSV 파일을 찾을 수 없습니다.")
+    return found
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,61 @@
 #!/usr/bin/env python3
 """
 국기를 난이도별로 분류하는 스크립트 (전세계 인지도 기준)
-beginner, intermediate, high 폴더로 각각 85개씩 균등 분배
+beginner, intermediate, high 폴더로 분배 (기본 목록만 쓰면 각각 85개씩 균등)
+- 구간 근거 우선순위: 응답 통계(difficulty_tiers.json) → 페이지뷰 인지도(recognizability_scores.json) → 기본 목록
 """
-import os
 import shutil
 from pathlib import Path
 
+import answer_analytics
+import asset_index
+import instrumentation
+import pageview_scores
+
+TIER_SIZE = 85
+
+def assign_tiers(all_countries, ranked_tiers, default_tiers, size=TIER_SIZE, balance=False):
+    """국기 → 난이도 구간 배정
+
+    구간마다 점수 순위 국기 → 윗 구간에서 넘친 국기 → 기본 목록 순으로 상한(size)까지 채우고,
+    넘친 국기는 한 단계 어려운 구간으로 넘긴다. 마지막(high) 구간은 나머지 전부.
+    balance=True(점수 없음)이면 high가 상한을 넘을 때 남는 국기를 자리가 있는 구간에 재분배.
+    """
+    available = set(all_countries)
+    ranked = set().union(*ranked_tiers.values())
+    placed = set()
+    tiers = {name: [] for name in answer_analytics.TIER_NAMES}
+    overflow = []
+    for position, name in enumerate(answer_analytics.TIER_NAMES):
+        last = position == len(answer_analytics.TIER_NAMES) - 1
+        # 점수가 있는 국기는 기본 목록 위치를 무시하고 점수 구간만 따름
+        candidates = (ranked_tiers.get(name, []) + overflow
+                      + [c for c in default_tiers.get(name, []) if c not in ranked])
+        if last:
+            candidates += sorted(available)
+        overflow = []
+        for country in candidates:
+            if country not in available or country in placed:
+                continue
+            if last or len(tiers[name]) < size:
+                tiers[name].append(country)
+                placed.add(country)
+            elif country not in overflow:
+                overflow.append(country)
+
+    if balance:
+        # 기본 목록만 쓰는 경우 기존처럼 구간별 size개씩 맞춤 (점수가 있으면 순위를 흐트러뜨리지 않도록 생략)
+        extra = tiers['high'][size:]
+        del tiers['high'][size:]
+        for name in answer_analytics.TIER_NAMES:
+            room = size - len(tiers[name])
+            if room > 0:
+                tiers[name] += extra[:room]
+                extra = extra[room:]
+        tiers['high'] += extra
+    return tiers
+
+@instrumentation.timed('classify')
 def create_difficulty_classification():
     """국기를 난이도별로 분류"""
 
@@ -95,89 +144,61 @@ def create_difficulty_classification():
     print("🏴 국기 난이도별 분류 시작...")
     print("=" * 60)
 
+    # 구간 근거 우선순위: 응답 통계 → 페이지뷰 인지도 → 위 기본 목록 (국기마다 앞선 근거를 따름)
+    ranked_tiers = {name: [] for name in answer_analytics.TIER_NAMES}
+    for source in [answer_analytics.load_tiers(), pageview_scores.load_scores()]:
+        if not source:
+            continue
+        ranked = set().union(*ranked_tiers.values())
+        added = 0
+        for name in answer_analytics.TIER_NAMES:
+            # 각 구간 목록은 쉬운 순(순위순)으로 저장되어 있음
+            new = [c for c in source['tiers'][name] if c not in ranked]
+            ranked_tiers[name] += new
+            added += len(new)
+        print(f"📈 {source['source']} 기준 구간 사용: {added}개 국기")
+    has_scores = any(ranked_tiers.values())
+    if not has_scores:
+        print("📋 응답 통계/인지도 점수 없음 - 기본 인지도 목록 사용")
+
     # 모든 SVG 파일 목록 가져오기
-    all_files = [f for f in os.listdir(base_path) if f.endswith('.svg')]
+    all_files = asset_index.get_index().list_dir(base_path, '.svg')
     print(f"총 파일 수: {len(all_files)}개")
 
     # 파일명에서 확장자 제거하여 국가명 추출
     all_countries = [f.replace('.svg', '') for f in all_files]
 
-    # 분류 카운터
-    beginner_count = 0
-    intermediate_count = 0
-    high_count = 0
-
-    # Beginner 분류
-    print(f"\n🟢 BEGINNER 폴더 생성 중...")
-    for country in all_countries:
-        if country in beginner_countries and beginner_count < 85:
-            src = base_path / f"{country}.svg"
-            dst = beginner_path / f"{country}.svg"
-            if src.exists():
-                shutil.copy2(src, dst)
-                beginner_count += 1
-                print(f"✅ {country}.svg → beginner/")
-
-    # Intermediate 분류
-    print(f"\n🟡 INTERMEDIATE 폴더 생성 중...")
-    for country in all_countries:
-        if country in intermediate_countries and intermediate_count < 85:
-            src = base_path / f"{country}.svg"
-            dst = intermediate_path / f"{country}.svg"
-            if src.exists() and not (beginner_path / f"{country}.svg").exists():
-                shutil.copy2(src, dst)
-                intermediate_count += 1
-                print(f"✅ {country}.svg → intermediate/")
-
-    # High 분류 (나머지)
-    print(f"\n🔴 HIGH 폴더 생성 중...")
-    classified_countries = set()
-
-    # 이미 분류된 국가들 체크
-    for country in all_countries:
-        if (beginner_path / f"{country}.svg").exists() or (intermediate_path / f"{country}.svg").exists():
-            classified_countries.add(country)
-
-    # 나머지 국가들을 High에 분류
-    for country in all_countries:
-        if country not in classified_countries and high_count < 85:
-            src = base_path / f"{country}.svg"
-            dst = high_path / f"{country}.svg"
-            if src.exists():
-                shutil.copy2(src, dst)
-                high_count += 1
-                print(f"✅ {country}.svg → high/")
-
-    # 부족한 경우 재분배
-    remaining_countries = []
-    for country in all_countries:
-        src = base_path / f"{country}.svg"
-        if (src.exists() and
-            not (beginner_path / f"{country}.svg").exists() and
-            not (intermediate_path / f"{country}.svg").exists() and
-            not (high_path / f"{country}.svg").exists()):
-            remaining_countries.append(country)
-
-    # 남은 국가들 균등 분배
-    for i, country in enumerate(remaining_countries):
-        src = base_path / f"{country}.svg"
-        if beginner_count < 85:
-            dst = beginner_path / f"{country}.svg"
-            target_folder = "beginner"
-            beginner_count += 1
-        elif intermediate_count < 85:
-            dst = intermediate_path / f"{country}.svg"
-            target_folder = "intermediate"
-            intermediate_count += 1
-        elif high_count < 85:
-            dst = high_path / f"{country}.svg"
-            target_folder = "high"
-            high_count += 1
-        else:
-            break
-
-        shutil.copy2(src, dst)
-        print(f"✅ {country}.svg → {target_folder}/ (재분배)")
+    default_tiers = {'beginner': beginner_countries, 'intermediate': intermediate_countries, 'high': []}
+    tiers = assign_tiers(all_countries, ranked_tiers, default_tiers, balance=not has_scores)
+
+    # 점수 기준 구간과 실제 배정이 다른 국기 확인 (구간 상한 때문에 어려운 쪽으로 밀린 경우만 허용)
+    final_tier = {country: name for name, countries in tiers.items() for country in countries}
+    order = {name: i for i, name in enumerate(answer_analytics.TIER_NAMES)}
+    moved = [(country, name, final_tier[country]) for name, countries in ranked_tiers.items()
+             for country in countries if country in final_tier and final_tier[country] != name]
+    easier = [(country, wanted, got) for country, wanted, got in moved if order[got] < order[wanted]]
+    if easier:
+        # 예: high 점수 국기가 beginner에 들어가면 점수를 무시한 것
+        print(f"❌ 점수보다 쉬운 구간에 배정된 국기 {len(easier)}개:")
+        for country, wanted, got in easier[:10]:
+            print(f"  - {country}: {wanted} → {got}")
+        return False
+    if moved:
+        print(f"⚠️  점수 기준 구간과 다르게 배정된 국기 {len(moved)}개 (구간 상한 {TIER_SIZE}개 초과):")
+        for country, wanted, got in moved[:10]:
+            print(f"  - {country}: {wanted} → {got}")
+
+    emoji = {'beginner': '🟢', 'intermediate': '🟡', 'high': '🔴'}
+    folders = {'beginner': beginner_path, 'intermediate': intermediate_path, 'high': high_path}
+    for name in answer_analytics.TIER_NAMES:
+        print(f"\n{emoji[name]} {name.upper()} 폴더 생성 중...")
+        for country in tiers[name]:
+            shutil.copy2(base_path / f"{country}.svg", folders[name] / f"{country}.svg")
+            instrumentation.progress(f"✅ {country}.svg → {name}/")
+
+    beginner_count = len(tiers['beginner'])
+    intermediate_count = len(tiers['intermediate'])
+    high_count = len(tiers['high'])
 
     # 결과 요약
     print("\n" + "=" * 60)
@@ -195,6 +216,7 @@ def create_difficulty_classification():
     return True
 
 if __name__ == "__main__":
+    instrumentation.set_quiet_from_argv()
     print("🎯 국기 난이도별 분류 스크립트")
     print("전세계 인지도 기준으로 beginner/intermediate/high 분류")
     print("=" * 60)
@@ -2,58 +2,63 @@
 """
 SVG 국기 파일을 PNG로 일괄 변환하는 스크립트
 Canva 호환성을 위한 이미지 전처리
+- 기본은 배치 모드: 여러 SVG를 변환 프로세스 1개에 넘겨 시작 비용 분산 (--no-batch로 파일별 실행)
+- 3840px 이상은 tiled_render.py로 띠 단위 렌더링 (메모리 상한 유지)
+- SVG 비용 점수가 큰 작업부터 병렬 처리, 파일별 타임아웃 초과 시 다른 백엔드로 재시도 (svg_profiler.py)
 """
 import os
 import subprocess
+import sys
+import time
 from pathlib import Path
 
+import asset_index
+import instrumentation
+import raster_backends
+import svg_profiler
+import tiled_render
+
+WORKERS = os.cpu_count() or 1
+
 def check_dependencies():
-    """필요한 의존성 검사"""
-    try:
-        # ImageMagick convert 명령어 확인
-        result = subprocess.run(['convert', '-version'],
-                              capture_output=True, text=True, check=True)
-        print("✅ ImageMagick이 설치되어 있습니다.")
-        return True
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        print("❌ ImageMagick이 설치되어 있지 않습니다.")
-        print("설치 방법:")
-        print("  macOS: brew install imagemagick")
-        print("  Ubuntu: sudo apt-get install imagemagick")
+    """필요한 의존성 검사 (설치된 래스터화 백엔드 탐지)"""
+    backends = raster_backends.available_backends()
+    if not backends:
+        print("❌ SVG 변환 도구가 설치되어 있지 않습니다.")
+        print("설치 방법 (하나만 있으면 됩니다):")
+        print("  macOS: brew install imagemagick  (또는 librsvg, resvg)")
+        print("  Ubuntu: sudo apt-get install imagemagick  (또는 librsvg2-bin)")
         print("  Windows: https://imagemagick.org/script/download.php")
+        print("  Python: pip install cairosvg")
         return False
 
-def convert_svg_to_png(svg_path, png_path, size=512):
-    """SVG를 PNG로 변환"""
-    try:
-        # ImageMagick 먼저 시도
+    print(f"✅ 사용 가능한 변환 도구: {', '.join(backend.name for backend in backends)}")
+    backend = raster_backends.get_backend()
+    print(f"🏆 선택된 변환 도구: {backend.name}")
+    return True
+
+def convert_svg_to_png(svg_path, png_path, size=512, backend=None, timeout=None, skip=()):
+    """SVG를 PNG로 변환 (선택된 백엔드 실패 시 나머지 백엔드로 재시도, 4K 이상은 띠 단위 렌더링)"""
+    backend = backend or raster_backends.get_backend()
+    fallbacks = [other for other in raster_backends.available_backends() if other is not backend]
+    error = None
+    for candidate in [backend, *fallbacks]:
+        if candidate is None or candidate in skip:
+            continue
         try:
-            cmd = [
-                'convert',
-                '-background', 'transparent',
-                '-size', f'{size}x{size}',
-                str(svg_path),
-                str(png_path)
-            ]
-            subprocess.run(cmd, check=True, capture_output=True)
-            return True
-        except subprocess.CalledProcessError:
-            # ImageMagick 실패시 cairosvg 사용
-            import cairosvg
-            with open(svg_path, 'rb') as svg_file:
-                cairosvg.svg2png(
-                    file_obj=svg_file,
-                    write_to=str(png_path),
-                    output_width=size,
-                    output_height=size
-                )
+            if size >= tiled_render.TILE_THRESHOLD:
+                tiled_render.render_tiled(svg_path, png_path, size, candidate, timeout=timeout)
+            else:
+                candidate.render(svg_path, png_path, size, timeout)
             return True
-    except Exception as e:
-        print(f"❌ 변환 실패: {svg_path} -> {e}")
-        return False
-
-def convert_flags_to_png():
-    """모든 국기 SVG 파일을 PNG로 변환"""
+        except Exception as e:
+            error = e
+    print(f"❌ 변환 실패: {svg_path} -> {error or '다시 시도할 다른 변환 도구 없음'}")
+    return False
+
+@instrumentation.timed('rasterize')
+def convert_flags_to_png(batch=True):
+    """모든 국기 SVG 파일을 PNG로 변환 (batch=False면 파일별로 변환 프로세스 실행)"""
     print("🎨 SVG → PNG 변환 시작...")
     print("=" * 60)
 
@@ -78,13 +83,14 @@ def convert_flags_to_png():
     # 난이도별 폴더명
     difficulties = ['beginner', 'interm', 'high']
 
+    backend = raster_backends.get_backend()
+    index = asset_index.get_index()
     success_count = 0
     total_count = 0
+    latency = instrumentation.LatencyHistogram('rasterize_per_file')
 
-    print("\n🔄 변환 진행상황:")
-    print("-" * 60)
-
-    # 각 난이도별로 변환
+    # 1. 변환 작업 수집 + SVG 구조로 렌더링 비용 계산
+    jobs = []
     for difficulty in difficulties:
         svg_dir = base_path / difficulty
 
@@ -92,33 +98,81 @@ def convert_flags_to_png():
             print(f"⚠️  폴더 없음: {svg_dir}")
             continue
 
-        print(f"\n📁 {difficulty.upper()} 폴더 변환 중...")
+        svg_files = index.files(svg_dir, '.svg')
+        print(f"📁 {difficulty.upper()} 폴더: {len(svg_files)}개")
+        # 파일명 그대로, 확장자만 png로 변경
+        jobs.extend((svg_file, png_base_path / (svg_file.name.replace('.svg', '.png'))) for svg_file in svg_files)
+
+    profiles = {svg_file: svg_profiler.profile_svg(svg_file) for svg_file, _ in jobs}
+    outliers = set(svg_profiler.find_outliers(profiles))
+
+    # 2. 작업 단위 구성: 비용 이상치는 1개씩, 나머지는 비용이 비슷한 것끼리 배치로 묶음
+    batch_size = raster_backends.BATCH_SIZE if batch else 1
+    light = sorted((job for job in jobs if job[0] not in outliers), key=lambda job: -profiles[job[0]]['cost'])
+    chunks = [[job] for job in jobs if job[0] in outliers]
+    chunks += [light[start:start + batch_size] for start in range(0, len(light), batch_size)]
+    units = [(sum(profiles[svg_file]['cost'] for svg_file, _ in chunk), chunk) for chunk in chunks]
+
+    def run_chunk(chunk):
+        """배치 1개 변환 → (파일별 실패 사유, 파일당 소요 시간)"""
+        timeout = max(svg_profiler.timeout_for(profiles[svg_file]['cost']) for svg_file, _ in chunk)
+        chunk_start = time.perf_counter()
+        errors = backend.render_batch(chunk, timeout=timeout)
+        # 배치 소요 시간을 파일 수로 나눠 파일별 지연시간으로 기록
+        return errors, (time.perf_counter() - chunk_start) / len(chunk)
+
+    print(f"\n🔄 변환 진행상황 (작업 {len(units)}개, 비용 큰 순, 워커 {WORKERS}개):")
+    print("-" * 60)
 
-        svg_files = list(svg_dir.glob("*.svg"))
-        for svg_file in svg_files:
+    # 3. 비용 큰 작업부터 워커에 배분, 실패한 파일은 다른 백엔드 포함 개별 재시도
+    report = []
+    for chunk, result in svg_profiler.run_longest_first(units, run_chunk, WORKERS):
+        errors, per_file = result if not isinstance(result, Exception) else ([result] * len(chunk), 0.0)
+        for (svg_file, png_file), error in zip(chunk, errors):
             total_count += 1
-            # 파일명 그대로, 확장자만 png로 변경
-            png_file = png_base_path / (svg_file.name.replace('.svg', '.png'))
-
-            print(f"  🔄 {svg_file.name} -> {png_file.name}", end=" ")
-
-            if convert_svg_to_png(svg_file, png_file):
+            label = f"  🔄 {svg_file.name} -> {png_file.name}"
+            latency.observe(per_file, svg_file.name)
+
+            timed_out = isinstance(error, subprocess.TimeoutExpired)
+            converted = error is None
+            if not converted:
+                # 시간 초과한 파일은 같은 백엔드를 건너뛰고 다른 백엔드로,
+                # 배치 중단으로 시도하지 못한 파일 등은 같은 백엔드부터 파일별 타임아웃으로 다시 변환
+                converted = convert_svg_to_png(svg_file, png_file, backend=backend,
+                                               timeout=svg_profiler.timeout_for(profiles[svg_file]['cost']),
+                                               skip=(backend,) if timed_out else ())
+
+            if svg_file in outliers or timed_out:
+                report.append({'file': svg_file.name, 'cost': profiles[svg_file]['cost'],
+                               'seconds': round(per_file, 3), 'timed_out': timed_out, 'converted': converted})
+
+            if converted:
                 success_count += 1
-                print("✅")
+                instrumentation.progress(f"{label} ✅")
             else:
-                print("❌")
+                # 실패는 quiet 모드에서도 항상 출력
+                print(f"{label} ❌")
+
+    if report:
+        svg_profiler.record_outliers('rasterize', report)
+
+    latency.emit()
 
     # 결과 요약
     print("\n" + "=" * 60)
     print(f"📊 변환 완료!")
     print(f"✅ 성공: {success_count}개")
     print(f"❌ 실패: {total_count - success_count}개")
+    if latency.count:
+        summary = latency.summary()
+        print(f"⏱️  파일당 평균 {summary['mean_ms']}ms, p90 ≤ {summary['p90_ms']}ms, 최장 {summary['slowest']}")
+    if report:
+        print(f"⚠️  비용 이상치/시간 초과 {len(report)}개: "
+              f"{', '.join(entry['file'] for entry in sorted(report, key=lambda e: -e['cost'])[:5])}")
     print(f"📁 PNG 파일 위치: {png_base_path}")
 
-    # 파일 수 확인
-    if png_base_path.exists():
-        file_count = len(list(png_base_path.glob("*.png")))
-        print(f"  - PNG 파일: {file_count}개")
+    # 파일 수 확인 (변경된 PNG 폴더만 한 번 다시 나열)
+    print(f"  - PNG 파일: {index.count(png_base_path, '.png')}개")
 
     return success_count > 0
 
@@ -137,15 +191,22 @@ def create_alternative_method():
     print("   - Canva는 SVG 파일도 지원합니다")
     print("   - PNG 변환 없이 바로 사용 가능할 수 있습니다")
 
-if __name__ == "__main__":
+def main(argv=None):
+    """메인 실행 함수 (--no-batch: 파일별 변환, --quiet: 파일별 출력 생략)"""
+    argv = sys.argv[1:] if argv is None else argv
+    instrumentation.set_quiet_from_argv(argv)
     print("🎨 국기 SVG → PNG 변환기")
     print("Canva 호환성을 위한 이미지 전처리")
     print("=" * 60)
 
-    success = convert_flags_to_png()
+    success = convert_flags_to_png(batch='--no-batch' not in argv)
 
     if not success:
         create_alternative_method()
     else:
         print("\n🎉 PNG 변환이 완료되었습니다!")
-        print("이제 Canva에서 PNG 파일들을 사용할 수 있습니다.")
\ No newline at end of file
+        print("이제 Canva에서 PNG 파일들을 사용할 수 있습니다.")
+    return success
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+국가 메타데이터 (대륙, 세부 지역, 국기 주요 색) 조인 및 지역별 오답 버킷
+- country_regions.json: 국가 코드(ISO2) → 대륙 / 세부 지역 (UN M49 기준)
+- 국기 색은 SVG의 fill / stop-color 값을 기본 색 이름(빨강, 파랑 등)으로 양자화해 빈도순 추출
+- 카탈로그 DB의 country_meta 테이블에 한 번 저장하고 지역 인덱스로 조회
+- RegionBuckets: 세부 지역 → 대륙+색 조합 → 대륙 → 전체 순으로 미리 나눈 버킷에서 오답을 문제당 O(1)로 추출
+"""
+import json
+import random
+import re
+from pathlib import Path
+
+import quiz_catalog
+from rename_flags import clean_filename
+
+REGIONS_FILE = Path("country_regions.json")
+SVG_DIR = Path("canva_upload_ready/flag_images/svg")
+
+# 국기에 쓰이는 기본 색 (가장 가까운 색으로 양자화)
+PALETTE = {
+    'red': (200, 16, 46), 'white': (255, 255, 255), 'blue': (0, 56, 168),
+    'light_blue': (108, 172, 228), 'green': (0, 122, 61), 'yellow': (252, 209, 22),
+    'orange': (255, 130, 0), 'black': (0, 0, 0), 'maroon': (128, 0, 32),
+}
+NAMED_COLORS = {
+    'red': (255, 0, 0), 'white': (255, 255, 255), 'blue': (0, 0, 255), 'green': (0, 128, 0),
+    'yellow': (255, 255, 0), 'black': (0, 0, 0), 'orange': (255, 165, 0), 'navy': (0, 0, 128),
+    'gold': (255, 215, 0), 'maroon': (128, 0, 0), 'lime': (0, 255, 0), 'aqua': (0, 255, 255),
+}
+COLOR_PATTERN = re.compile(r'(?:fill|stop-color)\s*[=:]\s*"?\s*(#[0-9a-fA-F]{3,6}|rgb\([^)]*\)|[a-zA-Z]+)')
+SIGNATURE_COLORS = 2            # 대륙+색 버킷 키에 쓰는 상위 색 수
+
+def load_regions(path=REGIONS_FILE):
+    """국가 코드 → {'continent', 'subregion'}"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+def parse_color(value):
+    """SVG 색 값 → (r, g, b) 또는 None"""
+    value = value.strip().lower()
+    if value.startswith('#'):
+        digits = value[1:]
+        if len(digits) == 3:
+            digits = ''.join(c * 2 for c in digits)
+        if len(digits) != 6:
+            return None
+        return tuple(int(digits[i:i + 2], 16) for i in (0, 2, 4))
+    if value.startswith('rgb('):
+        try:
+            return tuple(int(float(part.strip().rstrip('%'))) for part in value[4:-1].split(','))[:3]
+        except ValueError:
+            return None
+    return NAMED_COLORS.get(value)
+
+def nearest_palette_color(rgb):
+    """가장 가까운 기본 색 이름"""
+    return min(PALETTE, key=lambda name: sum((a - b) ** 2 for a, b in zip(PALETTE[name], rgb)))
+
+def flag_colors(svg_path, limit=3):
+    """국기 주요 색 이름 목록 (SVG에 등장하는 빈도순)"""
+    try:
+        text = Path(svg_path).read_text(encoding='utf-8', errors='ignore')
+    except FileNotFoundError:
+        return []
+    counts = {}
+    for value in COLOR_PATTERN.findall(text):
+        rgb = parse_color(value)
+        if rgb is None:
+            continue
+        name = nearest_palette_color(rgb)
+        counts[name] = counts.get(name, 0) + 1
+    return sorted(counts, key=lambda name: -counts[name])[:limit]
+
+def codes_by_slug():
+    """countries.json 국가명을 파일명 규칙으로 바꾼 slug → 국가 코드 (표시 이름이 달라진 국가용)"""
+    return {clean_filename(name): code for code, name in quiz_catalog.load_countries_json().items()}
+
+def build_metadata(countries, regions=None, svg_dir=SVG_DIR):
+    """(slug, code, name) 목록 → {slug: {'code', 'name', 'continent', 'subregion', 'colors'}}"""
+    regions = load_regions() if regions is None else regions
+    slug_codes = codes_by_slug()
+    metadata = {}
+    for slug, code, name in countries:
+        code = code or slug_codes.get(slug)
+        region = regions.get(code or '', {})
+        metadata[slug] = {
+            'code': code,
+            'name': name,
+            'continent': region.get('continent'),
+            'subregion': region.get('subregion'),
+            'colors': flag_colors(svg_dir / f"{slug}.svg"),
+        }
+    return metadata
+
+def store_metadata(conn, metadata):
+    """카탈로그 country_meta 테이블에 저장"""
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO country_meta (slug, continent, subregion, colors) VALUES (?, ?, ?, ?)",
+            [(slug, meta['continent'], meta['subregion'], ','.join(meta['colors']))
+             for slug, meta in metadata.items()])
+
+def load_metadata(conn):
+    """카탈로그에서 메타데이터 조회 (국가 + country_meta 조인)"""
+    rows = conn.execute("""
+        SELECT c.slug, c.code, c.name, m.continent, m.subregion, m.colors
+        FROM countries c LEFT JOIN country_meta m ON m.slug = c.slug
+    """).fetchall()
+    return {
+        row['slug']: {'code': row['code'], 'name': row['name'], 'continent': row['continent'],
+                      'subregion': row['subregion'], 'colors': (row['colors'] or '').split(',') if row['colors'] else []}
+        for row in rows
+    }
+
+class RegionBuckets:
+    """지역별 오답 후보 버킷 (생성 시 한 번 분류, 추출은 버킷 크기와 무관)"""
+
+    def __init__(self, metadata):
+        self.metadata = metadata
+        self.buckets = {}
+        for slug, meta in metadata.items():
+            for key in self.levels(slug):
+                self.buckets.setdefault(key, []).append(meta['name'])
+
+    def levels(self, slug):
+        """오답을 찾을 버킷 키 (가까운 순)"""
+        meta = self.metadata[slug]
+        keys = []
+        if meta['subregion']:
+            keys.append(('subregion', meta['subregion']))
+        if meta['continent']:
+            signature = tuple(sorted(meta['colors'][:SIGNATURE_COLORS]))
+            keys.append(('colors', meta['continent'], signature))
+            keys.append(('continent', meta['continent']))
+        keys.append(('all',))
+        return keys
+
+    def pick(self, slug, count=3, rng=random):
+        """같은 지역 오답 count개 - 버킷이 작으면 다음 단계 버킷에서 채움"""
+        correct = self.metadata[slug]['name']
+        chosen = []
+        for key in self.levels(slug):
+            bucket = self.buckets[key]
+            # 정답/이미 고른 것을 빼도 모자라지 않을 만큼만 뽑음 (최대 count + 1개)
+            needed = count - len(chosen)
+            for name in rng.sample(bucket, min(len(bucket), needed + len(chosen) + 1)):
+                if name != correct and name not in chosen:
+                    chosen.append(name)
+                    if len(chosen) == count:
+                        return chosen
+        return chosen
+
+    def sizes(self):
+        """버킷 종류별 (개수, 최소 크기)"""
+        summary = {}
+        for key, bucket in self.buckets.items():
+            count, smallest = summary.get(key[0], (0, None))
+            summary[key[0]] = (count + 1, len(bucket) if smallest is None else min(smallest, len(bucket)))
+        return summary
+
+def main():
+    """메인 실행 함수: 카탈로그 국가에 메타데이터를 조인해 저장"""
+    print("🗺️ 국가 메타데이터 조인 시작...")
+    print("=" * 60)
+
+    regions = load_regions()
+    if not regions:
+        print(f"❌ 지역 데이터를 찾을 수 없습니다: {REGIONS_FILE}")
+        return False
+
+    conn, _ = quiz_catalog.open_catalog()
+
+    countries = [(row['slug'], row['code'], row['name'])
+                 for row in conn.execute("SELECT slug, code, name FROM countries")]
+    metadata = build_metadata(countries, regions)
+    store_metadata(conn, metadata)
+
+    missing_region = [slug for slug, meta in metadata.items() if not meta['subregion']]
+    missing_colors = [slug for slug, meta in metadata.items() if not meta['colors']]
+    print(f"✅ 국가 {len(metadata)}개 메타데이터 저장")
+    if missing_region:
+        print(f"⚠️  지역 정보 없음 {len(missing_region)}개: {', '.join(missing_region[:10])}")
+    if missing_colors:
+        print(f"⚠️  색 정보 없음 {len(missing_colors)}개: {', '.join(missing_colors[:10])}")
+
+    print("\n📊 오답 버킷:")
+    for level, (count, smallest) in RegionBuckets(metadata).sizes().items():
+        print(f"  - {level}: {count}개 (최소 {smallest}개국)")
+    return True
+
+if __name__ == "__main__":
+    if main():
+        print("\n🎉 메타데이터 조인이 완료되었습니다!")
+    else:
+        print("\n💥 메타데이터 조인 중 오류가 발생했습니다.")
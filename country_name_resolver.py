@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+국기 파일명(slug) → countries.json 국가명 퍼지 매칭
+- 공식 국가명 + 변형(쉼표 앞 이름, 괄호 제거, 파일명 규칙 slug) + 별칭(옛 파일명, 통용 이름)을 3-gram 역색인으로 구성
+- 정확히 일치하면 신뢰도 1.0, 아니면 3-gram Dice 유사도 (2위 국가와 점수 차가 작으면 신뢰도 감점)
+- 신뢰도가 낮은 매칭은 추측하지 않고 검토 목록으로 보고
+"""
+import json
+import re
+import sys
+import unicodedata
+from pathlib import Path
+
+import asset_index
+from rename_flags import clean_filename
+
+COUNTRIES_JSON_CANDIDATES = [
+    Path("country-flags/countries.json"),
+    Path("canva_upload_ready/backup/countries_original.json"),
+]
+SVG_DIR = Path("canva_upload_ready/flag_images/svg")
+
+MIN_CONFIDENCE = 0.8        # 이보다 낮으면 검토 대상
+AMBIGUITY_MARGIN = 0.25     # 1위와 2위(다른 국가) 점수 차가 이보다 작으면 그만큼 감점
+
+# 국가 코드 → 별칭 (예전 파일명 규칙으로 만든 slug, 통용 이름)
+ALIASES = {
+    'KR': ['korea', 'South Korea'],
+    'KP': ['korea_democratic_peoples', 'North Korea'],
+    'CN': ['china'],
+    'TW': ['taiwan'],
+    'IR': ['iran_islamic'],
+    'VE': ['venezuela_bolivarian'],
+    'BO': ['bolivia_plurinational'],
+    'CD': ['congo_the_democratic_the', 'DR Congo', 'Democratic Republic of the Congo'],
+    'CG': ['Congo Brazzaville'],
+    'CI': ['côte_divoire', 'Ivory Coast'],
+    'FM': ['micronesia'],
+    'LA': ['laos'],
+    'TZ': ['tanzania_united'],
+    'TR': ['Turkey', 'Türkiye'],
+    'GB': ['UK', 'Great Britain'],
+    'US': ['USA', 'United States of America'],
+    'RU': ['Russia'],
+    'SY': ['Syria'],
+    'VA': ['Vatican', 'Vatican City'],
+    'SZ': ['Eswatini', 'Swaziland'],
+    'CZ': ['Czechia'],
+    'CV': ['Cabo Verde'],
+    'BN': ['Brunei'],
+    'MD': ['Moldova'],
+    'FK': ['Falkland Islands'],
+    'VG': ['British Virgin Islands'],
+    'VI': ['US Virgin Islands'],
+}
+
+def normalize(text):
+    """비교용 정규화: 악센트 제거, 소문자, 영숫자 외 문자는 공백"""
+    text = unicodedata.normalize('NFKD', text.replace('_', ' '))
+    text = ''.join(c for c in text if not unicodedata.combining(c)).lower()
+    return ' '.join(re.sub(r"[^0-9a-z]+", ' ', text.replace("'", '')).split())
+
+def trigrams(text):
+    """3-gram 집합 (단어 경계를 '$'로 표시)"""
+    padded = f"$${text}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def name_variants(name):
+    """공식 국가명의 변형들 (전체, 괄호 제거, 쉼표 앞, 파일명 slug)"""
+    variants = [name, re.sub(r'\s*\([^)]*\)', '', name), clean_filename(name)]
+    if ',' in name:
+        variants.append(name.split(',')[0])
+    return variants
+
+class CountryNameResolver:
+    """3-gram 역색인 기반 국가명 해석기"""
+
+    def __init__(self, countries, aliases=ALIASES):
+        self.names = dict(countries)            # 코드 → 공식 국가명
+        self.variants = []                      # [(정규화된 변형, 코드, 3-gram 수)]
+        self.postings = {}                      # 3-gram → [변형 번호]
+        self.exact = {}                         # 정규화된 변형 → 코드 집합
+        self.cache = {}
+
+        alias_keys = set()
+        for code, alias_list in aliases.items():
+            if code in self.names:
+                for alias in alias_list:
+                    alias_keys.add(normalize(alias))
+                    self._add(normalize(alias), code)
+        for code, name in self.names.items():
+            for variant in name_variants(name):
+                key = normalize(variant)
+                # 별칭으로 지정한 이름은 다른 국가의 변형으로 덮어쓰지 않음 (예: 'korea')
+                if key and key not in alias_keys:
+                    self._add(key, code)
+
+    def _add(self, key, code):
+        """변형 1개를 색인에 추가"""
+        codes = self.exact.setdefault(key, set())
+        if code in codes:
+            return
+        codes.add(code)
+        grams = trigrams(key)
+        variant_id = len(self.variants)
+        self.variants.append((key, code, len(grams)))
+        for gram in grams:
+            self.postings.setdefault(gram, []).append(variant_id)
+
+    def resolve(self, slug):
+        """slug → (코드, 공식 국가명, 신뢰도 0~1) - 후보가 없으면 (None, None, 0.0)"""
+        if slug in self.cache:
+            return self.cache[slug]
+        key = normalize(slug)
+        codes = self.exact.get(key, ())
+        if len(codes) == 1:
+            code = next(iter(codes))
+            result = (code, self.names[code], 1.0)
+        else:
+            result = self._fuzzy(key)
+        self.cache[slug] = result
+        return result
+
+    def _fuzzy(self, key):
+        """3-gram Dice 유사도가 가장 높은 국가 (2위 국가와 점수 차가 작으면 감점)"""
+        grams = trigrams(key)
+        shared = {}
+        for gram in grams:
+            for variant_id in self.postings.get(gram, ()):
+                shared[variant_id] = shared.get(variant_id, 0) + 1
+
+        best = {}
+        for variant_id, count in shared.items():
+            _, code, size = self.variants[variant_id]
+            score = 2 * count / (len(grams) + size)
+            if score > best.get(code, 0.0):
+                best[code] = score
+        if not best:
+            return None, None, 0.0
+
+        ranked = sorted(best.items(), key=lambda item: -item[1])
+        code, score = ranked[0]
+        if len(ranked) > 1:
+            gap = score - ranked[1][1]
+            score -= max(0.0, AMBIGUITY_MARGIN - gap)
+        return code, self.names[code], round(score, 3)
+
+    def resolve_all(self, slugs):
+        """slug 목록 → ({slug: (코드, 국가명, 신뢰도)}, 신뢰도 낮은 slug 목록)"""
+        matches = {slug: self.resolve(slug) for slug in slugs}
+        low = sorted(slug for slug, (_, _, score) in matches.items() if score < MIN_CONFIDENCE)
+        return matches, low
+
+def load_countries():
+    """countries.json 로드 (원본이 없으면 canva_upload_ready 백업 사용)"""
+    for candidate in COUNTRIES_JSON_CANDIDATES:
+        if candidate.exists():
+            with open(candidate, 'r', encoding='utf-8') as f:
+                return json.load(f)
+    return {}
+
+def print_review(matches, low):
+    """신뢰도 낮은 매칭 검토 목록 출력"""
+    if not low:
+        print(f"✅ {len(matches)}개 모두 신뢰도 {MIN_CONFIDENCE} 이상으로 매칭")
+        return
+    print(f"⚠️  신뢰도 낮은 매칭 {len(low)}개 (검토 필요):")
+    for slug in low:
+        code, name, score = matches[slug]
+        print(f"  - {slug:<35} → {name or '(후보 없음)'} [{code or '-'}] 신뢰도 {score:.2f}")
+
+def main():
+    """메인 실행 함수: 국기 파일명 전체를 국가명으로 해석하고 검토 목록 출력"""
+    print("🔎 국기 파일명 → 국가명 매칭")
+    print("=" * 60)
+
+    countries = load_countries()
+    if not countries:
+        print("❌ countries.json 파일을 찾을 수 없습니다.")
+        return False
+
+    svg_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else SVG_DIR
+    slugs = [name[:-4] for name in asset_index.get_index().list_dir(svg_dir, '.svg')]
+    if not slugs:
+        print(f"❌ SVG 파일을 찾을 수 없습니다: {svg_dir}")
+        return False
+
+    resolver = CountryNameResolver(countries)
+    matches, low = resolver.resolve_all(slugs)
+    exact = sum(1 for _, _, score in matches.values() if score == 1.0)
+    print(f"📊 파일 {len(slugs)}개: 정확히 일치 {exact}개, 퍼지 매칭 {len(slugs) - exact}개")
+    print_review(matches, low)
+    return True
+
+if __name__ == "__main__":
+    main()
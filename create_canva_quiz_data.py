@@ -4,13 +4,19 @@ Canva 국기 퀴즈 영상용 CSV 데이터 생성 스크립트
 - 255개 국기를 난이도별로 분류된 퀴즈 데이터로 변환
 - 4지선다 오답 생성 로직 포함
 - Canva Bulk Create 호환 형식
+- --region-distractors: 같은 지역 국가를 오답으로 사용 (country_metadata.py 버킷)
 """
 import json
 import csv
-import os
 import random
+import sys
 from pathlib import Path
 
+import asset_index
+import country_metadata
+import country_name_resolver
+import instrumentation
+
 def load_countries_data():
     """countries.json에서 국가 데이터 로드"""
     with open('country-flags/countries.json', 'r', encoding='utf-8') as f:
@@ -20,49 +26,24 @@ def get_country_pools():
     """난이도별 국가 풀 생성"""
     countries_data = load_countries_data()
 
-    # 파일명 기준으로 실제 존재하는 국가들 확인
-    beginner_files = set(f.replace('.svg', '') for f in os.listdir('country-flags/svg_renamed/beginner'))
-    intermediate_files = set(f.replace('.svg', '') for f in os.listdir('country-flags/svg_renamed/intermediate'))
-    high_files = set(f.replace('.svg', '') for f in os.listdir('country-flags/svg_renamed/high'))
-
-    # 국가 코드를 국가명으로 매핑
-    country_name_map = {}
-    for code, name in countries_data.items():
-        # 파일명 형식으로 변환 (소문자, 특수문자 처리)
-        clean_name = name.lower()
-        clean_name = clean_name.replace(' ', '_')
-        clean_name = clean_name.replace(',', '')
-        clean_name = clean_name.replace('(', '').replace(')', '')
-        clean_name = clean_name.replace("'", "")
-        clean_name = clean_name.replace('-', '_')
-        clean_name = clean_name.replace('__', '_')
-
-        # 특별한 경우들 처리
-        special_cases = {
-            'korea_republic_of': 'korea',
-            'korea_democratic_people_s_republic_of': 'korea_democratic_peoples',
-            'china_people_s_republic_of_china': 'china',
-            'iran_islamic_republic_of': 'iran_islamic',
-            'venezuela_bolivarian_republic_of': 'venezuela_bolivarian',
-            'bolivia_plurinational_state_of': 'bolivia_plurinational',
-            'congo_the_democratic_republic_of_the': 'congo_the_democratic_the',
-            'côte_d_ivoire': 'côte_divoire',
-            'micronesia_federated_states_of': 'micronesia',
-            'laos_lao_people_s_democratic_republic': 'laos',
-            'tanzania_united_republic_of': 'tanzania_united',
-            'taiwan_republic_of_china': 'taiwan',
-            'republic_of_türkiye': 'republic_of_türkiye'
-        }
-
-        if clean_name in special_cases:
-            clean_name = special_cases[clean_name]
-
-        country_name_map[clean_name] = name
+    # 파일명 기준으로 실제 존재하는 국가들 확인 (폴더를 다시 나열하지 않고 에셋 인덱스 사용)
+    index = asset_index.get_index()
+    beginner_files = set(f.replace('.svg', '') for f in index.list_dir('country-flags/svg_renamed/beginner'))
+    intermediate_files = set(f.replace('.svg', '') for f in index.list_dir('country-flags/svg_renamed/intermediate'))
+    high_files = set(f.replace('.svg', '') for f in index.list_dir('country-flags/svg_renamed/high'))
+
+    # 파일명 → 국가명 (3-gram 퍼지 매칭, 신뢰도 낮은 것은 추측하지 않고 검토 목록으로 보고)
+    resolver = country_name_resolver.CountryNameResolver(countries_data)
+    matches, low = resolver.resolve_all(beginner_files | intermediate_files | high_files)
+    if low:
+        country_name_resolver.print_review(matches, low)
+        print("  → 위 국기는 퀴즈에서 제외합니다 (country_name_resolver.ALIASES에 별칭 추가 후 다시 실행)")
+    skipped = set(low)
 
     # 실제 파일과 매칭되는 국가들만 추출
-    beginner_countries = [(f, country_name_map.get(f, f.replace('_', ' ').title())) for f in beginner_files]
-    intermediate_countries = [(f, country_name_map.get(f, f.replace('_', ' ').title())) for f in intermediate_files]
-    high_countries = [(f, country_name_map.get(f, f.replace('_', ' ').title())) for f in high_files]
+    beginner_countries = [(f, matches[f][1]) for f in beginner_files if f not in skipped]
+    intermediate_countries = [(f, matches[f][1]) for f in intermediate_files if f not in skipped]
+    high_countries = [(f, matches[f][1]) for f in high_files if f not in skipped]
 
     return {
         'beginner': beginner_countries,
@@ -70,8 +51,19 @@ def get_country_pools():
         'high': high_countries
     }
 
-def generate_wrong_answers(correct_country, difficulty, all_countries_pool):
+def build_region_buckets(countries_pool, countries_data):
+    """난이도 풀 전체로 지역별 오답 버킷 생성 (국가명 → 코드로 지역 조인)"""
+    codes_by_name = {name: code for code, name in countries_data.items()}
+    countries = [(slug, codes_by_name.get(name), name)
+                 for pool in countries_pool.values() for slug, name in pool]
+    return country_metadata.RegionBuckets(country_metadata.build_metadata(countries))
+
+def generate_wrong_answers(correct_country, difficulty, all_countries_pool, region_buckets=None):
     """그럴듯한 오답 3개 생성"""
+    if region_buckets is not None:
+        # 같은 세부 지역 → 대륙+색 → 대륙 → 전체 순으로 채움
+        return region_buckets.pick(correct_country[0])
+
     # 정답과 같은 난이도의 다른 국가들에서 선택
     same_difficulty_pool = [country for country in all_countries_pool[difficulty]
                            if country[1] != correct_country[1]]
@@ -94,14 +86,20 @@ def generate_wrong_answers(correct_country, difficulty, all_countries_pool):
         # 풀이 부족한 경우 (실제로는 발생하지 않을 것)
         return ['오답1', '오답2', '오답3']
 
-def create_quiz_csv():
-    """퀴즈용 CSV 파일 생성"""
+@instrumentation.timed('quiz_generation')
+def create_quiz_csv(distractor_mode='random'):
+    """퀴즈용 CSV 파일 생성 (distractor_mode='region'이면 같은 지역 국가를 오답으로 우선 사용)"""
     print("🎯 국기 퀴즈 CSV 데이터 생성 시작...")
     print("=" * 60)
 
     # 국가 데이터 로드
     countries_pool = get_country_pools()
 
+    region_buckets = None
+    if distractor_mode == 'region':
+        region_buckets = build_region_buckets(countries_pool, load_countries_data())
+        print("🗺️ 오답 모드: 같은 지역 국가 우선")
+
     # CSV 헤더
     csv_headers = [
         'quiz_id',
@@ -130,7 +128,8 @@ def create_quiz_csv():
         countries = countries_pool[difficulty]
         for country_file, country_name in countries:
             # 오답 3개 생성
-            wrong_answers = generate_wrong_answers((country_file, country_name), difficulty, countries_pool)
+            wrong_answers = generate_wrong_answers((country_file, country_name), difficulty, countries_pool,
+                                                   region_buckets)
 
             # 선택지 섞기 (정답 위치 랜덤화)
             options = [country_name] + wrong_answers
@@ -156,7 +155,7 @@ def create_quiz_csv():
             }
 
             quiz_data.append(quiz_item)
-            print(f"✅ #{quiz_id:3d} {country_name} ({difficulty})")
+            instrumentation.progress(f"✅ #{quiz_id:3d} {country_name} ({difficulty})")
             quiz_id += 1
 
     # CSV 파일로 저장
@@ -187,15 +186,22 @@ def create_quiz_csv():
 
     return csv_filename
 
-if __name__ == "__main__":
+def main(argv=None):
+    """메인 실행 함수 (--region-distractors: 같은 지역 오답, --quiet: 파일별 출력 생략)"""
+    argv = sys.argv[1:] if argv is None else argv
+    instrumentation.set_quiet_from_argv(argv)
     print("🏴 Canva 국기 퀴즈 데이터 생성기")
     print("=" * 60)
 
     # 랜덤 시드 설정 (재현 가능한 결과)
     random.seed(42)
 
+    distractor_mode = 'region' if '--region-distractors' in argv else 'random'
     try:
-        csv_file = create_quiz_csv()
+        csv_file = create_quiz_csv(distractor_mode)
         print(f"\n🎉 완료! {csv_file} 파일이 생성되었습니다.")
     except Exception as e:
-        print(f"\n❌ 오류 발생: {str(e)}")
\ No newline at end of file
+        print(f"\n❌ 오류 발생: {str(e)}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
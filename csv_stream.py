@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+CSV 컬럼 재작성용 스트리밍 변환 커널
+- 행을 dict가 아닌 tuple로 한 줄씩 읽고 → 변환하고 → 바로 임시 파일에 씀 (메모리 사용량 일정)
+- 컬럼 위치는 헤더를 읽을 때 한 번만 계산 (plan 함수가 변환 함수를 만들어 반환)
+- 다 쓴 뒤 백업하고 원본을 원자적으로 교체 (중간에 실패하면 원본은 그대로)
+"""
+import csv
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import asset_store
+
+def transform_rows(reader, transform, width):
+    """행 tuple을 하나씩 변환하는 제너레이터 (짧은 행은 빈 값으로 채움)"""
+    for row in reader:
+        if len(row) < width:
+            row = row + [''] * (width - len(row))
+        yield transform(tuple(row))
+
+def rewrite_csv(csv_file, plan, backup_file=None):
+    """plan(헤더) → (새 헤더, 행 변환 함수)로 CSV를 재작성하고 원본 교체 → 처리한 행 수"""
+    csv_file = Path(csv_file)
+    fd, tmp_path = tempfile.mkstemp(dir=csv_file.parent, prefix=f"{csv_file.stem}_", suffix='.tmp')
+    count = 0
+    try:
+        with open(csv_file, 'r', newline='', encoding='utf-8') as src, \
+                os.fdopen(fd, 'w', newline='', encoding='utf-8') as dst:
+            reader = csv.reader(src)
+            headers = next(reader)
+            new_headers, transform = plan(headers)
+            writer = csv.writer(dst)
+            writer.writerow(new_headers)
+            for row in transform_rows(reader, transform, len(headers)):
+                writer.writerow(row)
+                count += 1
+        shutil.copymode(csv_file, tmp_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+    if backup_file is not None:
+        asset_store.backup_file(csv_file, backup_file)
+    os.replace(tmp_path, csv_file)
+    return count
+
+def head(csv_file, count=3):
+    """앞쪽 count개 행을 dict로 (결과 샘플 출력용)"""
+    rows = []
+    with open(csv_file, 'r', newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            if len(rows) == count:
+                break
+            rows.append(row)
+    return rows
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+마지막 배포(publish) 이후 바뀐 퀴즈 행만 내보내는 delta export
+- export 대상별로 마지막 배포 스냅샷(.asset_store refs/published/<대상>)과 현재 카탈로그를 키 기준 해시 조인
+- 키: country_filename (없는 대상은 country_name, quiz_id 순으로 대체)
+- 대상별 추가/변경/삭제 행을 deltas/<대상>/added.csv, changed.csv, removed.csv로 저장 → 다시 올릴 양이 변경량에 비례
+- 업로드가 끝나면 --publish로 현재 카탈로그를 새 기준 스냅샷으로 기록
+"""
+import argparse
+import csv
+import os
+import tempfile
+from pathlib import Path
+
+import asset_store
+import instrumentation
+import quiz_catalog
+
+DELTA_DIR = Path("deltas")
+KEY_COLUMNS = ['country_filename', 'country_name', 'quiz_id']
+DELTA_KINDS = ['added', 'changed', 'removed']
+
+def ref_name(target):
+    """export 대상의 배포 스냅샷 참조 이름"""
+    return f"published/{target}.csv"
+
+def key_index(headers):
+    """조인 키 컬럼 위치 (KEY_COLUMNS 중 먼저 있는 것)"""
+    for name in KEY_COLUMNS:
+        if name in headers:
+            return headers.index(name)
+    raise ValueError(f"조인 키 컬럼이 없습니다: {', '.join(headers)}")
+
+def read_snapshot(target):
+    """마지막 배포 스냅샷 → (헤더, 행 tuple 목록) - 배포 기록이 없으면 (None, [])"""
+    digest = asset_store.read_ref(ref_name(target))
+    if digest is None or not asset_store.object_path(digest).exists():
+        return None, []
+    with open(asset_store.object_path(digest), 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        headers = next(reader, [])
+        return headers, [tuple(row) for row in reader]
+
+def current_rows(conn, target):
+    """현재 카탈로그의 export 행 → (헤더, 문자열 행 tuple 이터레이터) - CSV로 썼다 읽은 것과 같은 값"""
+    headers, rows = quiz_catalog.iter_export_rows(conn, target)
+    return headers, (tuple('' if value is None else str(value) for value in row) for row in rows)
+
+def diff_rows(headers, previous, current):
+    """키 기준 해시 조인 → {'added': [...], 'changed': [...], 'removed': [...]}
+
+    빌드 쪽은 이전 스냅샷(키 → 행), 현재 행은 스트리밍으로 하나씩 조회.
+    추가/변경은 현재 export 순서, 삭제는 이전 스냅샷 순서를 유지.
+    """
+    column = key_index(headers)
+    build = {row[column]: row for row in previous}
+    delta = {kind: [] for kind in DELTA_KINDS}
+    for row in current:
+        old = build.pop(row[column], None)
+        if old is None:
+            delta['added'].append(row)
+        elif old != row:
+            delta['changed'].append(row)
+    delta['removed'] = list(build.values())
+    return delta
+
+def write_csv(path, headers, rows, line_terminator):
+    """CSV 1개 저장 (임시 파일 → 원자적 교체)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    with os.fdopen(fd, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, lineterminator=line_terminator)
+        writer.writerow(headers)
+        writer.writerows(rows)
+    os.replace(tmp_path, path)
+
+def export_delta(conn, target, output_dir=DELTA_DIR):
+    """export 대상 1개의 delta CSV 생성 → {종류: 행 수} (배포 기록이 없으면 전체가 added)"""
+    _, _, _, line_terminator = quiz_catalog.EXPORTS[target]
+    headers, rows = current_rows(conn, target)
+    previous_headers, previous = read_snapshot(target)
+    if previous_headers is not None and previous_headers != headers:
+        # 컬럼 구성이 바뀌면 행 비교가 의미 없으므로 전체 교체로 처리
+        print(f"⚠️  {target}: 컬럼 구성이 바뀌어 전체 행을 다시 내보냅니다.")
+        previous = []
+
+    delta = diff_rows(headers, previous, rows)
+    counts = {}
+    for kind in DELTA_KINDS:
+        path = output_dir / target / f"{kind}.csv"
+        if delta[kind]:
+            write_csv(path, headers, delta[kind], line_terminator)
+        elif path.exists():
+            # 이전 실행의 delta가 남아 다시 올라가지 않도록 삭제
+            path.unlink()
+        counts[kind] = len(delta[kind])
+    return counts
+
+@instrumentation.timed('delta_export')
+def export_deltas(conn, targets=None, output_dir=DELTA_DIR):
+    """export 대상별 delta 생성 및 결과 출력"""
+    results = {}
+    for target in targets or quiz_catalog.EXPORTS:
+        counts = export_delta(conn, target, output_dir)
+        results[target] = counts
+        if any(counts.values()):
+            print(f"✅ {target:<14} 추가 {counts['added']}, 변경 {counts['changed']}, 삭제 {counts['removed']}"
+                  f" → {output_dir / target}/")
+        else:
+            print(f"✅ {target:<14} 변경 없음")
+    return results
+
+def publish(conn, targets=None):
+    """현재 카탈로그를 export하고 배포 기준 스냅샷으로 기록"""
+    for target in targets or quiz_catalog.EXPORTS:
+        output_path, count = quiz_catalog.export_csv(conn, target)
+        asset_store.write_ref(ref_name(target), asset_store.put_file(output_path))
+        print(f"✅ {target:<14} 배포 기록: {output_path} ({count}행)")
+    asset_store.save_index()
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="마지막 배포 이후 바뀐 퀴즈 행만 delta CSV로 내보내기")
+    parser.add_argument('targets', nargs='*', help=f"export 대상 (생략하면 전체: {', '.join(quiz_catalog.EXPORTS)})")
+    parser.add_argument('--publish', action='store_true',
+                        help="delta 생성 후 현재 카탈로그를 새 배포 기준으로 기록")
+    parser.add_argument('--output-dir', type=Path, default=DELTA_DIR, help="delta CSV 저장 폴더")
+    args = parser.parse_args()
+
+    print("🔀 퀴즈 delta export")
+    print("=" * 60)
+
+    unknown = [target for target in args.targets if target not in quiz_catalog.EXPORTS]
+    if unknown:
+        print(f"❌ 알 수 없는 export 대상: {', '.join(unknown)}")
+        return False
+
+    conn, count = quiz_catalog.open_catalog()
+    if count:
+        print(f"📥 CSV → 카탈로그 가져오기 완료: {count}개 문제")
+
+    print("\n📤 마지막 배포 대비 변경 행 계산 중...")
+    export_deltas(conn, args.targets, args.output_dir)
+
+    if args.publish:
+        print("\n📌 배포 기준 스냅샷 갱신 중...")
+        publish(conn, args.targets)
+
+    print(f"\n💾 delta 위치: {args.output_dir}/")
+    return True
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Canva / CDN 업로드용 ZIP 번들 생성기
+- canva_upload_ready에서 필요한 부분만 골라 (난이도 1개, 세트 범위, PNG만 등) ZIP으로 바로 스트리밍
+- 이미 압축된 PNG/WebP는 STORED, CSV/SVG/문서는 DEFLATE
+- 항목 순서(경로순), 타임스탬프, 권한을 고정 → 입력이 같으면 바이트 단위로 같은 ZIP
+- 폴더를 임시로 복사하지 않음 (원본 파일을 청크 단위로 읽어 바로 압축), 크기 상한을 넘으면 여러 볼륨으로 분할
+"""
+import argparse
+import csv
+import io
+import os
+import re
+import shutil
+import tempfile
+import zipfile
+from pathlib import Path
+
+import asset_index
+import instrumentation
+
+SOURCE_ROOT = Path("canva_upload_ready")
+OUTPUT_DIR = Path("bundles")
+
+TIERS = ['beginner', 'intermediate', 'high']
+STORED_SUFFIXES = {'.png', '.webp', '.jpg', '.jpeg', '.zip'}    # 이미 압축된 형식
+EXCLUDED_DIRS = {'backup'}                                     # 업로드 대상이 아닌 폴더
+
+FIXED_DATE_TIME = (1980, 1, 1, 0, 0, 0)     # ZIP이 표현할 수 있는 가장 이른 시각
+FILE_MODE = 0o644
+MAX_VOLUME_MB = 250
+CHUNK_SIZE = 1024 * 1024
+
+# 항목 1개의 ZIP 구조 오버헤드 (로컬 헤더 30 + 중앙 디렉터리 46 + ZIP64 extra 여유) + 파일명 2번
+ENTRY_OVERHEAD = 30 + 46 + 2 * 28
+END_OVERHEAD = 22 + 56 + 20                 # 끝 레코드 (ZIP64 포함)
+
+SET_PNG_PATTERN = re.compile(r'^Set_(\d+)_\d+_\((.+)\)\.png$')
+TIER_SVG_PATTERN = re.compile(r'^[a-z]+\d+_(.+)\.svg$')
+
+def parse_set_range(text):
+    """'3' 또는 '1-10' → (시작, 끝)"""
+    start, _, end = text.partition('-')
+    return int(start), int(end or start)
+
+def file_slug(relative):
+    """번들 경로 → 국가 slug (국기 이미지가 아니면 None)"""
+    parts = relative.split('/')
+    if parts[0] != 'flag_images' or len(parts) < 3:
+        return None
+    name = parts[-1]
+    match = SET_PNG_PATTERN.match(name)
+    if match:
+        return match.group(2)
+    if len(parts) == 4:
+        match = TIER_SVG_PATTERN.match(name)
+        return match.group(1) if match else None
+    return Path(name).stem
+
+def read_quiz_tiers(quiz_csv):
+    """퀴즈 CSV → {국가 slug: 난이도}"""
+    with open(quiz_csv, 'r', encoding='utf-8', newline='') as f:
+        return {row['country_filename']: row['difficulty'] for row in csv.DictReader(f)}
+
+def select_entries(root=SOURCE_ROOT, tier=None, sets=None, formats=None):
+    """번들에 넣을 (ZIP 경로, 원본 경로, 허용 slug 집합) 목록 - ZIP 경로순"""
+    slugs = None
+    if tier:
+        quiz_csv = root / "csv_data" / "flag_quiz_data.csv"
+        slugs = {slug for slug, difficulty in read_quiz_tiers(quiz_csv).items() if difficulty == tier}
+    if sets:
+        start, end = sets
+        in_range = set()
+        for name in asset_index.get_index().list_dir(root / "flag_images" / "png", '.png'):
+            match = SET_PNG_PATTERN.match(name)
+            if match and start <= int(match.group(1)) <= end:
+                in_range.add(match.group(2))
+        slugs = in_range if slugs is None else slugs & in_range
+
+    entries = []
+    for path, _ in asset_index.get_index().walk(root):
+        relative = path.relative_to(root).as_posix()
+        parts = relative.split('/')
+        if parts[0] in EXCLUDED_DIRS:
+            continue
+        if formats and path.suffix.lstrip('.').lower() not in formats:
+            continue
+        if tier and len(parts) == 4 and parts[1] == 'svg' and parts[2] != tier:
+            continue
+        if slugs is not None and parts[0] == 'flag_images':
+            slug = file_slug(relative)
+            if slug is None or slug not in slugs:
+                continue
+        entries.append((relative, path, slugs if path.suffix == '.csv' else None))
+    return sorted(entries, key=lambda entry: entry[0])
+
+def compression_for(path):
+    """확장자별 압축 방식 (이미 압축된 형식은 STORED)"""
+    return zipfile.ZIP_STORED if Path(path).suffix.lower() in STORED_SUFFIXES else zipfile.ZIP_DEFLATED
+
+def size_bound(relative, path):
+    """항목 1개가 ZIP에서 차지할 최대 바이트 (DEFLATE는 압축 실패 시 크기로 계산)"""
+    size = os.stat(path).st_size
+    if compression_for(path) == zipfile.ZIP_DEFLATED:
+        # 압축이 안 되는 데이터는 16KB 블록마다 5바이트씩 늘어남
+        size += 5 * (size // 16384 + 1)
+    return size + ENTRY_OVERHEAD + 2 * len(relative.encode('utf-8'))
+
+def plan_volumes(entries, max_bytes):
+    """항목 목록을 크기 상한 이하의 볼륨들로 나누기 (순서 유지)"""
+    volumes = [[]]
+    used = END_OVERHEAD
+    for entry in entries:
+        bound = size_bound(entry[0], entry[1])
+        if volumes[-1] and used + bound > max_bytes:
+            volumes.append([])
+            used = END_OVERHEAD
+        volumes[-1].append(entry)
+        used += bound
+    return volumes if volumes[0] else []
+
+def zip_info(relative, path):
+    """고정 타임스탬프/권한의 ZipInfo"""
+    info = zipfile.ZipInfo(relative, date_time=FIXED_DATE_TIME)
+    info.compress_type = compression_for(path)
+    info.create_system = 3              # Unix (실행 환경과 관계없이 같은 값)
+    info.external_attr = FILE_MODE << 16
+    info.file_size = os.stat(path).st_size
+    return info
+
+def copy_filtered_csv(path, slugs, target):
+    """CSV에서 선택된 국가 행만 ZIP 항목으로 스트리밍 (원래 줄바꿈 문자 유지)"""
+    with open(path, 'r', encoding='utf-8', newline='') as src:
+        first_line = src.readline()
+        line_terminator = '\r\n' if first_line.endswith('\r\n') else '\n'
+        src.seek(0)
+        reader = csv.reader(src)
+        headers = next(reader, [])
+        out = io.TextIOWrapper(target, encoding='utf-8', newline='', write_through=True)
+        writer = csv.writer(out, lineterminator=line_terminator)
+        writer.writerow(headers)
+        if 'country_filename' in headers:
+            column = headers.index('country_filename')
+            rows = (row for row in reader if len(row) > column and row[column] in slugs)
+        else:
+            rows = reader
+        writer.writerows(rows)
+        out.detach()
+
+def write_volume(entries, output_path):
+    """볼륨 1개 작성 (임시 파일 → 원자적 교체) → 실제 크기"""
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=output_path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f, zipfile.ZipFile(f, 'w') as archive:
+            for relative, path, slugs in entries:
+                with archive.open(zip_info(relative, path), 'w') as target:
+                    if slugs is not None:
+                        copy_filtered_csv(path, slugs, target)
+                    else:
+                        with open(path, 'rb') as src:
+                            shutil.copyfileobj(src, target, CHUNK_SIZE)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    os.chmod(tmp_path, FILE_MODE)
+    os.replace(tmp_path, output_path)
+    return output_path.stat().st_size
+
+def volume_paths(name, count, output_dir=OUTPUT_DIR):
+    """볼륨 파일 경로 (1개면 name.zip, 여러 개면 name.part001.zip ...)"""
+    if count == 1:
+        return [output_dir / f"{name}.zip"]
+    return [output_dir / f"{name}.part{i:03d}.zip" for i in range(1, count + 1)]
+
+@instrumentation.timed('bundle')
+def export_bundle(name, tier=None, sets=None, formats=None, max_mb=MAX_VOLUME_MB, output_dir=OUTPUT_DIR):
+    """선택한 파일들을 ZIP 볼륨으로 내보내기 → [(볼륨 경로, 항목 수, 크기)]"""
+    entries = select_entries(tier=tier, sets=sets, formats=formats)
+    if not entries:
+        print("❌ 선택 조건에 맞는 파일이 없습니다.")
+        return False
+
+    max_bytes = int(max_mb * 1024 * 1024)
+    volumes = plan_volumes(entries, max_bytes)
+    paths = volume_paths(name, len(volumes), output_dir)
+
+    # 이전 실행에서 볼륨 수가 달랐다면 남은 볼륨 파일 정리
+    for stale in [output_dir / f"{name}.zip", *output_dir.glob(f"{name}.part[0-9][0-9][0-9].zip")]:
+        if stale not in paths and stale.exists():
+            stale.unlink()
+
+    results = []
+    for volume, output_path in zip(volumes, paths):
+        size = write_volume(volume, output_path)
+        if size > max_bytes:
+            print(f"⚠️  {output_path.name}: 파일 1개가 볼륨 상한({max_mb}MB)보다 큽니다.")
+        print(f"✅ {output_path}: {len(volume)}개 파일, {size / 1024 / 1024:.2f}MB")
+        results.append((output_path, len(volume), size))
+    return results
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="canva_upload_ready 일부를 결정적 ZIP 번들로 내보내기")
+    parser.add_argument('--name', default='canva_upload', help="번들 이름 (bundles/<이름>.zip)")
+    parser.add_argument('--tier', choices=TIERS, help="난이도 1개만 포함")
+    parser.add_argument('--sets', type=parse_set_range, help="세트 번호 범위 (예: 3 또는 1-10)")
+    parser.add_argument('--formats', help="포함할 확장자 (예: png 또는 png,csv)")
+    parser.add_argument('--max-mb', type=float, default=MAX_VOLUME_MB, help="볼륨 1개의 최대 크기 (MB)")
+    parser.add_argument('--quiet', action='store_true', help="파일별 출력 생략")
+    args = parser.parse_args()
+    if args.quiet:
+        instrumentation.set_quiet()
+
+    print("📦 ZIP 번들 내보내기")
+    print("=" * 60)
+
+    if not SOURCE_ROOT.exists():
+        print(f"❌ {SOURCE_ROOT} 폴더가 없습니다.")
+        return False
+
+    formats = {fmt.strip().lstrip('.').lower() for fmt in args.formats.split(',')} if args.formats else None
+    results = export_bundle(args.name, tier=args.tier, sets=args.sets, formats=formats, max_mb=args.max_mb)
+    if not results:
+        return False
+
+    total = sum(size for _, _, size in results)
+    print(f"\n🎉 볼륨 {len(results)}개, 파일 {sum(count for _, count, _ in results)}개, "
+          f"총 {total / 1024 / 1024:.2f}MB → {OUTPUT_DIR}/")
+    return True
+
+if __name__ == "__main__":
+    main()
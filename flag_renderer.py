@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+요청 시점 국기 래스터화 (필요한 크기만 그때그때 렌더링)
+- render(slug, width, height, fmt): 처음 요청될 때만 SVG를 변환하고 결과를 캐시
+- 메모리 LRU(총 바이트 상한) → 디스크 캐시(.render_cache, 총 바이트 상한) → 실제 렌더링 순으로 조회
+- 같은 키를 동시에 요청하면 렌더링은 1번만 하고 나머지는 그 결과를 기다림
+- 캐시 키에 SVG 해시를 넣어 원본이 바뀌면 자동으로 새로 렌더링
+- SVG 폴더 수정시각이 바뀌면(국기 추가·삭제·이름 변경) slug → 경로 목록을 다시 만듦
+- 캐시 키 계산(stat)은 잠금 밖에서 하고, 공용 잠금은 메모리 LRU 조회·추가에만 사용
+"""
+import argparse
+import io
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+
+import asset_index
+import raster_backends
+
+SVG_DIR = Path("canva_upload_ready/flag_images/svg")
+CACHE_DIR = Path(".render_cache")
+MEMORY_CACHE_BYTES = 64 * 1024 * 1024
+DISK_CACHE_BYTES = 512 * 1024 * 1024    # 넘으면 오래 안 쓴 파일부터 삭제해 90%까지 줄임
+MAX_DIMENSION = 4096
+FORMATS = {'png': 'PNG', 'webp': 'WEBP', 'jpeg': 'JPEG'}
+
+TIER_FILE_PATTERN = re.compile(r'^[a-z]+\d+_(.+)\.svg$')
+VIEWBOX_PATTERN = re.compile(rb'viewBox="\s*[-\d.]+[\s,]+[-\d.]+[\s,]+([\d.]+)[\s,]+([\d.]+)')
+SIZE_PATTERN = re.compile(rb'<svg[^>]*?\swidth="([\d.]+)(?:px)?"[^>]*?\sheight="([\d.]+)(?:px)?"')
+
+def svg_aspect(svg_bytes):
+    """SVG 가로/세로 비율 (viewBox → width/height 속성 순, 모르면 1.5)"""
+    for pattern in (VIEWBOX_PATTERN, SIZE_PATTERN):
+        match = pattern.search(svg_bytes[:4096])
+        if match and float(match.group(2)):
+            return float(match.group(1)) / float(match.group(2))
+    return 1.5
+
+def fit_size(aspect, width, height):
+    """(width, height) 상자 안에 비율을 유지해 들어가는 가로 크기"""
+    if height is None:
+        return width
+    return max(1, min(width, round(height * aspect)))
+
+class FlagRenderer:
+    """메모리 LRU + 디스크 캐시 + 동시 요청 합치기"""
+
+    def __init__(self, svg_dir=SVG_DIR, cache_dir=CACHE_DIR, memory_bytes=MEMORY_CACHE_BYTES,
+                 disk_bytes=DISK_CACHE_BYTES):
+        self.svg_dir = Path(svg_dir)
+        self.cache_dir = Path(cache_dir)
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self.disk_size = None
+        self.memory = OrderedDict()
+        self.memory_size = 0
+        self.in_flight = {}
+        self.lock = threading.Lock()            # 메모리 LRU, 진행 중 렌더링, 통계
+        self.index_lock = threading.Lock()      # 에셋 인덱스는 스레드 안전하지 않음
+        self.disk_lock = threading.Lock()       # 디스크 캐시 크기 계산·정리
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'renders': 0, 'coalesced': 0, 'evicted': 0}
+        self._slugs = None
+        self._slug_dirs = ()
+        self._slugs_stamp = None
+        self._digests = {}
+
+    def _dir_stamp(self):
+        """slug 목록을 만들 때 본 폴더들의 현재 수정시각 (파일이 추가·삭제·이름 변경되면 바뀜)"""
+        stamp = []
+        for path in self._slug_dirs:
+            try:
+                stamp.append(os.stat(path).st_mtime_ns)
+            except FileNotFoundError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def _build_slugs(self):
+        """에셋 인덱스를 갱신해 slug → 경로 목록과 그때의 폴더 수정시각을 다시 만듦"""
+        with self.index_lock:
+            index = asset_index.get_index()
+            if not index.refresh_dir(self.svg_dir, recursive=True):
+                self._slug_dirs, self._slugs_stamp, self._slugs = (), (), {}
+                return
+            # 인덱스 전체가 아니라 SVG 폴더 아래만 따라가며 폴더 목록 수집
+            root = Path(os.path.normpath(self.svg_dir)).as_posix()
+            dirs = [root]
+            for key in dirs:
+                dirs.extend(f"{key}/{name}" for name in index.dirs[key]['subdirs'])
+            slugs = {}
+            for path, _ in index.walk(self.svg_dir):
+                match = TIER_FILE_PATTERN.match(path.name)
+                slugs.setdefault(match.group(1) if match else path.stem, path)
+            # 평면 폴더의 '<slug>.svg'가 있으면 그쪽을 우선
+            for name in index.list_dir(self.svg_dir, '.svg'):
+                slugs[name[:-4]] = self.svg_dir / name
+            self._slug_dirs = tuple(dirs)
+            self._slugs_stamp = tuple(index.dirs[key]['mtime_ns'] for key in dirs)
+            self._slugs = slugs
+
+    def find_svg(self, slug):
+        """slug → SVG 경로 (평면 폴더 우선, 없으면 난이도 폴더의 '<접두어>_<slug>.svg')"""
+        if self._slugs is None or self._dir_stamp() != self._slugs_stamp:
+            self._build_slugs()
+        return self._slugs.get(slug)
+
+    def svg_digest(self, svg_path):
+        """SVG 내용 해시 앞 16자 (크기·수정시각이 그대로면 인덱스를 거치지 않고 재사용) - 없으면 None"""
+        try:
+            st = os.stat(svg_path)
+        except FileNotFoundError:
+            return None
+        cached = self._digests.get(svg_path)
+        if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            return cached[2]
+        with self.index_lock:
+            entry = asset_index.get_index().entry(svg_path)
+        if entry is None:
+            return None
+        self._digests[svg_path] = (entry[0], entry[1], entry[2][:16])
+        return entry[2][:16]
+
+    def cache_key(self, slug, width, height, fmt):
+        """캐시 키 (SVG 내용 해시 포함) - SVG가 없으면 None"""
+        svg_path = self.find_svg(slug)
+        if svg_path is None:
+            return None, None
+        digest = self.svg_digest(svg_path) or 'nohash'
+        return (slug, width, height or 0, fmt, digest), svg_path
+
+    def disk_path(self, key):
+        slug, width, height, fmt, digest = key
+        return self.cache_dir / slug / f"{width}x{height}-{digest}.{fmt}"
+
+    def _remember(self, key, data):
+        """메모리 LRU에 추가 (상한 초과 시 오래된 것부터 제거)"""
+        with self.lock:
+            if key in self.memory:
+                return
+            self.memory[key] = data
+            self.memory_size += len(data)
+            while self.memory_size > self.memory_bytes and len(self.memory) > 1:
+                _, old = self.memory.popitem(last=False)
+                self.memory_size -= len(old)
+
+    def render(self, slug, width, height=None, fmt='png'):
+        """국기 이미지 bytes (slug가 없으면 KeyError, 잘못된 인자면 ValueError)"""
+        fmt = fmt.lower().replace('jpg', 'jpeg')
+        if fmt not in FORMATS:
+            raise ValueError(f"지원하지 않는 형식: {fmt}")
+        if not 0 < width <= MAX_DIMENSION or (height is not None and not 0 < height <= MAX_DIMENSION):
+            raise ValueError(f"크기는 1~{MAX_DIMENSION}px 이어야 합니다")
+
+        key, svg_path = self.cache_key(slug, width, height, fmt)
+        if key is None:
+            raise KeyError(slug)
+
+        with self.lock:
+            data = self.memory.get(key)
+            if data is not None:
+                self.memory.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                return data
+            future = self.in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = self.in_flight[key] = Future()
+            else:
+                self.stats['coalesced'] += 1
+
+        if not owner:
+            # 같은 키를 렌더링 중인 요청의 결과를 그대로 사용
+            return future.result()
+
+        try:
+            data = self._load_or_render(key, svg_path)
+            self._remember(key, data)
+            future.set_result(data)
+            return data
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                self.in_flight.pop(key, None)
+
+    def _load_or_render(self, key, svg_path):
+        """디스크 캐시 확인 후 없으면 렌더링해서 저장"""
+        path = self.disk_path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)      # 디스크 캐시 정리 순서(오래 안 쓴 것부터)를 위해 사용 시각 갱신
+            with self.lock:
+                self.stats['disk_hits'] += 1
+            return data
+        except FileNotFoundError:
+            pass
+
+        _, width, height, fmt, _ = key
+        data = rasterize(svg_path, width, height or None, fmt)
+        with self.lock:
+            self.stats['renders'] += 1
+
+        # 임시 파일에 쓴 뒤 교체 (동시에 읽는 다른 프로세스가 깨진 파일을 보지 않도록)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        self._account_disk(len(data))
+        return data
+
+    def _account_disk(self, added):
+        """디스크 캐시 크기 반영, 상한을 넘으면 오래 안 쓴 파일부터 삭제"""
+        with self.disk_lock:
+            if self.disk_size is None:
+                self.disk_size = sum(p.stat().st_size for p in self.cache_dir.rglob('*') if p.is_file())
+            else:
+                self.disk_size += added
+            if self.disk_size <= self.disk_bytes:
+                return
+            entries = []
+            for p in self.cache_dir.rglob('*'):
+                try:
+                    if p.is_file() and not p.name.endswith('.tmp'):
+                        st = p.stat()
+                        entries.append((st.st_mtime_ns, st.st_size, p))
+                except FileNotFoundError:
+                    # 다른 프로세스가 먼저 정리한 파일
+                    continue
+            self.disk_size = sum(size for _, size, _ in entries)
+            target = self.disk_bytes * 9 // 10
+            for _, size, p in sorted(entries):
+                if self.disk_size <= target:
+                    break
+                try:
+                    p.unlink()
+                except FileNotFoundError:
+                    pass
+                self.disk_size -= size
+                with self.lock:
+                    self.stats['evicted'] += 1
+
+def rasterize(svg_path, width, height=None, fmt='png'):
+    """SVG 1개를 선택된 백엔드로 변환 → bytes (높이가 있으면 투명 여백으로 정확히 맞춤)"""
+    backend = raster_backends.get_backend()
+    if backend is None:
+        raise RuntimeError("사용 가능한 래스터화 백엔드가 없습니다")
+
+    size = fit_size(svg_aspect(Path(svg_path).read_bytes()), width, height)
+    with tempfile.TemporaryDirectory(prefix="flag_render_") as tmp:
+        png_path = Path(tmp) / "flag.png"
+        backend.render(svg_path, png_path, size)
+        data = png_path.read_bytes()
+
+    if fmt == 'png' and height is None:
+        return data
+
+    # 상자 맞춤이나 형식 변환은 Pillow가 필요
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(data)).convert('RGBA')
+    if height is not None and image.size != (width, height):
+        canvas = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+        image.thumbnail((width, height))
+        canvas.paste(image, ((width - image.width) // 2, (height - image.height) // 2), image)
+        image = canvas
+    if fmt == 'jpeg':
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        image = background
+
+    out = io.BytesIO()
+    image.save(out, FORMATS[fmt], optimize=True)
+    return out.getvalue()
+
+_shared_renderer = None
+
+def get_renderer():
+    """프로세스 공용 렌더러"""
+    global _shared_renderer
+    if _shared_renderer is None:
+        _shared_renderer = FlagRenderer()
+    return _shared_renderer
+
+def render(country_slug, width, height=None, fmt='png'):
+    """국기 이미지 bytes (공용 렌더러 사용)"""
+    return get_renderer().render(country_slug, width, height, fmt)
+
+def main():
+    """메인 실행 함수: 국기 1개 렌더링해서 파일로 저장"""
+    parser = argparse.ArgumentParser(description="국기 1개를 원하는 크기로 렌더링")
+    parser.add_argument('slug', help="국가 파일명 (예: korea)")
+    parser.add_argument('width', type=int)
+    parser.add_argument('height', type=int, nargs='?')
+    parser.add_argument('--format', default='png', choices=sorted(FORMATS) + ['jpg'])
+    parser.add_argument('--output', help="저장 경로 (기본: <slug>_<가로>x<세로>.<형식>)")
+    args = parser.parse_args()
+
+    renderer = get_renderer()
+    try:
+        data = renderer.render(args.slug, args.width, args.height, args.format)
+    except KeyError:
+        print(f"❌ 국기를 찾을 수 없습니다: {args.slug}")
+        return False
+    except Exception as e:
+        print(f"❌ 렌더링 실패: {e}")
+        return False
+
+    output = Path(args.output or f"{args.slug}_{args.width}x{args.height or 'auto'}.{args.format}")
+    output.write_bytes(data)
+    print(f"✅ {output} ({len(data) / 1024:.1f}KB)")
+    print(f"📊 {renderer.stats}")
+    return True
+
+if __name__ == "__main__":
+    main()
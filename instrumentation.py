@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+파이프라인 공통 계측(instrumentation) 모듈
+- 단계별 구간(span) 시간, CPU 시간, 하위 프로세스 CPU 시간, 읽기/쓰기 바이트 측정
+- 파일별 처리 지연시간 히스토그램 (예: SVG → PNG 변환 1건당 시간)
+- 결과는 .perf/perf_events.jsonl에 JSON Lines로 누적 (배포 폴더 밖, 크기 상한을 넘으면 회전)
+- quiet 모드(--quiet 또는 FLAGS_QUIET=1)에서는 반복 루프의 파일별 출력 생략
+  (--quiet는 각 스크립트가 인자를 파싱한 뒤 set_quiet()으로 켬)
+"""
+import functools
+import json
+import math
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:
+    # Windows: 하위 프로세스 CPU 시간은 측정하지 않음
+    resource = None
+
+EVENTS_FILE = Path(".perf/perf_events.jsonl")
+ROTATED_EVENTS_FILE = EVENTS_FILE.with_suffix('.1.jsonl')
+MAX_EVENTS_BYTES = 4 * 1024 * 1024      # 넘으면 이전 파일 1개만 남기고 새 파일로 시작
+
+QUIET = os.environ.get('FLAGS_QUIET', '') not in ('', '0')
+
+RUN_ID = f"{datetime.now().strftime('%Y%m%dT%H%M%S')}-{os.getpid()}"
+SCRIPT = Path(sys.argv[0]).stem if sys.argv and sys.argv[0] else 'interactive'
+
+def progress(*args, **kwargs):
+    """파일별 진행 출력 (quiet 모드에서는 생략)"""
+    if not QUIET:
+        print(*args, **kwargs)
+
+def set_quiet(enabled=True):
+    """quiet 모드 전환 (argparse를 쓰는 스크립트는 --quiet 파싱 결과로 호출)"""
+    global QUIET
+    QUIET = enabled
+
+def set_quiet_from_argv(argv=None):
+    """argparse가 없는 스크립트의 __main__에서 호출: 명령행 인자에 --quiet가 있으면 quiet 모드"""
+    if '--quiet' in (sys.argv[1:] if argv is None else argv):
+        set_quiet()
+
+def _io_counters():
+    """현재 프로세스의 누적 읽기/쓰기 바이트 (Linux /proc 기준, 그 외는 0)"""
+    try:
+        with open('/proc/self/io', 'r') as f:
+            values = dict(line.split(': ') for line in f.read().splitlines())
+        return int(values['rchar']), int(values['wchar'])
+    except (OSError, KeyError, ValueError):
+        return 0, 0
+
+def _children_cpu():
+    """종료된 하위 프로세스(ImageMagick 등)의 누적 CPU 시간 (resource 모듈이 없으면 0)"""
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+def emit(event):
+    """이벤트 1건을 JSON Lines 파일에 추가 (크기 상한을 넘으면 먼저 회전)"""
+    event = {'run_id': RUN_ID, 'script': SCRIPT, 'time': datetime.now().isoformat(), **event}
+    try:
+        EVENTS_FILE.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            if EVENTS_FILE.stat().st_size >= MAX_EVENTS_BYTES:
+                os.replace(EVENTS_FILE, ROTATED_EVENTS_FILE)
+        except FileNotFoundError:
+            pass
+        with open(EVENTS_FILE, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(event, ensure_ascii=False) + "\n")
+    except OSError:
+        # 계측 실패가 파이프라인 자체를 멈추게 하지 않음
+        pass
+
+class Span:
+    """구간 측정값 (with 블록 안에서 바이트 수 등을 추가 기록)"""
+
+    def __init__(self, name, attrs):
+        self.name = name
+        self.attrs = dict(attrs)
+        self.bytes_read = 0
+        self.bytes_written = 0
+
+    def add_bytes(self, read=0, written=0):
+        """/proc 통계가 없는 환경을 위해 직접 센 바이트 수 추가"""
+        self.bytes_read += read
+        self.bytes_written += written
+
+    def set(self, **attrs):
+        """구간 속성 추가 (예: 처리 파일 수)"""
+        self.attrs.update(attrs)
+
+@contextmanager
+def span(name, **attrs):
+    """구간 시간, CPU 시간, 하위 프로세스 CPU 시간, 입출력 바이트 측정"""
+    current = Span(name, attrs)
+    read_before, written_before = _io_counters()
+    children_before = _children_cpu()
+    cpu_before = time.process_time()
+    start = time.perf_counter()
+    status = 'ok'
+    try:
+        yield current
+    except BaseException:
+        status = 'error'
+        raise
+    finally:
+        read_after, written_after = _io_counters()
+        emit({
+            'type': 'span',
+            'name': name,
+            'status': status,
+            'seconds': round(time.perf_counter() - start, 6),
+            'cpu_seconds': round(time.process_time() - cpu_before, 6),
+            'children_cpu_seconds': round(_children_cpu() - children_before, 6),
+            'bytes_read': (read_after - read_before) or current.bytes_read,
+            'bytes_written': (written_after - written_before) or current.bytes_written,
+            **current.attrs,
+        })
+
+def timed(name):
+    """함수 전체를 span으로 감싸는 데코레이터"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name) as current:
+                result = func(*args, **kwargs)
+                # 스크립트들은 실패를 False 반환으로 알림
+                if result is False:
+                    current.set(status='failed')
+                return result
+        return wrapper
+    return decorator
+
+class LatencyHistogram:
+    """파일별 지연시간 히스토그램 (2의 거듭제곱 ms 버킷, 메모리 고정)"""
+
+    def __init__(self, name):
+        self.name = name
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.minimum = None
+        self.maximum = None
+        self.slowest = None
+
+    def observe(self, seconds, label=None):
+        """지연시간 1건 기록"""
+        ms = seconds * 1000
+        bucket = 0 if ms < 1 else 2 ** math.ceil(math.log2(ms))
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.minimum = seconds if self.minimum is None else min(self.minimum, seconds)
+        if self.maximum is None or seconds > self.maximum:
+            self.maximum = seconds
+            self.slowest = label
+
+    @contextmanager
+    def measure(self, label=None):
+        """with 블록 실행 시간을 1건으로 기록"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, label)
+
+    def quantile(self, q):
+        """버킷 상한 기준 근사 분위수 (ms)"""
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= target:
+                return bucket
+        return max(self.buckets)
+
+    def summary(self):
+        """히스토그램 요약 dict"""
+        return {
+            'count': self.count,
+            'total_seconds': round(self.total, 6),
+            'mean_ms': round(self.total / self.count * 1000, 3) if self.count else None,
+            'min_ms': round(self.minimum * 1000, 3) if self.minimum is not None else None,
+            'max_ms': round(self.maximum * 1000, 3) if self.maximum is not None else None,
+            'p50_ms': self.quantile(0.5),
+            'p90_ms': self.quantile(0.9),
+            'p99_ms': self.quantile(0.99),
+            'slowest': self.slowest,
+            'buckets_ms': {str(bucket): count for bucket, count in sorted(self.buckets.items())},
+        }
+
+    def emit(self):
+        """히스토그램을 이벤트로 기록"""
+        emit({'type': 'histogram', 'name': self.name, **self.summary()})
+
+def load_events(path=EVENTS_FILE):
+    """JSON Lines 이벤트 목록 로드"""
+    events = []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    try:
+                        events.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue
+    except FileNotFoundError:
+        pass
+    return events
+
+def latest_summary(path=EVENTS_FILE):
+    """단계별 가장 최근 측정값 요약 (메타데이터용, 회전된 이전 파일 + 현재 파일만 읽으므로 크기 제한됨)"""
+    stages = {}
+    histograms = {}
+    outliers = {}
+    path = Path(path)
+    events = load_events(path.with_suffix('.1.jsonl')) + load_events(path)
+    for event in events:
+        if event.get('type') == 'span':
+            stages[event['name']] = {
+                key: event.get(key) for key in
+                ('time', 'status', 'seconds', 'cpu_seconds', 'children_cpu_seconds',
+                 'bytes_read', 'bytes_written')
+            }
+        elif event.get('type') == 'histogram':
+            histograms[event['name']] = {
+                key: event.get(key) for key in
+                ('time', 'count', 'mean_ms', 'p50_ms', 'p90_ms', 'p99_ms', 'max_ms', 'slowest')
+            }
+        elif event.get('type') == 'outliers':
+            outliers[event['name']] = {'time': event.get('time'), 'files': event.get('files', [])}
+    return {'stages': stages, 'latency': histograms, 'outliers': outliers}
@@ -4,23 +4,116 @@ Canva 업로드용 파일 구조 최적화 스크립트
 - 업로드 준비 완료된 폴더 구조 생성
 - 메타데이터 및 사용 가이드 생성
 - 백업 및 버전 관리
+- 증분 동기화: 폴더를 지우고 다시 복사하지 않고, 크기·수정시각·해시 manifest로 바뀐 파일만 쓰기/갱신/삭제
 """
+import csv
 import os
-import shutil
+import tempfile
 import json
 from pathlib import Path
 from datetime import datetime
 
+import asset_index
+import asset_store
+import instrumentation
+
+SYNC_MANIFEST = Path(".canva_sync_manifest.json")
+VOLATILE_METADATA_FIELDS = ('created_date',)     # 변경 여부 비교에서 제외
+
+def load_manifest(path=SYNC_MANIFEST):
+    """동기화로 배치한 파일 목록: 대상 경로 → [크기, 수정시각, 해시]"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_manifest(manifest, path=SYNC_MANIFEST):
+    """manifest를 임시 파일에 쓴 뒤 원자적으로 교체"""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def _stat_entry(path):
+    """(크기, 수정시각) - 파일이 없으면 None"""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+def sync_tree(source, dest, manifest, changed=None):
+    """source 폴더를 dest에 증분 동기화 → {'added', 'updated', 'unchanged', 'deleted'} 개수
+
+    - 대상 파일의 크기·수정시각이 manifest와 같고 해시가 원본과 같으면 건너뜀
+    - manifest에 없거나 stat이 다르면 대상 해시를 다시 계산해 비교 (다를 때만 쓰기)
+    - 원본에서 사라진 파일은 이 동기화가 배치한 파일(manifest에 있고 그 뒤로 바뀌지 않은 것)만 삭제
+      → 다른 단계가 같은 폴더에 만든 파일(예: 변환된 PNG)은 건드리지 않음
+    - changed에 list를 넘기면 새로 쓰거나 갱신한 대상 경로를 모아 줌
+    """
+    index = asset_index.get_index()
+    # 제자리 수정된 원본도 잡아내도록 파일별 stat 확인 (해시는 바뀐 파일만 다시 계산)
+    index.refresh_dir(source, recursive=True, check_files=True)
+
+    counts = {'added': 0, 'updated': 0, 'unchanged': 0, 'deleted': 0}
+    seen = set()
+    for path, (_, _, digest) in index.walk(source, hashes=True):
+        target = Path(dest) / path.relative_to(source)
+        key = target.as_posix()
+        seen.add(key)
+
+        current = _stat_entry(target)
+        recorded = manifest.get(key)
+        if current is not None:
+            if recorded and recorded[:2] == current and recorded[2] == digest:
+                counts['unchanged'] += 1
+                continue
+            if asset_store.digest_of(target) == digest:
+                manifest[key] = current + [digest]
+                counts['unchanged'] += 1
+                continue
+
+        asset_store.materialize(asset_store.put_file(path), target)
+        manifest[key] = _stat_entry(target) + [digest]
+        counts['updated' if current is not None else 'added'] += 1
+        if changed is not None:
+            changed.append(target)
+
+    prefix = Path(dest).as_posix() + '/'
+    for key in [key for key in manifest if key.startswith(prefix) and key not in seen]:
+        recorded = manifest.pop(key)
+        if _stat_entry(key) == recorded[:2]:
+            os.unlink(key)
+            counts['deleted'] += 1
+
+    asset_store.save_index()
+    return counts
+
+def write_if_changed(path, content):
+    """내용이 다를 때만 파일 쓰기 (임시 파일 → 원자적 교체) → 썼으면 True"""
+    path = Path(path)
+    data = content.encode('utf-8')
+    try:
+        if path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return True
+
 def create_canva_ready_structure():
     """Canva 업로드용 최적화된 폴더 구조 생성"""
     print("📁 Canva 업로드용 파일 구조 최적화...")
     print("=" * 60)
 
-    # 최종 출력 폴더 생성
+    # 최종 출력 폴더 (기존 내용은 지우지 않고 없는 폴더만 생성)
     output_base = Path("canva_upload_ready")
-    if output_base.exists():
-        shutil.rmtree(output_base)
-    output_base.mkdir()
+    output_base.mkdir(exist_ok=True)
 
     # 하위 폴더 구조 생성
     folders = {
@@ -32,8 +125,12 @@ def create_canva_ready_structure():
     }
 
     for folder, description in folders.items():
-        (output_base / folder).mkdir()
-        print(f"✅ 폴더 생성: {folder}/ ({description})")
+        folder_path = output_base / folder
+        if folder_path.exists():
+            print(f"✅ 폴더 확인: {folder}/ ({description})")
+        else:
+            folder_path.mkdir()
+            print(f"✅ 폴더 생성: {folder}/ ({description})")
 
     return output_base
 
@@ -45,36 +142,42 @@ def copy_csv_data(output_base):
     csv_dest = output_base / "csv_data" / "flag_quiz_data.csv"
 
     if csv_source.exists():
-        shutil.copy2(csv_source, csv_dest)
+        asset_store.publish(csv_source, csv_dest)
         print(f"✅ CSV 파일 복사: {csv_dest}")
     else:
         print(f"❌ CSV 파일을 찾을 수 없습니다: {csv_source}")
 
+def print_sync_counts(label, counts):
+    """동기화 결과 한 줄 출력"""
+    print(f"✅ {label}: 추가 {counts['added']}, 갱신 {counts['updated']}, "
+          f"변경 없음 {counts['unchanged']}, 삭제 {counts['deleted']}")
+
 def copy_flag_images(output_base):
-    """국기 이미지 파일 복사 (SVG 우선, PNG 대안)"""
-    print("\n🎨 국기 이미지 파일 복사 중...")
+    """국기 이미지 파일 동기화 (SVG 우선, PNG 대안) - 바뀐 파일만 복사"""
+    print("\n🎨 국기 이미지 파일 동기화 중...")
 
     svg_source = Path("country-flags/svg_renamed")
     images_dest = output_base / "flag_images"
+    manifest = load_manifest()
 
     if svg_source.exists():
-        shutil.copytree(svg_source, images_dest / "svg", dirs_exist_ok=True)
-        print(f"✅ SVG 파일 복사: {images_dest}/svg/")
+        print_sync_counts(f"SVG 동기화 {images_dest}/svg/", sync_tree(svg_source, images_dest / "svg", manifest))
 
-        # 각 난이도별 파일 수 확인
+        # 각 난이도별 파일 수 확인 (복사 원본의 인덱스 사용)
+        index = asset_index.get_index()
         for difficulty in ['beginner', 'intermediate', 'high']:
-            diff_path = images_dest / "svg" / difficulty
+            diff_path = svg_source / difficulty
             if diff_path.exists():
-                file_count = len(list(diff_path.glob("*.svg")))
-                print(f"  - {difficulty}: {file_count}개 SVG 파일")
+                print(f"  - {difficulty}: {index.count(diff_path, '.svg')}개 SVG 파일")
     else:
         print(f"❌ SVG 폴더를 찾을 수 없습니다: {svg_source}")
 
     # PNG 파일이 있다면 복사
     png_source = Path("country-flags/png_renamed")
     if png_source.exists():
-        shutil.copytree(png_source, images_dest / "png", dirs_exist_ok=True)
-        print(f"✅ PNG 파일 복사: {images_dest}/png/")
+        print_sync_counts(f"PNG 동기화 {images_dest}/png/", sync_tree(png_source, images_dest / "png", manifest))
+
+    save_manifest(manifest)
 
 def create_usage_guide(output_base):
     """Canva 사용 가이드 생성"""
@@ -168,10 +271,10 @@ canva_upload_ready/
 """
 
     guide_path = output_base / "documentation" / "canva_usage_guide.md"
-    with open(guide_path, 'w', encoding='utf-8') as f:
-        f.write(guide_content)
-
-    print(f"✅ 사용 가이드 생성: {guide_path}")
+    if write_if_changed(guide_path, guide_content):
+        print(f"✅ 사용 가이드 생성: {guide_path}")
+    else:
+        print(f"✅ 사용 가이드 변경 없음: {guide_path}")
 
 def create_csv_structure_doc(output_base):
     """CSV 구조 설명 문서 생성"""
@@ -210,35 +313,60 @@ def create_csv_structure_doc(output_base):
 """
 
     csv_doc_path = output_base / "documentation" / "csv_structure.md"
-    with open(csv_doc_path, 'w', encoding='utf-8') as f:
-        f.write(csv_doc_content)
-
-    print(f"✅ CSV 구조 문서 생성: {csv_doc_path}")
+    if write_if_changed(csv_doc_path, csv_doc_content):
+        print(f"✅ CSV 구조 문서 생성: {csv_doc_path}")
+    else:
+        print(f"✅ CSV 구조 문서 변경 없음: {csv_doc_path}")
+
+def collect_dataset_stats(output_base):
+    """실제 CSV와 이미지 폴더에서 퀴즈 수, 난이도 분포, 컬럼 수, 이미지 수 집계"""
+    csv_path = output_base / "csv_data" / "flag_quiz_data.csv"
+    headers = []
+    difficulty_counts = {}
+    if csv_path.exists():
+        with open(csv_path, 'r', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            headers = reader.fieldnames or []
+            for row in reader:
+                difficulty = row.get('difficulty', '')
+                difficulty_counts[difficulty] = difficulty_counts.get(difficulty, 0) + 1
+
+    images_dir = output_base / "flag_images"
+    svg_count = sum(1 for _ in (images_dir / "svg").rglob("*.svg")) if (images_dir / "svg").exists() else 0
+    png_count = sum(1 for _ in (images_dir / "png").rglob("*.png")) if (images_dir / "png").exists() else 0
+
+    return {
+        'total_quizzes': sum(difficulty_counts.values()),
+        'difficulty_distribution': difficulty_counts,
+        'columns': len(headers),
+        'svg_count': svg_count,
+        'png_count': png_count,
+    }
 
 def create_metadata(output_base):
     """메타데이터 파일 생성"""
     print("\n🏷️ 메타데이터 생성 중...")
 
+    stats = collect_dataset_stats(output_base)
+    file_formats = [fmt for fmt, count in (("SVG", stats['svg_count']), ("PNG", stats['png_count'])) if count]
+
     metadata = {
         "project_name": "Flag Quiz Video Generator",
         "created_date": datetime.now().isoformat(),
-        "total_quizzes": 255,
-        "difficulty_distribution": {
-            "beginner": 85,
-            "intermediate": 85,
-            "high": 85
-        },
-        "file_formats": ["SVG", "CSV"],
+        "total_quizzes": stats['total_quizzes'],
+        "difficulty_distribution": stats['difficulty_distribution'],
+        "file_formats": file_formats + ["CSV"],
         "target_platform": "Canva Bulk Create",
         "video_duration": "15 seconds",
         "language": "English",
         "csv_structure": {
-            "columns": 12,
+            "columns": stats['columns'],
             "encoding": "UTF-8",
             "format": "CSV"
         },
         "image_details": {
-            "total_images": 255,
+            "total_images": stats['svg_count'],
+            "total_png_images": stats['png_count'],
             "format": "SVG",
             "organized_by": "difficulty",
             "naming_convention": "country_name_lowercase_with_underscores"
@@ -246,9 +374,19 @@ def create_metadata(output_base):
     }
 
     metadata_path = output_base / "metadata" / "project_metadata.json"
-    with open(metadata_path, 'w', encoding='utf-8') as f:
-        json.dump(metadata, f, ensure_ascii=False, indent=2)
 
+    # 생성 시각(실행마다 바뀜)만 다르고 내용이 같으면 기존 파일 유지 (계측값은 .perf/에만 기록)
+    volatile = dict.fromkeys(VOLATILE_METADATA_FIELDS)
+    try:
+        with open(metadata_path, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        previous = None
+    if previous is not None and {**previous, **volatile} == {**metadata, **volatile}:
+        print(f"✅ 메타데이터 변경 없음: {metadata_path}")
+        return
+
+    write_if_changed(metadata_path, json.dumps(metadata, ensure_ascii=False, indent=2))
     print(f"✅ 메타데이터 생성: {metadata_path}")
 
 def create_backup(output_base):
@@ -266,9 +404,11 @@ def create_backup(output_base):
         source_path = Path(source)
         if source_path.exists():
             dest_path = backup_dir / dest_name
-            shutil.copy2(source_path, dest_path)
+            # 전체 복사 대신 저장소 객체에 대한 참조 + 복제
+            asset_store.backup_file(source_path, dest_path)
             print(f"✅ 백업 완료: {dest_name}")
 
+@instrumentation.timed('canva_package')
 def main():
     """메인 실행 함수"""
     print("🚀 Canva 업로드 준비 최적화 시작")
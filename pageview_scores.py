@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+위키백과 페이지뷰 덤프로 국가별 인지도 점수 산출
+- 로컬에 받아둔 대용량 덤프(pageviews-*.gz, pagecounts-*.bz2 등)를 청크 단위로 압축 해제하며 스트리밍
+- countries.json 국가명으로 미리 만든 문서 제목 인덱스로 매칭 (별칭·쉼표 뒤집기 포함)
+- 청크 파싱/집계는 프로세스 풀에서 병렬 처리, 진행 중인 청크 수를 제한해 메모리 일정
+- 결과를 recognizability_scores.json으로 저장 → classify_flags_by_difficulty.py가 두 번째 근거로 사용
+
+덤프 한 줄 형식: <프로젝트> <문서 제목> <조회수> [...]  (예: "en Japan 1234 0")
+"""
+import argparse
+import bz2
+import gzip
+import math
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+
+import instrumentation
+from answer_analytics import TIER_NAMES, load_tiers, write_tiers
+from quiz_catalog import load_countries_json
+from rename_flags import clean_filename
+
+SCORES_FILE = Path("recognizability_scores.json")
+CHUNK_SIZE = 16 * 1024 * 1024       # 압축 해제 후 청크 크기
+DEFAULT_PROJECTS = ('en', 'en.m', 'en.z', 'en.wikipedia')
+
+# countries.json 이름과 위키백과 문서 제목이 크게 다른 국가
+TITLE_ALIASES = {
+    'KR': ['South Korea'], 'KP': ['North Korea'], 'RU': ['Russia'], 'IR': ['Iran'],
+    'SY': ['Syria'], 'VN': ['Vietnam'], 'LA': ['Laos'], 'BO': ['Bolivia'],
+    'VE': ['Venezuela'], 'TZ': ['Tanzania'], 'MD': ['Moldova'], 'MK': ['North Macedonia'],
+    'FM': ['Federated States of Micronesia'], 'BN': ['Brunei'], 'CZ': ['Czech Republic'],
+    'CI': ["Ivory Coast"], 'CD': ['Democratic Republic of the Congo'],
+    'CG': ['Republic of the Congo'], 'VA': ['Vatican City'], 'PS': ['State of Palestine'],
+    'TW': ['Taiwan'], 'GB': ['United Kingdom'], 'US': ['United States'],
+    'VG': ['British Virgin Islands'], 'VI': ['United States Virgin Islands'],
+    'SZ': ['Eswatini'], 'TL': ['East Timor'], 'CV': ['Cape Verde'], 'TR': ['Turkey'],
+}
+
+def normalize_title(title):
+    """문서 제목 정규화 (공백→밑줄, 덤프 쪽 bytes.lower()와 같게 ASCII만 소문자로)"""
+    return title.strip().replace(' ', '_').encode('utf-8').lower()
+
+def title_variants(code, name):
+    """국가명 1개에서 나올 수 있는 문서 제목 후보"""
+    variants = {name, *TITLE_ALIASES.get(code.upper(), [])}
+    base = name.split('(')[0].strip()
+    variants.add(base)
+    if ',' in base:
+        # "Korea, Republic of" → "Korea", "Republic of Korea"
+        head, tail = [part.strip() for part in base.split(',', 1)]
+        variants.update({head, f"{tail} {head}"})
+    return {normalize_title(variant) for variant in variants if variant}
+
+def build_name_index(countries):
+    """정규화된 문서 제목(bytes) → 파일명(slug) 인덱스"""
+    index = {}
+    for code, name in countries.items():
+        slug = clean_filename(name)
+        for title in title_variants(code, name):
+            index.setdefault(title, slug)
+    return index
+
+# 작업 프로세스 전역 상태 (initializer에서 한 번만 설정)
+_index = None
+_projects = None
+
+def _init_worker(index, projects):
+    global _index, _projects
+    _index = index
+    _projects = projects
+
+def count_chunk(chunk):
+    """청크(완전한 줄들) 1개를 파싱해 {slug: 조회수} 반환"""
+    counts = {}
+    index = _index
+    projects = _projects
+    for line in chunk.split(b'\n'):
+        parts = line.split(b' ', 3)
+        if len(parts) < 3 or parts[0] not in projects:
+            continue
+        slug = index.get(parts[1].lower())
+        if slug is None:
+            continue
+        try:
+            views = int(parts[2])
+        except ValueError:
+            continue
+        counts[slug] = counts.get(slug, 0) + views
+    return counts
+
+def open_dump(path):
+    """덤프 파일을 바이너리 스트림으로 열기 (gzip/bz2/무압축)"""
+    path = str(path)
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rb')
+    if path.endswith('.bz2'):
+        return bz2.open(path, 'rb')
+    return open(path, 'rb')
+
+def iter_chunks(path, chunk_size=CHUNK_SIZE):
+    """압축을 풀며 줄 경계에서 자른 청크 이터레이터"""
+    remainder = b''
+    with open_dump(path) as stream:
+        while True:
+            data = stream.read(chunk_size)
+            if not data:
+                break
+            data = remainder + data
+            cut = data.rfind(b'\n')
+            if cut < 0:
+                remainder = data
+                continue
+            remainder = data[cut + 1:]
+            yield data[:cut]
+    if remainder:
+        yield remainder
+
+@instrumentation.timed('pageview_scores')
+def aggregate_dumps(paths, index, projects=DEFAULT_PROJECTS, workers=None):
+    """덤프 파일들을 프로세스 풀로 집계 → ({slug: 조회수}, 처리 바이트)"""
+    workers = workers or os.cpu_count() or 1
+    max_pending = workers * 2      # 메모리에 올라와 있는 청크 수 상한
+    projects = frozenset(project.encode('utf-8') for project in projects)
+    totals = {}
+    processed = 0
+
+    def merge(done):
+        for future in done:
+            for slug, views in future.result().items():
+                totals[slug] = totals.get(slug, 0) + views
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(index, projects)) as pool:
+        pending = set()
+        for path in paths:
+            instrumentation.progress(f"  📦 {path}")
+            for chunk in iter_chunks(path):
+                processed += len(chunk)
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    merge(done)
+                pending.add(pool.submit(count_chunk, chunk))
+        merge(wait(pending)[0])
+
+    return totals, processed
+
+def score_countries(countries, totals):
+    """국가별 조회수와 로그 스케일 인지도 점수 (0~1)"""
+    slugs = sorted({clean_filename(name) for name in countries.values()})
+    top = max(totals.values(), default=0)
+    scores = {}
+    for slug in slugs:
+        views = totals.get(slug, 0)
+        scores[slug] = {
+            'views': views,
+            'score': round(math.log1p(views) / math.log1p(top), 4) if top else 0.0,
+            'scored': views > 0,
+        }
+    return scores
+
+def assign_tiers(scores):
+    """조회수 많은 순으로 3등분 (많을수록 쉬움)"""
+    ranked = sorted((slug for slug, score in scores.items() if score['scored']),
+                    key=lambda slug: (-scores[slug]['views'], slug))
+    size = len(ranked) // len(TIER_NAMES)
+    return {
+        'beginner': ranked[:size],
+        'intermediate': ranked[size:size * 2],
+        'high': ranked[size * 2:],
+    }
+
+def load_scores(path=SCORES_FILE):
+    """저장된 인지도 구간 로드 (없거나 손상되면 None)"""
+    return load_tiers(path)
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="페이지뷰 덤프로 국가별 인지도 점수 산출")
+    parser.add_argument('dumps', nargs='+', help="페이지뷰 덤프 파일 (.gz / .bz2 / 무압축)")
+    parser.add_argument('--projects', default=','.join(DEFAULT_PROJECTS), help="집계할 프로젝트 코드 (쉼표 구분)")
+    parser.add_argument('--workers', type=int, default=None, help="작업 프로세스 수 (기본: CPU 수)")
+    parser.add_argument('--output', default=str(SCORES_FILE), help="결과 JSON 경로")
+    parser.add_argument('--quiet', action='store_true', help="파일별 출력 생략")
+    args = parser.parse_args()
+    if args.quiet:
+        instrumentation.set_quiet()
+
+    print("🌐 페이지뷰 인지도 점수 산출 시작...")
+    print("=" * 60)
+
+    missing = [path for path in args.dumps if not Path(path).exists()]
+    if missing:
+        print(f"❌ 덤프 파일을 찾을 수 없습니다: {', '.join(missing)}")
+        return False
+
+    # 1. 국가명 → 문서 제목 인덱스
+    countries = load_countries_json()
+    if not countries:
+        print("❌ countries.json을 찾을 수 없습니다.")
+        return False
+    index = build_name_index(countries)
+    print(f"✅ 국가 {len(countries)}개, 문서 제목 후보 {len(index)}개")
+
+    # 2. 덤프 스트리밍 집계
+    projects = [project.strip() for project in args.projects.split(',') if project.strip()]
+    totals, processed = aggregate_dumps(args.dumps, index, projects, args.workers)
+    print(f"📊 압축 해제 {processed / 1024 / 1024:.1f}MB 처리, 매칭된 국가 {len(totals)}개")
+
+    # 3. 점수/구간 산출 및 저장
+    scores = score_countries(countries, totals)
+    tiers = assign_tiers(scores)
+    write_tiers({
+        'source': 'pageviews',
+        'generated': datetime.now().isoformat(),
+        'dumps': [str(path) for path in args.dumps],
+        'projects': projects,
+        'tiers': tiers,
+        'countries': scores,
+    }, args.output)
+
+    for name in TIER_NAMES:
+        print(f"  - {name}: {len(tiers[name])}개")
+    unmatched = [slug for slug, score in scores.items() if not score['scored']]
+    if unmatched:
+        print(f"⚠️  조회수를 찾지 못한 국가 {len(unmatched)}개 (기본 목록 사용): {', '.join(unmatched[:10])}"
+              + (" ..." if len(unmatched) > 10 else ""))
+
+    print(f"\n📁 결과 파일: {args.output}")
+    return True
+
+if __name__ == "__main__":
+    if main():
+        print("\n🎉 인지도 점수 산출이 완료되었습니다!")
+    else:
+        print("\n💥 점수 산출 중 오류가 발생했습니다.")
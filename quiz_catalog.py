@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+SQLite 기반 퀴즈 카탈로그
+- 국가, 에셋, 난이도(tier), 세트, 문제를 하나의 DB에서 관리
+- 난이도 / set_id / 국가 slug 인덱스로 단건 조회와 부분 수정을 전체 재작성 없이 처리
+- 기존 CSV 파일들(flag_quiz_data.csv, Canva/Google Sheets용 CSV)은 DB에서 생성하는 export 결과물
+- 다른 스크립트가 원본 CSV를 직접 수정하면(마지막으로 읽거나 쓴 뒤 크기·수정시각이 바뀌면) export 전에 다시 가져옴
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import asset_store
+import instrumentation
+
+CATALOG_DB = Path("flag_catalog.sqlite3")
+
+QUIZ_CSV = Path("flag_quiz_data.csv")
+CANVA_QUIZ_CSV = Path("canva_upload_ready/csv_data/flag_quiz_data.csv")
+SETS_CSV = Path("flag_quiz_data_with_sets.csv")
+SOURCE_CSVS = [QUIZ_CSV, SETS_CSV]       # 다른 스크립트가 직접 수정하는 CSV (바뀌면 다시 가져옴)
+COUNTRIES_JSON_CANDIDATES = [
+    Path("country-flags/countries.json"),
+    Path("canva_upload_ready/backup/countries_original.json"),
+]
+
+GITHUB_PAGES_URL = "https://davidlikescat.github.io/003_CC_Flags"
+SVG_URL_BASE = f"{GITHUB_PAGES_URL}/canva_upload_ready/flag_images/svg"
+PNG_URL_BASE = f"{GITHUB_PAGES_URL}/canva_upload_ready/flag_images/png"
+
+# 난이도 폴더 SVG 파일명 접두어 (예: beginner/begin01_albania.svg)
+SVG_PREFIXES = {'beginner': 'begin', 'intermediate': 'inter', 'high': 'high'}
+DIFFICULTY_NUMBER_PATTERN = re.compile(r'^[a-z]+(\d+)$')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS countries (
+    slug TEXT PRIMARY KEY,          -- country_filename (예: korea, åland_islands)
+    code TEXT,                      -- countries.json 국가 코드 (예: KR)
+    name TEXT NOT NULL              -- 표시용 국가명
+);
+CREATE TABLE IF NOT EXISTS tiers (
+    slug TEXT PRIMARY KEY REFERENCES countries(slug),
+    difficulty TEXT NOT NULL,       -- beginner / intermediate / high
+    difficulty_number TEXT NOT NULL -- beginner01 ...
+);
+CREATE TABLE IF NOT EXISTS sets (
+    set_id TEXT PRIMARY KEY,        -- Set_01 ...
+    position INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS assets (
+    slug TEXT NOT NULL REFERENCES countries(slug),
+    kind TEXT NOT NULL,             -- svg: 난이도 폴더 SVG, set_png: 세트 번호 PNG
+    path TEXT NOT NULL,
+    PRIMARY KEY (slug, kind)
+);
+CREATE TABLE IF NOT EXISTS questions (
+    quiz_id INTEGER PRIMARY KEY,    -- flag_quiz_data.csv 순서 (난이도순)
+    slug TEXT NOT NULL UNIQUE REFERENCES countries(slug),
+    set_id TEXT REFERENCES sets(set_id),
+    set_quiz_id INTEGER,            -- 세트 CSV 순서 (beginner/intermediate/high 교차)
+    question_text TEXT NOT NULL,
+    option_a TEXT NOT NULL,
+    option_b TEXT NOT NULL,
+    option_c TEXT NOT NULL,
+    option_d TEXT NOT NULL,
+    correct_option TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS country_meta (
+    slug TEXT PRIMARY KEY REFERENCES countries(slug),
+    continent TEXT,                 -- country_regions.json 기준 (예: Europe)
+    subregion TEXT,                 -- 예: Western Europe
+    colors TEXT                     -- 국기 주요 색 (빈도순, 쉼표 구분)
+);
+CREATE TABLE IF NOT EXISTS csv_sources (
+    path TEXT PRIMARY KEY,          -- 카탈로그가 마지막으로 읽거나 쓴 원본 CSV
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tiers_difficulty ON tiers(difficulty, difficulty_number);
+CREATE INDEX IF NOT EXISTS idx_questions_set ON questions(set_id, set_quiz_id);
+CREATE INDEX IF NOT EXISTS idx_assets_path ON assets(path);
+CREATE INDEX IF NOT EXISTS idx_meta_region ON country_meta(continent, subregion);
+"""
+
+# export 공통 조회: 문제 1행 = 국가 + 난이도 + 에셋 조인
+QUESTION_QUERY = """
+SELECT q.quiz_id, q.set_id, q.set_quiz_id, q.question_text,
+       q.option_a, q.option_b, q.option_c, q.option_d, q.correct_option,
+       c.slug, c.name, t.difficulty, t.difficulty_number,
+       svg.path AS svg_path, png.path AS png_path
+FROM questions q
+JOIN countries c ON c.slug = q.slug
+JOIN tiers t ON t.slug = q.slug
+LEFT JOIN assets svg ON svg.slug = q.slug AND svg.kind = 'svg'
+LEFT JOIN assets png ON png.slug = q.slug AND png.kind = 'set_png'
+"""
+
+def _image_formula(size_args=''):
+    """Google Sheets =IMAGE() 수식 컬럼 생성 함수"""
+    return lambda r: f'=IMAGE("{PNG_URL_BASE}/{r["png_path"]}"{size_args})'
+
+_OPTION_COLUMNS = [(name, (lambda key: lambda r: r[key])(name))
+                   for name in ['option_a', 'option_b', 'option_c', 'option_d']]
+
+_QUIZ_COLUMNS = [
+    ('quiz_id', lambda r: r['quiz_id']),
+    ('difficulty', lambda r: r['difficulty']),
+    ('difficulty_number', lambda r: r['difficulty_number']),
+    ('country_filename', lambda r: r['slug']),
+    ('country_name', lambda r: r['name']),
+]
+
+_SET_COLUMNS = [
+    ('set_id', lambda r: r['set_id']),
+    ('quiz_id', lambda r: r['set_quiz_id']),
+    ('difficulty', lambda r: r['difficulty']),
+    ('difficulty_number', lambda r: r['difficulty_number']),
+    ('country_filename', lambda r: r['slug']),
+    ('country_name', lambda r: r['name']),
+    ('flag_image_path', lambda r: r['png_path']),
+]
+
+_ANSWER_COLUMNS = [('correct_answer', lambda r: r['name'])]
+_CORRECT_OPTION = [('correct_option', lambda r: r['correct_option'])]
+_QUESTION = [('question_text', lambda r: r['question_text'])]
+
+def _sheets_columns(image_column):
+    """Google Sheets / Canva Bulk Create 간략형 컬럼 구성"""
+    return ([('set_id', lambda r: r['set_id']), ('quiz_id', lambda r: r['set_quiz_id']),
+             ('country_name', lambda r: r['name']), image_column]
+            + _QUESTION + _OPTION_COLUMNS + _ANSWER_COLUMNS)
+
+# export 대상: 이름 → (파일 경로, 컬럼 목록, 정렬 기준, 줄바꿈 문자)
+EXPORTS = {
+    'quiz': (QUIZ_CSV,
+             _QUIZ_COLUMNS
+             + [('flag_image_path', lambda r: r['svg_path']),
+                ('image_url', lambda r: f"{SVG_URL_BASE}/{r['svg_path']}")]
+             + _QUESTION + _OPTION_COLUMNS + _ANSWER_COLUMNS + _CORRECT_OPTION,
+             'q.quiz_id', '\r\n'),
+    'with_sets': (SETS_CSV,
+                  _SET_COLUMNS + [('image_url', lambda r: f"{PNG_URL_BASE}/{r['png_path']}")]
+                  + _QUESTION + _OPTION_COLUMNS + _ANSWER_COLUMNS + _CORRECT_OPTION,
+                  'q.set_quiz_id', '\n'),
+    'canva': (Path("flag_quiz_data_canva.csv"),
+              _SET_COLUMNS + [('image', lambda r: f"{PNG_URL_BASE}/{r['png_path']}")]
+              + _QUESTION + _OPTION_COLUMNS + _ANSWER_COLUMNS + _CORRECT_OPTION,
+              'q.set_quiz_id', '\n'),
+    'canva_bulk': (Path("canva_bulk_create.csv"),
+                   _sheets_columns(('image', lambda r: r['png_path'])),
+                   'q.set_quiz_id', '\n'),
+    'google_sheets': (Path("flag_quiz_google_sheets.csv"),
+                      [('set_id', lambda r: r['set_id']), ('quiz_id', lambda r: r['set_quiz_id']),
+                       ('difficulty', lambda r: r['difficulty']), ('country_name', lambda r: r['name']),
+                       ('flag_image', _image_formula())]
+                      + _QUESTION + _OPTION_COLUMNS + _ANSWER_COLUMNS + _CORRECT_OPTION,
+                      'q.set_quiz_id', '\n'),
+    'sheets_v1': (Path("google_sheets_v1_auto_size.csv"),
+                  _sheets_columns(('flag_image', _image_formula())), 'q.set_quiz_id', '\n'),
+    'sheets_v2': (Path("google_sheets_v2_small.csv"),
+                  _sheets_columns(('flag_image', _image_formula(', 1, 100, 67'))), 'q.set_quiz_id', '\n'),
+    'sheets_v3': (Path("google_sheets_v3_medium.csv"),
+                  _sheets_columns(('flag_image', _image_formula(', 1, 150, 100'))), 'q.set_quiz_id', '\n'),
+}
+
+def connect(db_path=CATALOG_DB):
+    """카탈로그 DB 연결 (스키마가 없으면 생성)"""
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    conn.executescript(SCHEMA)
+    return conn
+
+def load_countries_json():
+    """countries.json 로드 (원본이 없으면 canva_upload_ready 백업 사용)"""
+    for candidate in COUNTRIES_JSON_CANDIDATES:
+        if candidate.exists():
+            with open(candidate, 'r', encoding='utf-8') as f:
+                return json.load(f)
+    return {}
+
+def import_csvs(conn, quiz_csv=None, sets_csv=SETS_CSV):
+    """기존 CSV 파일들을 카탈로그로 가져오기 (최초 생성 시, 또는 CSV가 외부에서 수정됐을 때)"""
+    quiz_csv = quiz_csv or (QUIZ_CSV if QUIZ_CSV.exists() else CANVA_QUIZ_CSV)
+    codes_by_name = {name: code for code, name in load_countries_json().items()}
+
+    with open(quiz_csv, 'r', encoding='utf-8') as f:
+        quiz_rows = list(csv.DictReader(f))
+
+    set_rows = {}
+    if Path(sets_csv).exists():
+        with open(sets_csv, 'r', encoding='utf-8') as f:
+            set_rows = {row['country_filename']: row for row in csv.DictReader(f)}
+
+    with conn:
+        # CSV에서 빠진 국가는 같은 트랜잭션에서 삭제 (남겨 두면 다음 export에서 되살아남)
+        slugs = {row['country_filename'] for row in quiz_rows}
+        removed = [(slug,) for (slug,) in conn.execute("SELECT slug FROM countries") if slug not in slugs]
+        for table in ['questions', 'assets', 'tiers', 'country_meta', 'countries']:
+            conn.executemany(f"DELETE FROM {table} WHERE slug = ?", removed)
+        if set_rows:
+            conn.executemany("DELETE FROM assets WHERE slug = ? AND kind = 'set_png'",
+                             [(slug,) for slug in slugs if slug not in set_rows])
+
+        for row in quiz_rows:
+            slug = row['country_filename']
+            set_row = set_rows.get(slug, {})
+
+            conn.execute("INSERT OR REPLACE INTO countries (slug, code, name) VALUES (?, ?, ?)",
+                         (slug, codes_by_name.get(row['country_name']), row['country_name']))
+            conn.execute("INSERT OR REPLACE INTO tiers (slug, difficulty, difficulty_number) VALUES (?, ?, ?)",
+                         (slug, row['difficulty'], row['difficulty_number']))
+            conn.execute("INSERT OR REPLACE INTO assets (slug, kind, path) VALUES (?, 'svg', ?)",
+                         (slug, row['flag_image_path']))
+
+            if set_row:
+                set_id = set_row['set_id']
+                conn.execute("INSERT OR IGNORE INTO sets (set_id, position) VALUES (?, ?)",
+                             (set_id, int(set_id.split('_')[1])))
+                conn.execute("INSERT OR REPLACE INTO assets (slug, kind, path) VALUES (?, 'set_png', ?)",
+                             (slug, set_row['flag_image_path']))
+
+            conn.execute("""
+                INSERT OR REPLACE INTO questions
+                    (quiz_id, slug, set_id, set_quiz_id, question_text,
+                     option_a, option_b, option_c, option_d, correct_option)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (int(row['quiz_id']), slug, set_row.get('set_id'),
+                  int(set_row['quiz_id']) if set_row else None, row['question_text'],
+                  row['option_a'], row['option_b'], row['option_c'], row['option_d'],
+                  row['correct_option']))
+
+    record_sources(conn, [quiz_csv, sets_csv])
+    return len(quiz_rows)
+
+def _stat(path):
+    """(크기, 수정시각) - 파일이 없으면 None"""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+def record_sources(conn, paths):
+    """원본 CSV의 현재 상태 기록 (카탈로그가 직접 읽거나 쓴 뒤 호출)"""
+    rows = [(str(path), *stat) for path, stat in ((path, _stat(path)) for path in paths) if stat]
+    with conn:
+        conn.executemany("INSERT OR REPLACE INTO csv_sources (path, size, mtime_ns) VALUES (?, ?, ?)", rows)
+
+def stale_sources(conn):
+    """마지막 기록 이후 외부에서 바뀐 원본 CSV 목록"""
+    recorded = {row['path']: (row['size'], row['mtime_ns'])
+                for row in conn.execute("SELECT path, size, mtime_ns FROM csv_sources")}
+    stale = []
+    for path in map(str, SOURCE_CSVS):
+        current = _stat(path)
+        if current is not None and current != recorded.get(path):
+            stale.append(path)
+    return stale
+
+def sync_from_csvs(conn):
+    """원본 CSV가 외부에서 수정됐으면 다시 가져오기 → 가져온 문제 수 (변경 없으면 0)"""
+    if not conn.execute("SELECT 1 FROM csv_sources LIMIT 1").fetchone():
+        # 상태 기록이 없는 기존 DB: DB를 기준으로 삼고 현재 CSV 상태만 기록
+        record_sources(conn, SOURCE_CSVS)
+        return 0
+    stale = stale_sources(conn)
+    if not stale:
+        return 0
+    print(f"⚠️  카탈로그 밖에서 수정된 CSV를 다시 가져옵니다: {', '.join(stale)}")
+    return import_csvs(conn)
+
+def open_catalog(db_path=CATALOG_DB):
+    """카탈로그 연결 + 처음이면 CSV 가져오기, 외부에서 수정된 CSV가 있으면 다시 가져오기 → (연결, 가져온 문제 수)"""
+    first_run = not Path(db_path).exists()
+    conn = connect(db_path)
+    count = import_csvs(conn) if first_run else sync_from_csvs(conn)
+    return conn, count
+
+def get_question(conn, quiz_id):
+    """quiz_id로 문제 1건 조회"""
+    return conn.execute(QUESTION_QUERY + " WHERE q.quiz_id = ?", (quiz_id,)).fetchone()
+
+def get_question_by_slug(conn, slug):
+    """국가 slug로 문제 1건 조회"""
+    return conn.execute(QUESTION_QUERY + " WHERE q.slug = ?", (slug,)).fetchone()
+
+def questions_by_difficulty(conn, difficulty):
+    """난이도별 문제 목록 (difficulty 인덱스 사용)"""
+    return conn.execute(QUESTION_QUERY + " WHERE t.difficulty = ? ORDER BY t.difficulty_number",
+                        (difficulty,)).fetchall()
+
+def questions_in_set(conn, set_id):
+    """세트별 문제 목록 (set_id 인덱스 사용)"""
+    return conn.execute(QUESTION_QUERY + " WHERE q.set_id = ? ORDER BY q.set_quiz_id",
+                        (set_id,)).fetchall()
+
+QUESTION_FIELDS = {'question_text', 'option_a', 'option_b', 'option_c', 'option_d', 'correct_option'}
+
+def update_question(conn, quiz_id, **fields):
+    """문제 일부 컬럼만 수정 (예: 오답 하나 교체)"""
+    unknown = set(fields) - QUESTION_FIELDS
+    if unknown:
+        raise ValueError(f"수정할 수 없는 컬럼: {', '.join(sorted(unknown))}")
+    if not fields:
+        return 0
+
+    assignments = ", ".join(f"{name} = ?" for name in fields)
+    with conn:
+        cursor = conn.execute(f"UPDATE questions SET {assignments} WHERE quiz_id = ?",
+                              (*fields.values(), quiz_id))
+    return cursor.rowcount
+
+def tier_svg_path(slug, difficulty, difficulty_number):
+    """난이도 폴더 SVG 상대 경로 (예: beginner/begin01_albania.svg)"""
+    match = DIFFICULTY_NUMBER_PATTERN.match(difficulty_number)
+    if difficulty not in SVG_PREFIXES or not match:
+        raise ValueError(f"알 수 없는 난이도 번호: {difficulty} {difficulty_number}")
+    return f"{difficulty}/{SVG_PREFIXES[difficulty]}{match.group(1)}_{slug}.svg"
+
+def set_tier(conn, slug, difficulty, difficulty_number):
+    """국가 1개의 난이도 변경 (SVG 에셋 경로도 새 난이도 폴더로 갱신)"""
+    svg_path = tier_svg_path(slug, difficulty, difficulty_number)
+    with conn:
+        cursor = conn.execute("UPDATE tiers SET difficulty = ?, difficulty_number = ? WHERE slug = ?",
+                              (difficulty, difficulty_number, slug))
+        conn.execute("UPDATE assets SET path = ? WHERE slug = ? AND kind = 'svg'", (svg_path, slug))
+    return cursor.rowcount
+
+def iter_export_rows(conn, target):
+    """export 대상의 (헤더, 행 이터레이터) 반환 - 전체 목록을 메모리에 올리지 않음"""
+    _, columns, order_by, _ = EXPORTS[target]
+    headers = [name for name, _ in columns]
+    getters = [getter for _, getter in columns]
+    cursor = conn.execute(QUESTION_QUERY + f" ORDER BY {order_by}")
+    return headers, ([getter(record) for getter in getters] for record in cursor)
+
+def export_csv(conn, target, output_path=None):
+    """카탈로그에서 CSV 1개 생성 (임시 파일에 쓴 뒤 원자적으로 교체)"""
+    path, _, _, line_terminator = EXPORTS[target]
+    output_path = Path(output_path or path)
+    headers, rows = iter_export_rows(conn, target)
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=output_path.parent, suffix='.tmp')
+    count = 0
+    with os.fdopen(fd, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, lineterminator=line_terminator)
+        writer.writerow(headers)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    os.replace(tmp_path, output_path)
+    if output_path in SOURCE_CSVS:
+        record_sources(conn, [output_path])
+    return output_path, count
+
+@instrumentation.timed('export')
+def export_all(conn, targets=None):
+    """모든 export 대상 CSV 재생성 (외부에서 수정된 원본 CSV가 있으면 먼저 가져와 덮어쓰지 않음)"""
+    sync_from_csvs(conn)
+    results = []
+    for target in targets or EXPORTS:
+        output_path, count = export_csv(conn, target)
+        print(f"✅ {target:<14} → {output_path} ({count}행)")
+        results.append((target, output_path, count))
+    return results
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="SQLite 퀴즈 카탈로그")
+    parser.add_argument('command', nargs='?', default='export', choices=['import', 'export', 'show'],
+                        help="import: 기존 CSV → DB, export: DB → 모든 CSV, show: 문제 1건 조회")
+    parser.add_argument('key', nargs='?', help="show 명령의 quiz_id 또는 국가 slug")
+    args = parser.parse_args()
+
+    print("🗃️ 퀴즈 카탈로그 (SQLite)")
+    print("=" * 60)
+
+    conn, count = open_catalog()
+    if args.command == 'import' and not count:
+        count = import_csvs(conn)
+    if count:
+        print(f"📥 CSV → 카탈로그 가져오기 완료: {count}개 문제")
+
+    if args.command == 'show':
+        if not args.key:
+            print("❌ 조회할 quiz_id 또는 국가 slug를 입력하세요.")
+            return
+        record = get_question(conn, int(args.key)) if args.key.isdigit() else get_question_by_slug(conn, args.key)
+        if record is None:
+            print(f"❌ 문제를 찾을 수 없습니다: {args.key}")
+            return
+        for key in record.keys():
+            print(f"  {key}: {record[key]}")
+        return
+
+    if args.command == 'export':
+        print("\n📤 CSV export 생성 중...")
+        export_all(conn)
+
+        if CANVA_QUIZ_CSV.parent.exists():
+            asset_store.publish(QUIZ_CSV, CANVA_QUIZ_CSV)
+            print("✅ Canva 업로드 폴더 CSV 동기화 완료")
+
+        print(f"\n💾 카탈로그 위치: {CATALOG_DB}")
+
+if __name__ == "__main__":
+    main()
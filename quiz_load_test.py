@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+quiz_server.py 로컬 부하 테스트
+- keep-alive 연결 여러 개로 정해진 시간 동안 요청을 반복 전송 (asyncio, 외부 의존성 없음)
+- 문제/덱/이미지 요청을 섞어 보내고 초당 요청 수와 지연시간 분포 출력
+- --spawn 옵션을 주면 서버를 별도 프로세스로 띄운 뒤 측정
+"""
+import argparse
+import asyncio
+import random
+import subprocess
+import sys
+import time
+
+from instrumentation import LatencyHistogram
+
+HOST = '127.0.0.1'
+PORT = 8080
+
+REQUEST_MIX = [
+    (5, '/api/question?difficulty=beginner'),
+    (5, '/api/question?difficulty=high'),
+    (3, '/api/deck?difficulty=intermediate&size=10'),
+    (2, '/api/deck?set=Set_01&size=15&seed=1'),
+    (2, '/flags/svg/beginner/begin01_albania.svg'),
+    (1, '/api/sets'),
+]
+
+def build_requests(host):
+    """가중치대로 섞인 요청 bytes 목록"""
+    requests = []
+    for weight, path in REQUEST_MIX:
+        request = f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode('latin-1')
+        requests.extend([request] * weight)
+    return requests
+
+async def read_response(reader):
+    """응답 1개 읽기 → 상태 코드"""
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.split(b'\r\n')
+    status = int(lines[0].split()[1])
+    length = 0
+    for line in lines[1:]:
+        if line[:15].lower() == b'content-length:':
+            length = int(line[15:])
+            break
+    if length:
+        await reader.readexactly(length)
+    return status
+
+async def client(host, port, requests, deadline, latency, statuses):
+    """연결 1개로 마감 시각까지 요청 반복"""
+    reader, writer = await asyncio.open_connection(host, port)
+    rng = random.Random()
+    try:
+        while time.perf_counter() < deadline:
+            request = rng.choice(requests)
+            start = time.perf_counter()
+            writer.write(request)
+            status = await read_response(reader)
+            latency.observe(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+async def run_load(host, port, connections, duration):
+    """부하 실행 → (총 요청 수, 소요 시간, 히스토그램, 상태 코드별 수)"""
+    latency = LatencyHistogram('quiz_server_latency')
+    statuses = {}
+    requests = build_requests(host)
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(client(host, port, requests, deadline, latency, statuses)
+                           for _ in range(connections)))
+    return latency.count, time.perf_counter() - start, latency, statuses
+
+async def wait_for_server(host, port, timeout=10):
+    """서버가 연결을 받을 때까지 대기"""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return True
+        except OSError:
+            await asyncio.sleep(0.1)
+    return False
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="퀴즈 서버 부하 테스트")
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--connections', type=int, default=50, help="동시 연결 수")
+    parser.add_argument('--duration', type=float, default=10, help="측정 시간 (초)")
+    parser.add_argument('--spawn', action='store_true', help="서버를 별도 프로세스로 띄워서 측정")
+    args = parser.parse_args()
+
+    print("🔥 퀴즈 서버 부하 테스트")
+    print("=" * 60)
+
+    server = None
+    if args.spawn:
+        server = subprocess.Popen([sys.executable, 'quiz_server.py', '--host', args.host, '--port', str(args.port)],
+                                  stdout=subprocess.DEVNULL)
+    try:
+        if not asyncio.run(wait_for_server(args.host, args.port)):
+            print(f"❌ 서버에 연결할 수 없습니다: {args.host}:{args.port}")
+            return False
+
+        print(f"🔗 연결 {args.connections}개, {args.duration:.0f}초 측정 중...")
+        total, elapsed, latency, statuses = asyncio.run(
+            run_load(args.host, args.port, args.connections, args.duration))
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    summary = latency.summary()
+    print("\n" + "=" * 60)
+    print(f"📊 총 요청: {total:,}건 ({elapsed:.1f}초)")
+    print(f"⚡ 처리량: {total / elapsed:,.0f} req/s")
+    print(f"⏱️  평균 {summary['mean_ms']}ms, p50 ≤ {summary['p50_ms']}ms, "
+          f"p99 ≤ {summary['p99_ms']}ms, 최대 {summary['max_ms']}ms")
+    print(f"📋 상태 코드: {', '.join(f'{code}={count:,}' for code, count in sorted(statuses.items()))}")
+
+    errors = sum(count for code, count in statuses.items() if code >= 400)
+    if errors:
+        print(f"⚠️  오류 응답 {errors:,}건")
+    return errors == 0
+
+if __name__ == "__main__":
+    if main():
+        print("\n🎉 부하 테스트가 완료되었습니다!")
+    else:
+        print("\n💥 부하 테스트 중 오류가 발생했습니다.")
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+국기 퀴즈 실시간 HTTP 서버 (asyncio, 외부 의존성 없음)
+- 시작 시 퀴즈 CSV를 읽어 문제별 JSON 응답을 미리 인코딩한 bytes 튜플과 난이도/세트별 번호 배열로 보관
+- 난이도·세트별 무작위 문제, 섞인 덱(deck) 제공 - 섞인 덱은 (범위, 크기, seed) 키의 LRU 캐시에 보관
+- 국기 이미지(SVG/PNG)는 ETag + Cache-Control 헤더와 함께 제공 (If-None-Match → 304)
+
+엔드포인트:
+  GET /api/health
+  GET /api/sets
+  GET /api/question?difficulty=beginner | ?set=Set_01
+  GET /api/deck?difficulty=high&size=20[&seed=7] | ?set=Set_01
+  GET /flags/svg/<경로>, /flags/png/<파일명>
+  GET /render/<slug>.<png|webp|jpeg>?w=320[&h=200]   (flag_renderer로 요청 시점 렌더링)
+"""
+import argparse
+import asyncio
+import json
+import mimetypes
+import random
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import asset_index
+import catalog_cache
+import flag_renderer
+
+QUIZ_CSV = Path("canva_upload_ready/csv_data/flag_quiz_data.csv")
+SETS_CSV = Path("flag_quiz_data_with_sets.csv")
+FLAG_DIR = Path("canva_upload_ready/flag_images")
+
+HOST = '127.0.0.1'
+PORT = 8080
+DECK_CACHE_SIZE = 512           # 캐시할 섞인 덱 수
+DECK_VARIANTS = 32              # seed 없이 요청하면 이 수만큼의 덱 중 하나를 제공 (캐시 적중률 확보)
+DEFAULT_DECK_SIZE = 10
+MAX_DECK_SIZE = 100
+ASSET_CACHE_BYTES = 32 * 1024 * 1024
+ASSET_MAX_AGE = 86400
+MAX_HEADER_BYTES = 16 * 1024
+MAX_DISCARD_BYTES = 64 * 1024   # 이보다 큰 요청 본문은 읽어 버리지 않고 응답 후 연결을 닫음
+
+STATUS_TEXT = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found',
+               405: 'Method Not Allowed', 431: 'Request Header Fields Too Large',
+               500: 'Internal Server Error'}
+
+class QuizCatalog:
+    """메모리 상주 카탈로그: 문제별 인코딩된 JSON + 범위별 문제 번호 배열"""
+
+    def __init__(self, questions, scopes):
+        self.questions = questions      # tuple[bytes] - 문제 1개의 JSON
+        self.scopes = scopes            # {'difficulty:beginner' 또는 'set:Set_01': array('H')}
+        self.deck_cache = OrderedDict()
+        self.deck_hits = 0
+        self.deck_misses = 0
+
+    @classmethod
+    def load(cls, quiz_csv=QUIZ_CSV, sets_csv=SETS_CSV):
+        """CSV를 읽어 카탈로그 구성"""
+        set_of = {}
+        if Path(sets_csv).exists():
+            sets = catalog_cache.load_table(sets_csv)
+            set_of = {slug: (set_id, png) for slug, set_id, png in zip(
+                sets.column('country_filename'), sets.column('set_id'), sets.column('flag_image_path'))}
+
+        questions = []
+        scopes = {'all': array('H')}
+        table = catalog_cache.load_table(quiz_csv)
+        columns = zip(*(table.column(name) for name in (
+            'quiz_id', 'difficulty', 'country_filename', 'question_text',
+            'option_a', 'option_b', 'option_c', 'option_d', 'correct_option', 'flag_image_path')))
+        for position, (quiz_id, difficulty, slug, text, a, b, c, d, answer, svg_path) in enumerate(columns):
+            set_id, set_png = set_of.get(slug, (None, None))
+            question = {
+                'quiz_id': int(quiz_id),
+                'difficulty': difficulty,
+                'set_id': set_id,
+                'country': slug,
+                'question': text,
+                'options': [a, b, c, d],
+                'answer': answer,
+                'flag_svg': f"/flags/svg/{svg_path}",
+                'flag_png': f"/flags/png/{set_png}" if set_png else None,
+            }
+            questions.append(json.dumps(question, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+            scopes['all'].append(position)
+            scopes.setdefault(f"difficulty:{difficulty}", array('H')).append(position)
+            if set_id:
+                scopes.setdefault(f"set:{set_id}", array('H')).append(position)
+        return cls(tuple(questions), scopes)
+
+    def scope_key(self, params):
+        """쿼리 파라미터 → 범위 키 (없는 범위면 None)"""
+        if 'set' in params:
+            key = f"set:{params['set']}"
+        elif 'difficulty' in params:
+            key = f"difficulty:{params['difficulty']}"
+        else:
+            key = 'all'
+        return key if key in self.scopes else None
+
+    def random_question(self, scope):
+        """범위 안에서 무작위 문제 1개 (인코딩된 JSON)"""
+        return self.questions[random.choice(self.scopes[scope])]
+
+    def deck(self, scope, size, seed):
+        """섞인 덱 JSON (LRU 캐시)"""
+        key = (scope, size, seed)
+        body = self.deck_cache.get(key)
+        if body is not None:
+            self.deck_cache.move_to_end(key)
+            self.deck_hits += 1
+            return body
+
+        self.deck_misses += 1
+        positions = list(self.scopes[scope])
+        random.Random(f"{scope}:{seed}").shuffle(positions)
+        items = b','.join(self.questions[position] for position in positions[:size])
+        body = b'{"scope":"%s","seed":%d,"size":%d,"questions":[%s]}' % (
+            scope.encode('utf-8'), seed, min(size, len(positions)), items)
+        self.deck_cache[key] = body
+        if len(self.deck_cache) > DECK_CACHE_SIZE:
+            self.deck_cache.popitem(last=False)
+        return body
+
+class AssetCache:
+    """국기 이미지 bytes + ETag 캐시 (총 바이트 상한 LRU)"""
+
+    def __init__(self, root=FLAG_DIR, max_bytes=ASSET_CACHE_BYTES):
+        self.base = root
+        self.root = root.resolve()
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+
+    def get(self, relative):
+        """상대 경로 → (bytes, etag, content_type) 또는 None"""
+        entry = self.entries.get(relative)
+        if entry is not None:
+            self.entries.move_to_end(relative)
+            return entry
+
+        path = self.base / relative
+        resolved = path.resolve()
+        if self.root not in resolved.parents or not resolved.is_file():
+            return None
+        # 인덱스의 해시를 ETag로 사용 (파일이 바뀌면 인덱스가 다시 해시)
+        indexed = asset_index.get_index().entry(path)
+        data = resolved.read_bytes()
+        etag = f'"{indexed[2][:16]}"' if indexed else f'"{len(data):x}-{resolved.stat().st_mtime_ns:x}"'
+        content_type = mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+        entry = (data, etag, content_type)
+
+        self.entries[relative] = entry
+        self.size += len(data)
+        while self.size > self.max_bytes and len(self.entries) > 1:
+            _, (old, _, _) = self.entries.popitem(last=False)
+            self.size -= len(old)
+        return entry
+
+def build_response(status, body=b'', content_type='application/json; charset=utf-8',
+                   headers=None, keep_alive=True):
+    """HTTP/1.1 응답 bytes"""
+    lines = [f"HTTP/1.1 {status} {STATUS_TEXT[status]}",
+             f"Content-Length: {len(body)}",
+             f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+    if body or status != 304:
+        lines.append(f"Content-Type: {content_type}")
+    for name, value in (headers or {}).items():
+        lines.append(f"{name}: {value}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode('latin-1') + body
+
+def error_body(message):
+    return json.dumps({'error': message}, ensure_ascii=False).encode('utf-8')
+
+class QuizServer:
+    """요청 라우팅 + 연결 처리"""
+
+    def __init__(self, catalog, assets):
+        self.catalog = catalog
+        self.assets = assets
+        self.requests = 0
+
+    async def handle_render(self, target, keep_alive):
+        """/render/<slug>.<형식> - 렌더링은 스레드 풀에서 (같은 키 동시 요청은 렌더러가 합침)"""
+        url = urlsplit(target)
+        slug, _, fmt = unquote(url.path[len('/render/'):]).rpartition('.')
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            width = int(params.get('w', 512))
+            height = int(params['h']) if 'h' in params else None
+        except ValueError:
+            return build_response(400, error_body("w/h는 정수여야 합니다"), keep_alive=keep_alive)
+
+        loop = asyncio.get_running_loop()
+        try:
+            data = await loop.run_in_executor(None, flag_renderer.render, slug, width, height, fmt or 'png')
+        except KeyError:
+            return build_response(404, error_body("국기를 찾을 수 없습니다"), keep_alive=keep_alive)
+        except ValueError as e:
+            return build_response(400, error_body(str(e)), keep_alive=keep_alive)
+        except Exception as e:
+            return build_response(500, error_body(f"렌더링 실패: {e}"), keep_alive=keep_alive)
+
+        content_type = mimetypes.guess_type(f"flag.{fmt}")[0] or 'application/octet-stream'
+        return build_response(200, data, content_type,
+                              {'Cache-Control': f'public, max-age={ASSET_MAX_AGE}'}, keep_alive)
+
+    def handle(self, method, target, headers, keep_alive):
+        """요청 1건 → 응답 bytes"""
+        self.requests += 1
+        if method != 'GET':
+            return build_response(405, error_body("GET만 지원합니다"), keep_alive=keep_alive)
+
+        url = urlsplit(target)
+        path = url.path
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        if path.startswith('/flags/'):
+            entry = self.assets.get(unquote(path[len('/flags/'):]))
+            if entry is None:
+                return build_response(404, error_body("이미지를 찾을 수 없습니다"), keep_alive=keep_alive)
+            data, etag, content_type = entry
+            cache_headers = {'ETag': etag, 'Cache-Control': f'public, max-age={ASSET_MAX_AGE}'}
+            if headers.get('if-none-match') == etag:
+                return build_response(304, headers=cache_headers, keep_alive=keep_alive)
+            return build_response(200, data, content_type, cache_headers, keep_alive)
+
+        no_store = {'Cache-Control': 'no-store'}
+        if path == '/api/question':
+            scope = self.catalog.scope_key(params)
+            if scope is None:
+                return build_response(404, error_body("없는 난이도/세트입니다"), keep_alive=keep_alive)
+            return build_response(200, self.catalog.random_question(scope), headers=no_store, keep_alive=keep_alive)
+
+        if path == '/api/deck':
+            scope = self.catalog.scope_key(params)
+            if scope is None:
+                return build_response(404, error_body("없는 난이도/세트입니다"), keep_alive=keep_alive)
+            try:
+                size = min(int(params.get('size', DEFAULT_DECK_SIZE)), MAX_DECK_SIZE)
+                seed = int(params['seed']) if 'seed' in params else random.randrange(DECK_VARIANTS)
+            except ValueError:
+                return build_response(400, error_body("size/seed는 정수여야 합니다"), keep_alive=keep_alive)
+            # seed가 정해진 덱은 내용이 고정이므로 캐시 가능
+            deck_headers = {'Cache-Control': 'public, max-age=300'} if 'seed' in params else no_store
+            return build_response(200, self.catalog.deck(scope, max(size, 1), seed), headers=deck_headers, keep_alive=keep_alive)
+
+        if path == '/api/sets':
+            sets = sorted(key[4:] for key in self.catalog.scopes if key.startswith('set:'))
+            return build_response(200, json.dumps(sets).encode('utf-8'),
+                                  headers={'Cache-Control': 'public, max-age=300'}, keep_alive=keep_alive)
+
+        if path == '/api/health':
+            body = json.dumps({
+                'questions': len(self.catalog.questions),
+                'requests': self.requests,
+                'deck_cache': {'size': len(self.catalog.deck_cache), 'hits': self.catalog.deck_hits,
+                               'misses': self.catalog.deck_misses},
+                'asset_cache_bytes': self.assets.size,
+            }).encode('utf-8')
+            return build_response(200, body, headers=no_store, keep_alive=keep_alive)
+
+        return build_response(404, error_body("없는 경로입니다"), keep_alive=keep_alive)
+
+    async def serve_connection(self, reader, writer):
+        """keep-alive 연결 1개 처리 (요청 본문은 사용하지 않지만 다음 요청 위치를 맞추려고 읽어서 버림)"""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except asyncio.LimitOverrunError:
+                    writer.write(build_response(431, error_body("헤더가 너무 큽니다"), keep_alive=False))
+                    break
+                except asyncio.IncompleteReadError:
+                    break
+
+                lines = head.decode('latin-1').split('\r\n')
+                try:
+                    method, target, version = lines[0].split(' ', 2)
+                except ValueError:
+                    writer.write(build_response(400, error_body("잘못된 요청입니다"), keep_alive=False))
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(':')
+                    if name:
+                        headers[name.strip().lower()] = value.strip()
+
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+
+                # 본문을 남겨 두면 다음 요청으로 잘못 읽히므로 Content-Length만큼 버림
+                try:
+                    body_length = int(headers.get('content-length', '0'))
+                except ValueError:
+                    body_length = -1
+                if body_length < 0:
+                    writer.write(build_response(400, error_body("잘못된 Content-Length입니다"), keep_alive=False))
+                    break
+                if 'transfer-encoding' in headers or body_length > MAX_DISCARD_BYTES:
+                    # 길이를 모르거나 너무 큰 본문: 읽지 않고 이번 응답 후 연결 종료
+                    keep_alive = False
+                elif body_length:
+                    try:
+                        await reader.readexactly(body_length)
+                    except asyncio.IncompleteReadError:
+                        break
+                if method == 'GET' and target.startswith('/render/'):
+                    self.requests += 1
+                    writer.write(await self.handle_render(target, keep_alive))
+                else:
+                    writer.write(self.handle(method, target, headers, keep_alive))
+                if not keep_alive:
+                    break
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+async def run_server(host=HOST, port=PORT):
+    """카탈로그 로드 후 서버 실행"""
+    catalog = QuizCatalog.load()
+    server = QuizServer(catalog, AssetCache())
+    listener = await asyncio.start_server(server.serve_connection, host, port,
+                                          limit=MAX_HEADER_BYTES, backlog=1024)
+    print(f"✅ 문제 {len(catalog.questions)}개, 범위 {len(catalog.scopes)}개 로드")
+    print(f"🌐 http://{host}:{port}/api/deck?difficulty=beginner&size=10")
+    async with listener:
+        await listener.serve_forever()
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="국기 퀴즈 HTTP 서버")
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    args = parser.parse_args()
+
+    print("🚀 국기 퀴즈 서버 시작")
+    print("=" * 60)
+
+    if not QUIZ_CSV.exists():
+        print(f"❌ 퀴즈 CSV를 찾을 수 없습니다: {QUIZ_CSV}")
+        return
+
+    try:
+        # uvloop가 있으면 사용 (선택 사항)
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
+    try:
+        asyncio.run(run_server(args.host, args.port))
+    except KeyboardInterrupt:
+        print("\n👋 서버를 종료합니다.")
+
+if __name__ == "__main__":
+    main()
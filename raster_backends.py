@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+"""
+SVG 래스터화 백엔드 레지스트리
+- ImageMagick, cairosvg, rsvg-convert, resvg, Inkscape 중 설치된 백엔드 자동 탐지
+- 탐지 결과(버전, 실행 파일 경로)는 .raster_backends.json에 캐시해 매번 프로세스를 띄우지 않음
+- 실제 국기 샘플로 마이크로 벤치마크를 돌려, 기준 출력과 허용 오차 안에서 일치하는 가장 빠른 백엔드 선택
+- 배치 모드: 여러 SVG를 프로세스 1개에 넘겨 시작 비용을 분산 (ImageMagick mogrify, Inkscape --shell)
+"""
+import importlib.util
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+CACHE_FILE = Path(".raster_backends.json")
+SAMPLE_SVG_DIR = Path("canva_upload_ready/flag_images/svg")
+SAMPLE_SIZE = 8
+BENCHMARK_SIZE = 512
+BATCH_SIZE = 64             # 배치 1회에 넘길 최대 파일 수 (명령줄 길이와 실패 영향 범위 제한)
+TOLERANCE = 0.02            # 기준 대비 평균 픽셀 차이 허용치 (0~1)
+COMPARE_SIZE = (64, 64)
+POLL_INTERVAL = 0.1         # 배치 진행(새 출력 파일) 확인 간격 (초)
+
+class BatchInterrupted(RuntimeError):
+    """앞 파일의 시간 초과로 배치가 중단되어 변환을 시도하지 못한 파일 (같은 백엔드로 다시 시도해도 됨)"""
+
+class RasterBackend:
+    """외부 명령으로 SVG → PNG를 변환하는 백엔드 기본 클래스"""
+
+    name = ''
+    executables = ()
+    version_args = ('--version',)
+
+    def find_executable(self):
+        """PATH에서 실행 파일 찾기"""
+        for executable in self.executables:
+            path = shutil.which(executable)
+            if path:
+                return path
+        return None
+
+    def probe(self):
+        """설치 여부와 버전 확인 (없으면 None)"""
+        path = self.find_executable()
+        if not path:
+            return None
+        try:
+            result = subprocess.run([path, *self.version_args], capture_output=True, text=True, timeout=30)
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        output = (result.stdout or result.stderr).strip().splitlines()
+        return {'path': path, 'version': output[0] if output else ''}
+
+    def fingerprint(self, info):
+        """캐시 유효성 확인용 값 (실행 파일 수정시각)"""
+        try:
+            return os.stat(info['path']).st_mtime_ns
+        except (OSError, KeyError, TypeError):
+            return None
+
+    def command(self, executable, svg_path, png_path, size):
+        raise NotImplementedError
+
+    def render(self, svg_path, png_path, size=512, timeout=None):
+        """SVG 1개 변환 (실패 시 예외)"""
+        info = probe_backend(self)
+        if not info:
+            raise RuntimeError(f"{self.name} 백엔드를 사용할 수 없습니다")
+        cmd = self.command(info['path'], str(svg_path), str(png_path), size)
+        subprocess.run(cmd, check=True, capture_output=True, timeout=timeout)
+
+    def render_batch(self, jobs, size=512, timeout=None):
+        """여러 SVG 변환 - jobs와 같은 순서로 파일별 실패 사유(성공은 None) 반환"""
+        errors = []
+        for svg_path, png_path in jobs:
+            try:
+                self.render(svg_path, png_path, size, timeout)
+                errors.append(None)
+            except Exception as e:
+                errors.append(e)
+        return errors
+
+    def _run_batch(self, cmd, jobs, timeout=None, stdin=None):
+        """배치 명령 1회 실행 후 출력 PNG가 새로 생긴 파일만 성공으로 판정
+
+        timeout은 파일당 시간: 새 출력 파일이 나올 때마다 마감을 다시 잡고, timeout 동안 진행이 없으면 프로세스 종료.
+        배치 도구는 파일을 순서대로 처리하므로 마지막 출력 다음 파일이 시간 초과(TimeoutExpired),
+        그 뒤 파일들은 시도조차 못 한 것(BatchInterrupted)으로 구분한다.
+        """
+        outputs = [Path(png_path) for _, png_path in jobs]
+        for png_path in outputs:
+            # 이전 출력이 남아 있으면 성공으로 잘못 셀 수 있으므로 먼저 제거
+            png_path.unlink(missing_ok=True)
+
+        batch_error = None
+        timed_out = False
+        try:
+            process = subprocess.Popen(cmd, stdin=subprocess.DEVNULL if stdin is None else subprocess.PIPE,
+                                       stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        except OSError as e:
+            return [e] * len(jobs)
+
+        done = 0
+        deadline = time.monotonic() + timeout if timeout else None
+        while True:
+            try:
+                _, stderr = process.communicate(stdin, timeout=POLL_INTERVAL if timeout else None)
+                break
+            except subprocess.TimeoutExpired:
+                # 입력은 첫 호출에서 이미 전달됨
+                stdin = None
+            finished = sum(1 for png_path in outputs if png_path.exists())
+            if finished > done:
+                done = finished
+                deadline = time.monotonic() + timeout
+            elif time.monotonic() > deadline:
+                process.kill()
+                _, stderr = process.communicate()
+                timed_out = True
+                break
+
+        if not timed_out and process.returncode != 0:
+            lines = stderr.strip().splitlines()
+            batch_error = RuntimeError(lines[-1] if lines else f"종료 코드 {process.returncode}")
+
+        produced = [png_path.exists() for png_path in outputs]
+        last = max((position for position, exists in enumerate(produced) if exists), default=-1)
+        errors = []
+        for position, exists in enumerate(produced):
+            if exists:
+                errors.append(None)
+            elif timed_out and position == last + 1:
+                errors.append(subprocess.TimeoutExpired(cmd, timeout))
+            elif timed_out and position > last:
+                errors.append(BatchInterrupted("앞 파일의 시간 초과로 배치 중단"))
+            else:
+                errors.append(batch_error or RuntimeError("출력 파일 없음"))
+        return errors
+
+class ImageMagickBackend(RasterBackend):
+    name = 'imagemagick'
+    executables = ('magick', 'convert')
+    version_args = ('-version',)
+
+    def command(self, executable, svg_path, png_path, size):
+        return [executable, '-background', 'transparent', '-size', f'{size}x{size}', svg_path, png_path]
+
+    def mogrify_command(self, executable):
+        """ImageMagick 7은 'magick mogrify', 6은 별도 mogrify 실행 파일"""
+        if Path(executable).name == 'magick':
+            return [executable, 'mogrify']
+        mogrify = shutil.which('mogrify')
+        return [mogrify] if mogrify else None
+
+    def render_batch(self, jobs, size=512, timeout=None):
+        """mogrify 1회로 같은 출력 폴더의 SVG들을 한꺼번에 변환"""
+        info = probe_backend(self)
+        mogrify = self.mogrify_command(info['path']) if info else None
+        jobs = list(jobs)
+        errors = [None] * len(jobs)
+
+        # mogrify는 '<원본 이름>.png'로만 저장하므로 그 규칙을 따르는 작업만 묶음
+        groups = {}
+        singles = []
+        for position, (svg_path, png_path) in enumerate(jobs):
+            svg_path, png_path = Path(svg_path), Path(png_path)
+            if mogrify and png_path.name == svg_path.stem + '.png':
+                groups.setdefault(png_path.parent, []).append(position)
+            else:
+                singles.append(position)
+
+        for out_dir, positions in groups.items():
+            group = [jobs[position] for position in positions]
+            cmd = [*mogrify, '-path', str(out_dir), '-format', 'png',
+                   '-background', 'transparent', '-size', f'{size}x{size}',
+                   *(str(svg_path) for svg_path, _ in group)]
+            for position, error in zip(positions, self._run_batch(cmd, group, timeout)):
+                errors[position] = error
+
+        if singles:
+            single_errors = super().render_batch([jobs[position] for position in singles], size, timeout)
+            for position, error in zip(singles, single_errors):
+                errors[position] = error
+        return errors
+
+class RsvgBackend(RasterBackend):
+    name = 'rsvg'
+    executables = ('rsvg-convert',)
+
+    def command(self, executable, svg_path, png_path, size):
+        return [executable, '-w', str(size), '-h', str(size), '-a', '-b', 'none', '-o', png_path, svg_path]
+
+class ResvgBackend(RasterBackend):
+    name = 'resvg'
+    executables = ('resvg',)
+
+    def command(self, executable, svg_path, png_path, size):
+        return [executable, '-w', str(size), svg_path, png_path]
+
+class InkscapeBackend(RasterBackend):
+    name = 'inkscape'
+    executables = ('inkscape',)
+
+    def command(self, executable, svg_path, png_path, size):
+        return [executable, svg_path, '--export-type=png',
+                f'--export-filename={png_path}', f'--export-width={size}']
+
+    def render_batch(self, jobs, size=512, timeout=None):
+        """inkscape --shell 1개에 파일별 액션을 한 줄씩 전달"""
+        info = probe_backend(self)
+        if not info:
+            return super().render_batch(jobs, size, timeout)
+        jobs = list(jobs)
+        script = "".join(
+            f"file-open:{Path(svg_path).resolve()}; export-type:png; "
+            f"export-filename:{Path(png_path).resolve()}; export-width:{size}; export-do; file-close\n"
+            for svg_path, png_path in jobs
+        )
+        return self._run_batch([info['path'], '--shell'], jobs, timeout, stdin=script)
+
+# 별도 프로세스에서 실행할 cairosvg 배치 변환 (표준 입력 한 줄 = 파일 1개, 실패는 stderr에 남기고 계속)
+CAIROSVG_BATCH_SCRIPT = """\
+import sys
+import cairosvg
+size = int(sys.argv[1])
+for line in sys.stdin:
+    svg_path, _, png_path = line.rstrip('\\n').partition('\\t')
+    try:
+        with open(svg_path, 'rb') as svg_file:
+            cairosvg.svg2png(file_obj=svg_file, write_to=png_path, output_width=size)
+    except Exception as e:
+        print(f"{svg_path}: {e}", file=sys.stderr)
+"""
+
+class CairoSvgBackend(RasterBackend):
+    """파이썬 cairosvg 모듈 (별도 프로세스 없이 변환)"""
+
+    name = 'cairosvg'
+
+    def find_executable(self):
+        spec = importlib.util.find_spec('cairosvg')
+        return spec.origin if spec else None
+
+    def probe(self):
+        path = self.find_executable()
+        if not path:
+            return None
+        try:
+            import cairosvg
+        except (ImportError, OSError):
+            # libcairo가 없으면 import 단계에서 OSError
+            return None
+        return {'path': path, 'version': getattr(cairosvg, '__version__', '')}
+
+    def render(self, svg_path, png_path, size=512, timeout=None):
+        """타임아웃이 없으면 프로세스 안에서 바로 변환, 있으면 중단할 수 있도록 별도 프로세스에서 변환"""
+        if timeout is not None:
+            error = self.render_batch([(svg_path, png_path)], size, timeout)[0]
+            if error is not None:
+                raise error
+            return
+        import cairosvg
+        with open(svg_path, 'rb') as svg_file:
+            cairosvg.svg2png(file_obj=svg_file, write_to=str(png_path), output_width=size)
+
+    def render_batch(self, jobs, size=512, timeout=None):
+        """타임아웃이 있으면 파이썬 프로세스 1개에 파일별로 'SVG 경로, PNG 경로' 한 줄씩 전달 (시간 초과 시 프로세스 종료)"""
+        if timeout is None:
+            return super().render_batch(jobs, size, timeout)
+        jobs = list(jobs)
+        lines = "".join(f"{Path(svg_path).resolve()}\t{Path(png_path).resolve()}\n" for svg_path, png_path in jobs)
+        return self._run_batch([sys.executable, '-c', CAIROSVG_BATCH_SCRIPT, str(size)], jobs, timeout, stdin=lines)
+
+# 등록 순서 = 벤치마크 결과가 없을 때의 우선순위 (기존 기본값인 ImageMagick 먼저)
+BACKENDS = {backend.name: backend for backend in [
+    ImageMagickBackend(), CairoSvgBackend(), RsvgBackend(), ResvgBackend(), InkscapeBackend()
+]}
+
+# 출력 비교 기준으로 쓸 백엔드 우선순위 (SVG 표준 준수도가 높은 순)
+REFERENCE_ORDER = ['resvg', 'rsvg', 'cairosvg', 'inkscape', 'imagemagick']
+
+_cache = None
+
+def _load_cache():
+    """탐지/벤치마크 캐시 로드"""
+    global _cache
+    if _cache is None:
+        try:
+            with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+                _cache = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            _cache = {}
+        _cache.setdefault('probes', {})
+    return _cache
+
+def _save_cache():
+    """캐시 저장 (임시 파일에 쓴 뒤 원자적으로 교체)"""
+    fd, tmp_path = tempfile.mkstemp(dir=CACHE_FILE.parent, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(_load_cache(), f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, CACHE_FILE)
+
+def probe_backend(backend, refresh=False):
+    """백엔드 탐지 (실행 파일이 그대로면 디스크 캐시 재사용)"""
+    probes = _load_cache()['probes']
+    cached = probes.get(backend.name)
+    if cached and not refresh:
+        if not cached.get('available'):
+            # 없던 백엔드는 새로 설치됐는지만 가볍게 확인
+            if not backend.find_executable():
+                return None
+        elif backend.fingerprint(cached) == cached.get('fingerprint'):
+            return cached
+
+    info = backend.probe()
+    if info:
+        info = {'available': True, **info, 'fingerprint': None}
+        info['fingerprint'] = backend.fingerprint(info)
+    probes[backend.name] = info or {'available': False}
+    probes[backend.name]['checked'] = datetime.now().isoformat()
+    _save_cache()
+    return info
+
+def available_backends(refresh=False):
+    """설치된 백엔드 목록 (등록 순서)"""
+    return [backend for backend in BACKENDS.values() if probe_backend(backend, refresh)]
+
+def sample_svgs(count=SAMPLE_SIZE, seed=42):
+    """벤치마크용 실제 국기 SVG 샘플"""
+    svg_files = sorted(SAMPLE_SVG_DIR.rglob("*.svg")) if SAMPLE_SVG_DIR.exists() else []
+    if len(svg_files) <= count:
+        return svg_files
+    return random.Random(seed).sample(svg_files, count)
+
+def image_difference(png_a, png_b):
+    """두 PNG의 평균 픽셀 차이 (0~1). 비율이 다르면 1.0, Pillow가 없으면 None"""
+    try:
+        from PIL import Image, ImageChops, ImageStat
+    except ImportError:
+        return None
+
+    with Image.open(png_a) as a, Image.open(png_b) as b:
+        if abs(a.width / a.height - b.width / b.height) > 0.02:
+            return 1.0
+        a = a.convert('RGBA').resize(COMPARE_SIZE)
+        b = b.convert('RGBA').resize(COMPARE_SIZE)
+        diff = ImageStat.Stat(ImageChops.difference(a, b))
+        return sum(diff.mean) / len(diff.mean) / 255
+
+def benchmark_backends(samples=None, size=BENCHMARK_SIZE, tolerance=TOLERANCE):
+    """샘플 국기로 백엔드별 속도와 출력 일치 여부 측정 후 가장 빠른 백엔드 선택"""
+    samples = samples if samples is not None else sample_svgs()
+    backends = available_backends()
+    if not backends:
+        return None, {}
+    if not samples:
+        return backends[0], {}
+
+    reference = next((BACKENDS[name] for name in REFERENCE_ORDER if BACKENDS[name] in backends), backends[0])
+    results = {}
+
+    with tempfile.TemporaryDirectory(prefix="raster_bench_") as tmp:
+        tmp = Path(tmp)
+        for backend in backends:
+            out_dir = tmp / backend.name
+            out_dir.mkdir()
+            start = time.perf_counter()
+            failures = 0
+            for svg in samples:
+                try:
+                    backend.render(svg, out_dir / f"{svg.stem}.png", size)
+                except Exception:
+                    failures += 1
+            elapsed = time.perf_counter() - start
+            results[backend.name] = {'seconds': round(elapsed, 4), 'failures': failures,
+                                     'per_file_ms': round(elapsed / len(samples) * 1000, 2)}
+
+        # 기준 백엔드 출력과 비교
+        for backend in backends:
+            differences = []
+            for svg in samples:
+                out = tmp / backend.name / f"{svg.stem}.png"
+                ref = tmp / reference.name / f"{svg.stem}.png"
+                if not out.exists() or not ref.exists():
+                    differences.append(1.0)
+                    continue
+                differences.append(image_difference(out, ref))
+
+            if any(d is None for d in differences):
+                max_diff = None
+                matches = results[backend.name]['failures'] == 0
+            else:
+                max_diff = max(differences)
+                matches = results[backend.name]['failures'] == 0 and max_diff <= tolerance
+            results[backend.name].update({'max_difference': max_diff, 'matches_reference': matches})
+
+    candidates = [backend for backend in backends if results[backend.name]['matches_reference']]
+    selected = min(candidates or [reference], key=lambda backend: results[backend.name]['seconds'])
+
+    cache = _load_cache()
+    cache['selection'] = {
+        'backend': selected.name,
+        'reference': reference.name,
+        'tolerance': tolerance,
+        'samples': [str(svg) for svg in samples],
+        'results': results,
+        'measured': datetime.now().isoformat(),
+    }
+    _save_cache()
+    return selected, results
+
+def get_backend(auto_benchmark=True):
+    """사용할 백엔드: 캐시된 선택 → (여러 개면) 벤치마크 → 첫 번째 사용 가능 백엔드"""
+    selection = _load_cache().get('selection')
+    if selection:
+        backend = BACKENDS.get(selection['backend'])
+        if backend and probe_backend(backend):
+            return backend
+
+    backends = available_backends()
+    if not backends:
+        return None
+    if len(backends) > 1 and auto_benchmark:
+        selected, _ = benchmark_backends()
+        return selected
+    return backends[0]
+
+def main():
+    """메인 실행 함수: 백엔드 재탐지 + 벤치마크"""
+    print("🧪 SVG 래스터화 백엔드 벤치마크")
+    print("=" * 60)
+
+    for backend in BACKENDS.values():
+        info = probe_backend(backend, refresh=True)
+        if info:
+            print(f"✅ {backend.name:<12} {info.get('version', '')}")
+        else:
+            print(f"⚪ {backend.name:<12} 설치되지 않음")
+
+    selected, results = benchmark_backends()
+    if not selected:
+        print("\n❌ 사용 가능한 백엔드가 없습니다.")
+        return
+
+    print(f"\n📊 샘플 {len(sample_svgs())}개, {BENCHMARK_SIZE}px 기준:")
+    for name, result in results.items():
+        diff = result['max_difference']
+        diff_text = f"{diff:.4f}" if diff is not None else "비교 생략 (Pillow 없음)"
+        mark = "✅" if result['matches_reference'] else "❌"
+        print(f"  {mark} {name:<12} {result['per_file_ms']:>8.1f}ms/파일  차이 {diff_text}")
+
+    print(f"\n🏆 선택된 백엔드: {selected.name}")
+    print(f"💾 캐시 위치: {CACHE_FILE}")
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,8 @@ import shutil
 from pathlib import Path
 import re
 
+import instrumentation
+
 def clean_filename(name):
     """파일명을 영어로 정리하고 파일시스템에 안전하게 만들기"""
     # 특수문자와 괄호 내용 제거
@@ -34,6 +36,7 @@ def clean_filename(name):
 
     return name
 
+@instrumentation.timed('rename')
 def rename_flag_files():
     """국기 파일들의 이름을 변경"""
 
@@ -98,7 +101,7 @@ def rename_flag_files():
         try:
             # 파일 복사
             shutil.copy2(old_filepath, new_filepath)
-            print(f"✅ {old_filename:<8} → {new_filename}")
+            instrumentation.progress(f"✅ {old_filename:<8} → {new_filename}")
             success_count += 1
 
         except Exception as e:
@@ -124,6 +127,7 @@ def rename_flag_files():
     return success_count > 0
 
 if __name__ == "__main__":
+    instrumentation.set_quiet_from_argv()
     print("🏴 국기 파일명 변경 스크립트 (영어 버전)")
     print("=" * 60)
 
@@ -5,12 +5,16 @@ SVG 파일명을 번호_국가명 형식으로 변경하는 스크립트
     intermediate01.svg → inter01_afghanistan.svg
     high01.svg → high01_andorra.svg
 """
-import os
 import shutil
 import csv
 import re
 from pathlib import Path
 
+import asset_index
+import asset_store
+import csv_stream
+import instrumentation
+
 def clean_country_name_for_filename(country_name):
     """국가명을 파일명에 적합하게 정리"""
     # 특수문자 제거 및 공백을 언더스코어로 변경
@@ -43,6 +47,7 @@ def get_csv_mapping():
 
     return mapping
 
+@instrumentation.timed('country_name_rename')
 def rename_svg_files():
     """SVG 파일들을 새로운 형식으로 이름 변경"""
     print("🔄 SVG 파일명 변경 시작...")
@@ -70,7 +75,7 @@ def rename_svg_files():
             continue
 
         # 현재 폴더의 모든 SVG 파일 가져오기
-        svg_files = list(difficulty_path.glob("*.svg"))
+        svg_files = asset_index.get_index().files(difficulty_path, '.svg')
 
         # 임시 폴더 생성
         temp_path = difficulty_path.parent / f"{difficulty}_temp"
@@ -110,7 +115,7 @@ def rename_svg_files():
                 shutil.copy2(svg_file, new_filepath)
                 filename_changes[svg_file] = new_filename
 
-                print(f"  ✅ {current_filename}.svg → {new_filename}.svg")
+                instrumentation.progress(f"  ✅ {current_filename}.svg → {new_filename}.svg")
             else:
                 print(f"  ⚠️  매핑을 찾을 수 없음: {current_filename}")
 
@@ -126,53 +131,40 @@ def rename_svg_files():
 
     return filename_changes
 
+@instrumentation.timed('country_name_csv')
 def update_csv_with_new_filenames(filename_changes):
     """CSV 파일의 flag_image_path 업데이트"""
     print("\n📊 CSV 파일 업데이트 중...")
     print("=" * 60)
 
     csv_file = Path("flag_quiz_data.csv")
-    updated_csv_file = Path("flag_quiz_data_updated.csv")
-
-    with open(csv_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        headers = reader.fieldnames
-        rows = list(reader)
-
-    updated_rows = []
-
-    for row in rows:
-        difficulty = row['difficulty']
-        difficulty_number = row['difficulty_number']
-
-        # filename_changes에서 새 파일명 찾기
-        new_filename = None
-        for old_path, new_name in filename_changes.items():
-            if old_path.stem == difficulty_number:
-                new_filename = new_name
-                break
-
-        if new_filename:
-            # flag_image_path 업데이트
-            row['flag_image_path'] = f"{difficulty}/{new_filename}.svg"
-            print(f"✅ {row['quiz_id']:3s}: {difficulty_number} → {new_filename}")
-        else:
-            print(f"⚠️  파일명 변경 정보를 찾을 수 없음: {difficulty_number}")
-
-        updated_rows.append(row)
-
-    # 새 CSV 파일 저장
-    with open(updated_csv_file, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=headers)
-        writer.writeheader()
-        writer.writerows(updated_rows)
-
-    # 백업 후 교체
     backup_file = Path("flag_quiz_data_before_rename.csv")
-    if backup_file.exists():
-        backup_file.unlink()
-    shutil.move(csv_file, backup_file)
-    shutil.move(updated_csv_file, csv_file)
+
+    # 옛 파일명(번호) → 새 파일명 (행마다 변경 목록 전체를 훑지 않도록 미리 구성, 먼저 나온 것 우선)
+    new_names = {}
+    for old_path, new_name in filename_changes.items():
+        new_names.setdefault(old_path.stem, new_name)
+
+    def plan(headers):
+        """flag_image_path를 새 파일명으로 바꾸는 행 변환 함수 반환"""
+        quiz_id_index = headers.index('quiz_id')
+        difficulty_index = headers.index('difficulty')
+        number_index = headers.index('difficulty_number')
+        path_index = headers.index('flag_image_path')
+
+        def transform(row):
+            difficulty_number = row[number_index]
+            new_filename = new_names.get(difficulty_number)
+            if not new_filename:
+                print(f"⚠️  파일명 변경 정보를 찾을 수 없음: {difficulty_number}")
+                return row
+            instrumentation.progress(f"✅ {row[quiz_id_index]:3s}: {difficulty_number} → {new_filename}")
+            return row[:path_index] + (f"{row[difficulty_index]}/{new_filename}.svg",) + row[path_index + 1:]
+
+        return headers, transform
+
+    # 한 행씩 읽어서 바로 쓴 뒤 백업 후 교체
+    csv_stream.rewrite_csv(csv_file, plan, backup_file)
 
     print(f"\n💾 CSV 업데이트 완료!")
     print(f"  - 백업: {backup_file}")
@@ -186,7 +178,7 @@ def update_canva_ready_csv():
     dest_csv = Path("canva_upload_ready/csv_data/flag_quiz_data.csv")
 
     if source_csv.exists() and dest_csv.parent.exists():
-        shutil.copy2(source_csv, dest_csv)
+        asset_store.publish(source_csv, dest_csv)
         print("✅ Canva 업로드 폴더 CSV 동기화 완료")
 
 def main():
@@ -220,4 +212,5 @@ def main():
     print("  high01_andorra.svg")
 
 if __name__ == "__main__":
+    instrumentation.set_quiet_from_argv()
     main()
\ No newline at end of file
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+퀴즈 카드 이미지를 여러 레이아웃으로 일괄 렌더링하는 스크립트
+- 퀴즈 행 하나당 레이아웃별 완성 카드 이미지 생성 (한 번의 순회로 모든 레이아웃 처리)
+- 배경 레이어, 글리프 아틀라스, 박스 크기에 맞춘 국기 레이어를 카드 간에 캐시 (디코딩한 국기는 레이아웃 간에 공유)
+- 카드마다 바뀌는 국기와 선택지 텍스트만 합성, 이미지 인코딩·저장은 스레드 풀에서 병렬 처리
+"""
+import importlib.util
+import os
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+import instrumentation
+
+from render_quiz_videos import (
+    BACKGROUND_COLOR, OPTION_COLOR, OPTION_LETTERS, TEXT_COLOR, CSV_FILE,
+    compute_layout, find_flag_png, fit_flag, load_font, load_quiz_rows
+)
+
+OUTPUT_DIR = Path("quiz_cards")
+
+# 사용 가이드(create_usage_guide)의 세로형/가로형 + 정사각형
+LAYOUTS = {
+    'vertical': (1080, 1920),
+    'horizontal': (1920, 1080),
+    'square': (1080, 1080),
+}
+
+TEXT_CACHE_SIZE = 2048
+PENDING_PER_WORKER = 4      # 저장 대기 카드 수 상한 (메모리 사용량 제한)
+
+class GlyphAtlas:
+    """폰트 크기별 글리프 마스크 캐시
+
+    글자 하나는 한 번만 래스터화하고, 자주 나오는 문자열(국가명 선택지)은
+    완성된 마스크를 LRU로 보관해 다음 카드에서 그대로 붙여 넣는다.
+    """
+
+    def __init__(self, font_size, text_cache_size=TEXT_CACHE_SIZE):
+        self.font = load_font(font_size)
+        self.ascent, self.descent = self.font.getmetrics()
+        self.glyphs = {}
+        self.text_masks = OrderedDict()
+        self.text_cache_size = text_cache_size
+
+    def glyph(self, char):
+        """글자 하나의 (마스크, x 오프셋, y 오프셋, 전진 폭)"""
+        cached = self.glyphs.get(char)
+        if cached is None:
+            from PIL import Image, ImageDraw
+
+            x0, y0, x1, y1 = self.font.getbbox(char)
+            mask = None
+            if x1 > x0 and y1 > y0:
+                mask = Image.new('L', (x1 - x0, y1 - y0), 0)
+                ImageDraw.Draw(mask).text((-x0, -y0), char, font=self.font, fill=255)
+            cached = (mask, x0, y0, self.font.getlength(char))
+            self.glyphs[char] = cached
+        return cached
+
+    def text_mask(self, text):
+        """문자열 전체 마스크 (글리프를 이어 붙여 생성, LRU 캐시)"""
+        mask = self.text_masks.get(text)
+        if mask is not None:
+            self.text_masks.move_to_end(text)
+            return mask
+
+        from PIL import Image
+
+        glyphs = [self.glyph(char) for char in text]
+        width = max(1, int(sum(advance for _, _, _, advance in glyphs)) + 1)
+        mask = Image.new('L', (width, self.ascent + self.descent), 0)
+        x = 0.0
+        for glyph_mask, x0, y0, advance in glyphs:
+            if glyph_mask is not None:
+                mask.paste(glyph_mask, (int(x) + x0, y0))
+            x += advance
+
+        self.text_masks[text] = mask
+        if len(self.text_masks) > self.text_cache_size:
+            self.text_masks.popitem(last=False)
+        return mask
+
+class CardRenderer:
+    """레이아웃 하나에 대한 카드 렌더러 (배경 레이어 캐시 보유)"""
+
+    def __init__(self, name, size):
+        self.name = name
+        self.size = size
+        self.layout = compute_layout(*size)
+        self.option_atlas = GlyphAtlas(self.layout['option_font'])
+        self.question_atlas = GlyphAtlas(self.layout['question_font'])
+        self.backgrounds = {}
+
+    def background(self, question_text):
+        """배경 + 질문 + 빈 선택지 박스까지 그린 레이어 (질문 문구별로 한 번만 생성)"""
+        layer = self.backgrounds.get(question_text)
+        if layer is None:
+            from PIL import Image, ImageDraw
+
+            layer = Image.new('RGB', self.size, BACKGROUND_COLOR)
+            draw = ImageDraw.Draw(layer)
+            for box in self.layout['option_boxes']:
+                draw.rounded_rectangle(box, radius=(box[3] - box[1]) // 4, fill=OPTION_COLOR)
+
+            mask = self.question_atlas.text_mask(question_text)
+            x = (self.size[0] - mask.width) // 2
+            y = self.layout['question_y'] - mask.height // 2
+            layer.paste(TEXT_COLOR, (x, y, x + mask.width, y + mask.height), mask)
+            self.backgrounds[question_text] = layer
+        return layer
+
+    def render(self, row):
+        """카드 한 장 합성: 캐시된 배경 위에 국기와 선택지 텍스트만 붙임"""
+        card = self.background(row['question_text']).copy()
+
+        flag_path = find_flag_png(row)
+        if flag_path:
+            flag, position = flag_layer(flag_key(flag_path), self.layout['flag_box'])
+            card.paste(flag, position, flag)
+
+        for letter, box in zip(OPTION_LETTERS, self.layout['option_boxes']):
+            mask = self.option_atlas.text_mask(f"{letter}. {row['option_' + letter.lower()]}")
+            x = box[0] + (box[3] - box[1]) // 3
+            y = (box[1] + box[3] - mask.height) // 2
+            card.paste(TEXT_COLOR, (x, y, x + mask.width, y + mask.height), mask)
+
+        return card
+
+def flag_key(flag_path):
+    """국기 캐시 키 (경로, 수정시각, 크기) - 같은 경로의 PNG가 다시 만들어지면 캐시를 새로 채움"""
+    st = os.stat(flag_path)
+    return str(flag_path), st.st_mtime_ns, st.st_size
+
+@lru_cache(maxsize=16)
+def decoded_flag(key):
+    """국기 PNG 디코딩 결과 (같은 카드의 여러 레이아웃이 공유)"""
+    from PIL import Image
+
+    with Image.open(key[0]) as flag_image:
+        return flag_image.convert('RGBA')
+
+@lru_cache(maxsize=1024)
+def flag_layer(key, box):
+    """국기 이미지를 박스 크기에 맞춘 RGBA 레이어와 위치 (파일 버전·박스별 캐시)"""
+    return fit_flag(decoded_flag(key), box, reducing_gap=3.0)
+
+def save_card(card, output_path, image_format, save_options):
+    """카드 1장 인코딩·저장 (Pillow 인코더는 GIL을 풀어 스레드로 병렬 실행됨)"""
+    card.save(output_path, format=image_format.upper(), **save_options)
+
+@instrumentation.timed('render_cards')
+def render_all_cards(layouts=LAYOUTS, image_format='png', limit=None, slugs=None, workers=None):
+    """모든 퀴즈 행을 레이아웃별 카드 이미지로 렌더링 (slugs를 주면 해당 국가 행만)"""
+    print("🃏 퀴즈 카드 일괄 렌더링 시작...")
+    print("=" * 60)
+
+    if importlib.util.find_spec('PIL') is None:
+        print("❌ Pillow가 설치되어 있지 않습니다: pip install pillow")
+        return False
+
+    if not CSV_FILE.exists():
+        print(f"❌ CSV 파일을 찾을 수 없습니다: {CSV_FILE}")
+        return False
+
+    rows = load_quiz_rows()
+    if slugs is not None:
+        rows = [row for row in rows if row['country_filename'] in slugs]
+    if limit:
+        rows = rows[:limit]
+
+    renderers = [CardRenderer(name, size) for name, size in layouts.items()]
+    for renderer in renderers:
+        (OUTPUT_DIR / renderer.name).mkdir(parents=True, exist_ok=True)
+        print(f"📐 {renderer.name}: {renderer.size[0]}x{renderer.size[1]}")
+
+    # PNG는 압축 레벨을 낮춰 인코딩 시간을 줄임 (카드는 재압축해도 용량 차이 작음)
+    save_options = {'compress_level': 1} if image_format == 'png' else {'quality': 90}
+    extension = 'jpg' if image_format == 'jpeg' else image_format
+
+    card_count = 0
+    start = time.perf_counter()
+
+    # 합성은 캐시를 공유하므로 메인 스레드에서, 시간이 가장 많이 드는 인코딩은 풀에서 처리
+    workers = workers or os.cpu_count() or 1
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for row in rows:
+            for renderer in renderers:
+                card = renderer.render(row)
+                output_path = OUTPUT_DIR / renderer.name / f"quiz_{int(row['quiz_id']):03d}_{row['country_filename']}.{extension}"
+                pending.append(executor.submit(save_card, card, output_path, image_format, save_options))
+                if len(pending) >= workers * PENDING_PER_WORKER:
+                    pending.popleft().result()
+                card_count += 1
+            instrumentation.progress(f"✅ #{int(row['quiz_id']):3d} {row['country_name']} ({len(renderers)}개 레이아웃)")
+        while pending:
+            pending.popleft().result()
+
+    elapsed = time.perf_counter() - start
+
+    print("\n" + "=" * 60)
+    print(f"📊 카드 렌더링 완료!")
+    print(f"🃏 총 카드 수: {card_count}장")
+    print(f"⏱️  소요 시간: {elapsed:.2f}초 ({card_count / elapsed if elapsed else 0:.0f}장/초)")
+    print(f"🧵 인코딩 스레드: {workers}개")
+    print(f"📁 카드 위치: {OUTPUT_DIR}")
+
+    return card_count > 0
+
+if __name__ == "__main__":
+    instrumentation.set_quiet_from_argv()
+    print("🃏 국기 퀴즈 카드 렌더러")
+    print("레이아웃: " + ", ".join(f"{name} {w}x{h}" for name, (w, h) in LAYOUTS.items()))
+    print("=" * 60)
+
+    if render_all_cards():
+        print("\n🎉 카드 렌더링이 완료되었습니다!")
+    else:
+        print("\n💥 카드 렌더링 중 오류가 발생했습니다.")
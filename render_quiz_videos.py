@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+국기 퀴즈 영상을 Canva 없이 로컬에서 렌더링하는 스크립트
+- flag_quiz_data.csv 각 행을 15초 퀴즈 영상으로 합성 (국기 + 질문 + A~D 선택지)
+- 내용이 바뀌지 않는 구간은 한 번만 그리고 같은 프레임을 재사용
+- 문제별로 프로세스 풀에서 병렬 렌더링, ffmpeg 파이프로 인코딩
+"""
+import importlib.util
+import os
+import subprocess
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import catalog_cache
+import instrumentation
+
+CSV_FILE = Path("canva_upload_ready/csv_data/flag_quiz_data.csv")
+PNG_DIR = Path("canva_upload_ready/flag_images/png")
+OUTPUT_DIR = Path("quiz_videos")
+
+VIDEO_SIZE = (1080, 1920)   # 세로형 (Shorts/Reels)
+FPS = 30
+VIDEO_DURATION = 15         # 초
+REVEAL_AT = 10              # 정답 공개 시점 (초)
+
+BACKGROUND_COLOR = (24, 28, 48)
+TEXT_COLOR = (255, 255, 255)
+OPTION_COLOR = (52, 60, 96)
+CORRECT_COLOR = (46, 160, 90)
+
+FONT_CANDIDATES = [
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+    "/usr/share/fonts/dejavu/DejaVuSans-Bold.ttf",
+    "/Library/Fonts/Arial Unicode.ttf",
+    "/System/Library/Fonts/Supplemental/Arial Bold.ttf",
+    "C:/Windows/Fonts/arialbd.ttf",
+]
+
+OPTION_LETTERS = ['A', 'B', 'C', 'D']
+
+def check_dependencies():
+    """Pillow와 ffmpeg 설치 여부 확인"""
+    if importlib.util.find_spec('PIL') is None:
+        print("❌ Pillow가 설치되어 있지 않습니다: pip install pillow")
+        return False
+
+    try:
+        subprocess.run(['ffmpeg', '-version'], capture_output=True, check=True)
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        print("❌ ffmpeg가 설치되어 있지 않습니다.")
+        print("설치 방법:")
+        print("  macOS: brew install ffmpeg")
+        print("  Ubuntu: sudo apt-get install ffmpeg")
+        return False
+
+    print("✅ Pillow, ffmpeg 확인 완료")
+    return True
+
+def load_quiz_rows(csv_file=CSV_FILE):
+    """퀴즈 CSV 행 목록 로드 (바이너리 사이드카 캐시 사용)"""
+    return catalog_cache.load_rows(csv_file)
+
+def load_font(size):
+    """유니코드 국가명(Å, ô, ü 등)을 표시할 수 있는 폰트 로드"""
+    from PIL import ImageFont
+
+    for candidate in FONT_CANDIDATES:
+        if os.path.exists(candidate):
+            return ImageFont.truetype(candidate, size)
+    return ImageFont.load_default()
+
+def find_flag_png(row, png_dir=PNG_DIR):
+    """퀴즈 행에 해당하는 국기 PNG 경로 찾기"""
+    candidates = [
+        png_dir / f"{row['country_filename']}.png",
+        png_dir / Path(row.get('flag_image_path', '')).with_suffix('.png').name,
+    ]
+    for candidate in candidates:
+        if candidate.is_file():
+            return candidate
+    return None
+
+def compute_layout(width, height):
+    """화면 크기에 따른 요소 배치 계산 (세로형/가로형 공통)"""
+    margin = width // 18
+
+    if height >= width:
+        # 세로형: 국기 → 질문 → 선택지 4개가 위에서 아래로
+        flag_box = (margin, height // 8, width - margin, height // 8 + (width - 2 * margin) * 2 // 3)
+        question_y = flag_box[3] + height // 20
+        options_top = question_y + height // 10
+        option_h = height // 13
+        gap = option_h // 4
+        option_boxes = [
+            (margin, options_top + i * (option_h + gap), width - margin, options_top + i * (option_h + gap) + option_h)
+            for i in range(4)
+        ]
+        countdown_pos = (width // 2, height // 16)
+    else:
+        # 가로형: 왼쪽 국기, 오른쪽 선택지 2x2
+        flag_box = (margin, height // 4, width // 2 - margin // 2, height // 4 + (width // 2 - margin * 3 // 2) * 2 // 3)
+        question_y = height // 10
+        right = width // 2 + margin // 2
+        col_w = (width - margin - right - margin // 2) // 2
+        option_h = height // 6
+        gap = margin // 2
+        options_top = height // 3
+        option_boxes = []
+        for i in range(4):
+            col, line = i % 2, i // 2
+            x0 = right + col * (col_w + gap)
+            y0 = options_top + line * (option_h + gap)
+            option_boxes.append((x0, y0, x0 + col_w, y0 + option_h))
+        countdown_pos = (width - margin * 2, height // 10)
+
+    return {
+        'flag_box': flag_box,
+        'question_y': question_y,
+        'option_boxes': option_boxes,
+        'countdown_pos': countdown_pos,
+        'question_font': max(24, min(width, height) // 18),
+        'option_font': max(20, min(width, height) // 22),
+        'countdown_font': max(32, min(width, height) // 9),
+    }
+
+def fit_flag(flag_image, box, reducing_gap=None):
+    """국기 이미지를 비율 유지하며 박스 안에 맞추고 붙일 위치 반환
+
+    reducing_gap을 주면 크게 줄일 때 정수 배 축소(reduce)를 먼저 해 리샘플링 비용을 줄임.
+    """
+    box_w, box_h = box[2] - box[0], box[3] - box[1]
+    scale = min(box_w / flag_image.width, box_h / flag_image.height)
+    size = (max(1, int(flag_image.width * scale)), max(1, int(flag_image.height * scale)))
+    resized = flag_image.resize(size, reducing_gap=reducing_gap)
+    position = (box[0] + (box_w - size[0]) // 2, box[1] + (box_h - size[1]) // 2)
+    return resized, position
+
+def draw_options(draw, layout, row, font, highlight=None):
+    """A~D 선택지 박스와 텍스트 그리기"""
+    for letter, box in zip(OPTION_LETTERS, layout['option_boxes']):
+        color = CORRECT_COLOR if letter == highlight else OPTION_COLOR
+        draw.rounded_rectangle(box, radius=(box[3] - box[1]) // 4, fill=color)
+        text = f"{letter}. {row['option_' + letter.lower()]}"
+        draw.text((box[0] + (box[3] - box[1]) // 3, (box[1] + box[3]) // 2), text,
+                  font=font, fill=TEXT_COLOR, anchor='lm')
+
+def render_static_layer(row, size=VIDEO_SIZE):
+    """문제 전체 구간에서 변하지 않는 레이어 (배경, 국기, 질문) 렌더링"""
+    from PIL import Image, ImageDraw
+
+    width, height = size
+    layout = compute_layout(width, height)
+    canvas = Image.new('RGB', size, BACKGROUND_COLOR)
+
+    flag_path = find_flag_png(row)
+    if flag_path:
+        with Image.open(flag_path) as flag_image:
+            flag, position = fit_flag(flag_image.convert('RGBA'), layout['flag_box'])
+        canvas.paste(flag, position, flag)
+
+    draw = ImageDraw.Draw(canvas)
+    draw.text((width // 2, layout['question_y']), row['question_text'],
+              font=load_font(layout['question_font']), fill=TEXT_COLOR, anchor='mm')
+    return canvas, layout
+
+def build_timeline(fps=FPS, duration=VIDEO_DURATION, reveal_at=REVEAL_AT):
+    """영상 구간 목록 생성: (구간 상태, 프레임 수)
+
+    카운트다운 숫자는 1초마다만 바뀌므로 초 단위 구간 하나당 프레임 1장만 그리면 된다.
+    """
+    timeline = [(('countdown', reveal_at - second), fps) for second in range(reveal_at)]
+    timeline.append((('reveal', None), (duration - reveal_at) * fps))
+    return timeline
+
+def render_segment_frames(row, size=VIDEO_SIZE):
+    """구간별 고유 프레임을 한 번씩만 렌더링하여 RGB 바이트로 반환"""
+    from PIL import ImageDraw
+
+    static_layer, layout = render_static_layer(row, size)
+    option_font = load_font(layout['option_font'])
+    countdown_font = load_font(layout['countdown_font'])
+
+    # 선택지까지 그린 질문 화면은 카운트다운 구간 전체가 공유
+    question_layer = static_layer.copy()
+    draw_options(ImageDraw.Draw(question_layer), layout, row, option_font)
+
+    frames = {}
+    for state, _ in build_timeline():
+        if state in frames:
+            continue
+        kind, value = state
+        if kind == 'countdown':
+            frame = question_layer.copy()
+            ImageDraw.Draw(frame).text(layout['countdown_pos'], str(value),
+                                       font=countdown_font, fill=TEXT_COLOR, anchor='mm')
+        else:
+            frame = static_layer.copy()
+            draw_options(ImageDraw.Draw(frame), layout, row, option_font, highlight=row['correct_option'])
+        frames[state] = frame.tobytes()
+    return frames
+
+def encode_video(frames, output_path, size=VIDEO_SIZE, fps=FPS):
+    """고유 프레임을 구간 길이만큼 반복해 ffmpeg에 파이프로 전달"""
+    width, height = size
+    cmd = [
+        'ffmpeg', '-y', '-loglevel', 'error',
+        '-f', 'rawvideo', '-pix_fmt', 'rgb24',
+        '-s', f'{width}x{height}', '-r', str(fps),
+        '-i', '-',
+        '-c:v', 'libx264', '-preset', 'veryfast', '-tune', 'stillimage',
+        '-pix_fmt', 'yuv420p',
+        str(output_path)
+    ]
+    process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        for state, frame_count in build_timeline(fps):
+            frame_bytes = frames[state]
+            for _ in range(frame_count):
+                process.stdin.write(frame_bytes)
+        process.stdin.close()
+    except BrokenPipeError:
+        pass
+    stderr = process.stderr.read().decode('utf-8', errors='replace')
+    process.wait()
+    if process.returncode != 0:
+        raise RuntimeError(stderr.strip() or f"ffmpeg 종료 코드 {process.returncode}")
+
+def render_quiz_video(row, output_dir=OUTPUT_DIR):
+    """퀴즈 한 문제를 영상으로 렌더링 (프로세스 풀 작업 단위)"""
+    output_path = Path(output_dir) / f"quiz_{int(row['quiz_id']):03d}_{row['country_filename']}.mp4"
+    try:
+        frames = render_segment_frames(row)
+        encode_video(frames, output_path)
+        return row['quiz_id'], output_path, None
+    except Exception as e:
+        return row['quiz_id'], output_path, str(e)
+
+@instrumentation.timed('render_videos')
+def render_all_videos(limit=None, workers=None):
+    """모든 퀴즈 행을 병렬로 영상 렌더링"""
+    print("🎬 퀴즈 영상 로컬 렌더링 시작...")
+    print("=" * 60)
+
+    if not check_dependencies():
+        return False
+
+    if not CSV_FILE.exists():
+        print(f"❌ CSV 파일을 찾을 수 없습니다: {CSV_FILE}")
+        return False
+
+    rows = load_quiz_rows()
+    if limit:
+        rows = rows[:limit]
+
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+
+    unique_frames = len({state for state, _ in build_timeline()})
+    total_frames = sum(count for _, count in build_timeline())
+    print(f"📈 렌더링할 영상: {len(rows)}개 (워커 {workers}개)")
+    print(f"🖼️  영상당 고유 프레임 {unique_frames}장 → 총 {total_frames}프레임으로 재사용")
+
+    success_count = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(render_quiz_video, row) for row in rows]
+        for future in as_completed(futures):
+            quiz_id, output_path, error = future.result()
+            if error is None:
+                success_count += 1
+                instrumentation.progress(f"✅ #{int(quiz_id):3d} {output_path.name}")
+            else:
+                print(f"❌ #{int(quiz_id):3d} {output_path.name} -> {error}")
+
+    print("\n" + "=" * 60)
+    print(f"📊 렌더링 완료!")
+    print(f"✅ 성공: {success_count}개")
+    print(f"❌ 실패: {len(rows) - success_count}개")
+    print(f"📁 영상 위치: {OUTPUT_DIR}")
+
+    return success_count > 0
+
+if __name__ == "__main__":
+    instrumentation.set_quiet_from_argv()
+    print("🎬 국기 퀴즈 영상 로컬 렌더러")
+    print(f"{VIDEO_SIZE[0]}x{VIDEO_SIZE[1]}, {VIDEO_DURATION}초, {REVEAL_AT}초 후 정답 공개")
+    print("=" * 60)
+
+    if render_all_videos():
+        print("\n🎉 영상 렌더링이 완료되었습니다!")
+    else:
+        print("\n💥 영상 렌더링 중 오류가 발생했습니다.")
@@ -3,11 +3,15 @@
 국기 파일을 난이도별로 ABC 순서로 정렬하여 순차 넘버링하는 스크립트
 beginner01, beginner02... intermediate01, intermediate02... high01, high02...
 """
-import os
 import shutil
-import csv
 from pathlib import Path
 
+import asset_index
+import asset_store
+import csv_stream
+import instrumentation
+
+@instrumentation.timed('sequential_rename')
 def rename_files_sequentially():
     """각 난이도별로 파일을 ABC 순서로 정렬하여 순차 넘버링"""
     print("🔢 국기 파일 순차 넘버링 시작...")
@@ -28,7 +32,7 @@ def rename_files_sequentially():
             continue
 
         # 현재 폴더의 모든 SVG 파일 가져오기
-        svg_files = list(difficulty_path.glob("*.svg"))
+        svg_files = asset_index.get_index().files(difficulty_path, '.svg')
 
         # ABC 순서로 정렬 (파일명 기준)
         svg_files.sort(key=lambda x: x.name.lower())
@@ -56,7 +60,7 @@ def rename_files_sequentially():
             # 매핑 정보 저장
             filename_mapping[old_filename] = new_filename
 
-            print(f"  ✅ {old_filename}.svg → {new_filename}.svg")
+            instrumentation.progress(f"  ✅ {old_filename}.svg → {new_filename}.svg")
 
         # 기존 폴더 내용 삭제 후 임시 폴더 내용 이동
         for file in difficulty_path.glob("*.svg"):
@@ -74,76 +78,59 @@ def rename_files_sequentially():
     for difficulty in difficulties:
         difficulty_path = base_path / difficulty
         if difficulty_path.exists():
-            file_count = len(list(difficulty_path.glob("*.svg")))
+            file_count = asset_index.get_index().count(difficulty_path, '.svg')
             print(f"  - {difficulty}: {file_count}개")
 
     return filename_mapping
 
+@instrumentation.timed('numbering_csv')
 def update_csv_with_numbering(filename_mapping):
     """CSV 파일에 새로운 넘버링 정보 추가"""
     print("\n📊 CSV 파일 업데이트 중...")
     print("=" * 60)
 
     csv_file = Path("flag_quiz_data.csv")
-    updated_csv_file = Path("flag_quiz_data_numbered.csv")
+    backup_file = Path("flag_quiz_data_backup.csv")
 
     if not csv_file.exists():
         print(f"❌ CSV 파일을 찾을 수 없습니다: {csv_file}")
         return False
 
-    # CSV 파일 읽기
-    with open(csv_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
-        headers = reader.fieldnames
-
-    # 새로운 컬럼 추가
-    new_headers = headers[:2] + ['difficulty_number'] + headers[2:]  # difficulty 다음에 추가
-
-    updated_rows = []
-
-    for row in rows:
-        # 기존 파일명에서 새 넘버링 찾기
-        old_filename = row['country_filename']
-        difficulty = row['difficulty']
-
-        # 매핑에서 새 파일명 찾기
-        if old_filename in filename_mapping:
-            new_number = filename_mapping[old_filename]
-        else:
-            # 매핑을 찾을 수 없는 경우 기본값 생성
-            # 해당 난이도의 다른 파일들을 확인하여 순서 추정
-            same_difficulty_files = [k for k, v in filename_mapping.items()
-                                   if v.startswith(difficulty)]
-            new_number = f"{difficulty}{len(same_difficulty_files)+1:02d}"
-
-        # 새 행 생성
-        new_row = {}
-        for header in new_headers:
-            if header == 'difficulty_number':
-                new_row[header] = new_number
-            elif header == 'flag_image_path':
-                # 이미지 경로도 새 파일명으로 업데이트
-                new_row[header] = f"{difficulty}/{new_number}.svg"
+    # 매핑을 찾을 수 없는 경우 쓸 난이도별 파일 수 (행마다 매핑 전체를 훑지 않도록 미리 계산)
+    difficulty_counts = {}
+
+    def fallback_number(difficulty):
+        """해당 난이도의 다른 파일 수로 순서 추정"""
+        if difficulty not in difficulty_counts:
+            difficulty_counts[difficulty] = sum(1 for v in filename_mapping.values() if v.startswith(difficulty))
+        return f"{difficulty}{difficulty_counts[difficulty] + 1:02d}"
+
+    def plan(headers):
+        """difficulty 다음에 difficulty_number 컬럼을 넣는 행 변환 함수 반환"""
+        quiz_id_index = headers.index('quiz_id')
+        difficulty_index = headers.index('difficulty')
+        filename_index = headers.index('country_filename')
+        path_index = headers.index('flag_image_path')
+        new_headers = headers[:2] + ['difficulty_number'] + headers[2:]
+
+        def transform(row):
+            # 기존 파일명에서 새 넘버링 찾기
+            old_filename = row[filename_index]
+            difficulty = row[difficulty_index]
+            if old_filename in filename_mapping:
+                new_number = filename_mapping[old_filename]
             else:
-                new_row[header] = row[header]
+                new_number = fallback_number(difficulty)
 
-        updated_rows.append(new_row)
+            # 이미지 경로도 새 파일명으로 업데이트
+            row = row[:path_index] + (f"{difficulty}/{new_number}.svg",) + row[path_index + 1:]
+            instrumentation.progress(f"✅ {row[quiz_id_index]:3s}: {old_filename} → {new_number}")
+            return row[:2] + (new_number,) + row[2:]
 
-        print(f"✅ {row['quiz_id']:3s}: {old_filename} → {new_number}")
+        return new_headers, transform
 
-    # 새 CSV 파일 저장
-    with open(updated_csv_file, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=new_headers)
-        writer.writeheader()
-        writer.writerows(updated_rows)
-
-    # 기존 파일을 백업하고 새 파일로 교체
-    backup_file = Path("flag_quiz_data_backup.csv")
-    if backup_file.exists():
-        backup_file.unlink()
-    shutil.move(csv_file, backup_file)
-    shutil.move(updated_csv_file, csv_file)
+    # 한 행씩 읽어서 바로 쓴 뒤 기존 파일을 백업하고 새 파일로 교체
+    csv_stream.rewrite_csv(csv_file, plan, backup_file)
 
     print(f"\n💾 CSV 파일 업데이트 완료!")
     print(f"  - 원본 백업: {backup_file}")
@@ -161,7 +148,7 @@ def update_canva_ready_structure():
     dest_csv = Path("canva_upload_ready/csv_data/flag_quiz_data.csv")
 
     if source_csv.exists() and dest_csv.parent.exists():
-        shutil.copy2(source_csv, dest_csv)
+        asset_store.publish(source_csv, dest_csv)
         print("✅ CSV 파일 동기화 완료")
 
     print("📦 Canva 업로드 준비 완료!")
@@ -205,4 +192,5 @@ def main():
     print("  high/high01.svg (åland_islands.svg)")
 
 if __name__ == "__main__":
+    instrumentation.set_quiet_from_argv()
     main()
\ No newline at end of file
@@ -2,13 +2,50 @@
 """
 CSV 파일을 difficulty_number 컬럼 기준으로 순차 정렬하는 스크립트
 beginner01, beginner02... intermediate01, intermediate02... high01, high02... 순서로 정렬
+- 행이 많으면 일정 크기씩 정렬해 임시 파일로 내보낸 뒤 k-way 병합 (메모리 사용량 일정)
 """
 import csv
-import shutil
+import heapq
+import os
+import re
+import tempfile
 from pathlib import Path
 
-def sort_csv_by_difficulty_number():
-    """CSV 파일을 difficulty_number 기준으로 정렬"""
+import asset_store
+import instrumentation
+
+DIFFICULTY_PRIORITY = {'beginner': 1, 'intermediate': 2, 'high': 3}
+DIFFICULTY_NUMBER_PATTERN = re.compile(r'^([a-z]+?)(\d+)$')
+RUN_ROWS = 100000           # 메모리에서 한 번에 정렬할 최대 행 수 (넘으면 임시 파일로 내보냄)
+
+def sort_key(difficulty_number, seq):
+    """difficulty_number → 정렬 키 (난이도 순위, 번호, 행 번호) - 번호 크기 제한 없음, 같은 키는 원래 순서 유지"""
+    match = DIFFICULTY_NUMBER_PATTERN.match(difficulty_number)
+    if match and match.group(1) in DIFFICULTY_PRIORITY:
+        priority, number = DIFFICULTY_PRIORITY[match.group(1)], int(match.group(2))
+    else:
+        priority, number = 4, 999
+    return priority, number, seq
+
+def spill_run(run, run_dir, run_index):
+    """정렬된 run을 임시 CSV로 저장 (앞 3개 컬럼은 정렬 키)"""
+    run.sort(key=lambda item: item[0])
+    path = Path(run_dir) / f"run_{run_index:05d}.csv"
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        for key, row in run:
+            writer.writerow([*key, *row])
+    return path
+
+def read_run(path):
+    """임시 run 파일 → (정렬 키, 행) 이터레이터"""
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        for record in csv.reader(f):
+            yield (int(record[0]), int(record[1]), int(record[2])), record[3:]
+
+@instrumentation.timed('sort')
+def sort_csv_by_difficulty_number(run_rows=RUN_ROWS):
+    """CSV 파일을 difficulty_number 기준으로 정렬 (외부 병합 정렬, 메모리 사용량 일정)"""
     print("📊 CSV 파일 정렬 시작...")
     print("정렬 기준: difficulty_number (beginner01~85, intermediate01~85, high01~85)")
     print("=" * 70)
@@ -20,57 +57,43 @@ def sort_csv_by_difficulty_number():
         print(f"❌ CSV 파일을 찾을 수 없습니다: {csv_file}")
         return False
 
-    # CSV 파일 읽기
-    with open(csv_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        headers = reader.fieldnames
-        rows = list(reader)
-
-    print(f"📈 읽어온 데이터: {len(rows)}개 행")
-
-    # 정렬 함수 정의
-    def sort_key(row):
-        """정렬 키 생성 함수"""
-        difficulty_number = row['difficulty_number']
-
-        # 난이도별 우선순위 설정
-        if difficulty_number.startswith('beginner'):
-            priority = 1
-            number = int(difficulty_number.replace('beginner', ''))
-        elif difficulty_number.startswith('intermediate'):
-            priority = 2
-            number = int(difficulty_number.replace('intermediate', ''))
-        elif difficulty_number.startswith('high'):
-            priority = 3
-            number = int(difficulty_number.replace('high', ''))
-        else:
-            priority = 4
-            number = 999
-
-        return (priority, number)
-
-    # 정렬 실행
-    print("🔄 정렬 중...")
-    sorted_rows = sorted(rows, key=sort_key)
-
-    # quiz_id 재할당 (1번부터 순차적으로)
-    print("🔢 quiz_id 재할당 중...")
-    for i, row in enumerate(sorted_rows, 1):
-        row['quiz_id'] = str(i)
-
-    # 새 CSV 파일로 저장
-    with open(sorted_csv_file, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=headers)
-        writer.writeheader()
-        writer.writerows(sorted_rows)
+    with tempfile.TemporaryDirectory(prefix="sort_runs_") as run_dir:
+        # 1단계: run_rows행씩 읽어 정렬 키로 정렬한 뒤 임시 파일로 내보내기
+        print("🔄 정렬 중...")
+        run_paths = []
+        run = []
+        total = 0
+        with open(csv_file, 'r', newline='', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            headers = next(reader)
+            number_index = headers.index('difficulty_number')
+            quiz_id_index = headers.index('quiz_id')
+            for row in reader:
+                run.append((sort_key(row[number_index], total), row))
+                total += 1
+                if len(run) >= run_rows:
+                    run_paths.append(spill_run(run, run_dir, len(run_paths)))
+                    run = []
+
+        print(f"📈 읽어온 데이터: {total}개 행 (임시 run {len(run_paths)}개)")
+
+        # 마지막 run은 파일로 내보내지 않고 메모리에서 바로 병합
+        run.sort(key=lambda item: item[0])
+        sources = [read_run(path) for path in run_paths] + [iter(run)]
+
+        # 2단계: k-way 병합하면서 quiz_id 재할당 (1번부터 순차적으로)
+        print("🔢 병합 및 quiz_id 재할당 중...")
+        with open(sorted_csv_file, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(headers)
+            for quiz_id, (_, row) in enumerate(heapq.merge(*sources, key=lambda item: item[0]), 1):
+                row[quiz_id_index] = str(quiz_id)
+                writer.writerow(row)
 
     # 백업 후 원본 파일 교체
     backup_file = Path("flag_quiz_data_before_sort.csv")
-    if backup_file.exists():
-        backup_file.unlink()
-
-    shutil.move(csv_file, backup_file)
-    shutil.move(sorted_csv_file, csv_file)
+    asset_store.backup_file(csv_file, backup_file)
+    os.replace(sorted_csv_file, csv_file)
 
     print("💾 파일 저장 완료!")
     print(f"  - 정렬된 파일: {csv_file}")
@@ -112,7 +135,7 @@ def update_canva_csv():
     dest_csv = Path("canva_upload_ready/csv_data/flag_quiz_data.csv")
 
     if source_csv.exists() and dest_csv.parent.exists():
-        shutil.copy2(source_csv, dest_csv)
+        asset_store.publish(source_csv, dest_csv)
         print("✅ Canva 업로드 폴더 CSV 동기화 완료")
 
 def main():
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+학습자별 국기 간격 반복(spaced repetition) 스케줄러
+- 학습자 × 국기 기억 상태(FSRS 방식의 안정도/난이도)를 64비트 정수 1개로 압축해 array('Q') 힙에 보관
+  비트 구성: [복습 예정 시각(분) 28][안정도(로그 스케일) 16][난이도 8][국기 ID 12]
+  → 정수 크기 비교가 곧 복습 예정 시각 비교이므로 array 자체가 최소 힙
+- 다음 문제 선택은 힙 맨 앞 확인(O(1)), 답변 반영은 힙 재정렬(O(log n))
+- 아직 안 본 국기는 퀴즈 카탈로그 순서(쉬운 난이도부터)로 하나씩 도입 → 별도 상태 없이 힙 크기로 판단
+- 시뮬레이션 벤치마크: python srs_scheduler.py --learners 1000000
+"""
+import argparse
+import math
+import os
+import random
+import resource
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from pathlib import Path
+
+import catalog_cache
+
+QUIZ_CSV = Path("canva_upload_ready/csv_data/flag_quiz_data.csv")
+STATE_FILE = Path("srs_state.bin")
+
+DIFFICULTY_ORDER = {'beginner': 0, 'intermediate': 1, 'high': 2}
+
+# 비트 배치
+FLAG_BITS, DIFFICULTY_BITS, STABILITY_BITS, DUE_BITS = 12, 8, 16, 28
+FLAG_MASK = (1 << FLAG_BITS) - 1
+DIFFICULTY_MASK = (1 << DIFFICULTY_BITS) - 1
+STABILITY_MASK = (1 << STABILITY_BITS) - 1
+DUE_MASK = (1 << DUE_BITS) - 1
+DIFFICULTY_SHIFT = FLAG_BITS
+STABILITY_SHIFT = FLAG_BITS + DIFFICULTY_BITS
+DUE_SHIFT = FLAG_BITS + DIFFICULTY_BITS + STABILITY_BITS
+
+STABILITY_SCALE = 4096          # 안정도(분) 로그 인코딩 배율 - 최대 약 17년
+EPOCH = 1704067200              # 2024-01-01 UTC, 시각은 이 시점부터의 분 단위
+
+# FSRS 단순화 파라미터 (등급: 1=틀림, 2=어려움, 3=보통, 4=쉬움)
+INITIAL_STABILITY_MINUTES = {1: 10, 2: 12 * 60, 3: 2 * 1440, 4: 5 * 1440}
+MIN_STABILITY_MINUTES = 10
+DESIRED_RETENTION = 0.9
+SLOW_ANSWER_MS = 8000
+FAST_ANSWER_MS = 2500
+
+def now_minutes(timestamp=None):
+    """유닉스 시각 → 스케줄러 분 단위 시각"""
+    return int(((time.time() if timestamp is None else timestamp) - EPOCH) // 60)
+
+def encode_stability(minutes):
+    """안정도(분) → 16비트 로그 스케일 값"""
+    return min(STABILITY_MASK, round(math.log1p(max(minutes, 0)) * STABILITY_SCALE))
+
+def decode_stability(value):
+    return math.expm1(value / STABILITY_SCALE)
+
+def encode_difficulty(difficulty):
+    """난이도 1~10 → 0~255"""
+    return round((min(max(difficulty, 1.0), 10.0) - 1) / 9 * DIFFICULTY_MASK)
+
+def decode_difficulty(value):
+    return 1 + value / DIFFICULTY_MASK * 9
+
+def pack(due, stability_minutes, difficulty, flag_id):
+    """기억 상태 → 64비트 정수"""
+    return ((min(max(due, 0), DUE_MASK) << DUE_SHIFT)
+            | (encode_stability(stability_minutes) << STABILITY_SHIFT)
+            | (encode_difficulty(difficulty) << DIFFICULTY_SHIFT)
+            | flag_id)
+
+def unpack(value):
+    """64비트 정수 → (복습 예정 시각, 안정도(분), 난이도, 국기 ID)"""
+    return (value >> DUE_SHIFT,
+            decode_stability((value >> STABILITY_SHIFT) & STABILITY_MASK),
+            decode_difficulty((value >> DIFFICULTY_SHIFT) & DIFFICULTY_MASK),
+            value & FLAG_MASK)
+
+def grade_answer(correct, latency_ms=None):
+    """정답 여부 + 응답 시간 → 등급 1~4"""
+    if not correct:
+        return 1
+    if latency_ms is None:
+        return 3
+    if latency_ms >= SLOW_ANSWER_MS:
+        return 2
+    if latency_ms <= FAST_ANSWER_MS:
+        return 4
+    return 3
+
+def next_state(stability, difficulty, elapsed, grade):
+    """FSRS 방식 상태 갱신 → (새 안정도(분), 새 난이도)"""
+    # 망각 곡선: R = (1 + t / (9S))^-1
+    retrievability = 1 / (1 + elapsed / (9 * stability))
+    difficulty = difficulty - 0.8 * (grade - 3)
+    difficulty = min(max(0.9 * difficulty + 0.1 * 5, 1.0), 10.0)
+
+    if grade == 1:
+        stability = max(MIN_STABILITY_MINUTES, 0.4 * stability ** 0.8 * (11 - difficulty) / 10)
+    else:
+        bonus = {2: 0.6, 3: 1.0, 4: 1.4}[grade]
+        growth = math.exp(1.2) * (11 - difficulty) / 10 * (stability / 1440) ** -0.2 * (math.exp(1 - retrievability) - 1)
+        stability = stability * (1 + growth * bonus)
+    return stability, difficulty
+
+def interval_minutes(stability):
+    """목표 기억률에서 다음 복습까지 간격"""
+    return max(1, round(9 * stability * (1 / DESIRED_RETENTION - 1)))
+
+def _sift_down(heap, pos):
+    """pos 위치 원소를 아래로 내려 힙 속성 복원"""
+    size = len(heap)
+    item = heap[pos]
+    while True:
+        child = 2 * pos + 1
+        if child >= size:
+            break
+        if child + 1 < size and heap[child + 1] < heap[child]:
+            child += 1
+        if heap[child] >= item:
+            break
+        heap[pos] = heap[child]
+        pos = child
+    heap[pos] = item
+
+def _sift_up(heap, pos):
+    """pos 위치 원소를 위로 올려 힙 속성 복원"""
+    item = heap[pos]
+    while pos > 0:
+        parent = (pos - 1) >> 1
+        if heap[parent] <= item:
+            break
+        heap[pos] = heap[parent]
+        pos = parent
+    heap[pos] = item
+
+def load_flag_order(quiz_csv=QUIZ_CSV):
+    """카탈로그 quiz_id를 도입 순서(난이도 → quiz_id)로 정렬"""
+    table = catalog_cache.load_table(quiz_csv)
+    rows = [(DIFFICULTY_ORDER.get(difficulty, 3), int(quiz_id))
+            for difficulty, quiz_id in zip(table.column('difficulty'), table.column('quiz_id'))]
+    return [quiz_id for _, quiz_id in sorted(rows)]
+
+class Scheduler:
+    """학습자 ID → array('Q') 힙"""
+
+    def __init__(self, flag_order):
+        if max(flag_order, default=0) > FLAG_MASK:
+            raise ValueError(f"국기 ID는 {FLAG_MASK} 이하여야 합니다")
+        self.flag_order = array('H', flag_order)
+        self.learners = {}
+
+    def next_flag(self, learner, now=None):
+        """다음에 낼 국기 ID: 복습 예정 지난 국기 → 새 국기 → 가장 먼저 예정된 국기"""
+        now = now_minutes() if now is None else now
+        heap = self.learners.get(learner)
+        if heap and (heap[0] >> DUE_SHIFT) <= now:
+            return heap[0] & FLAG_MASK
+        seen = len(heap) if heap else 0
+        if seen < len(self.flag_order):
+            return self.flag_order[seen]
+        return heap[0] & FLAG_MASK
+
+    def answer(self, learner, flag_id, correct, latency_ms=None, now=None):
+        """답변 반영 → 다음 복습 예정 시각(분)"""
+        now = now_minutes() if now is None else now
+        grade = grade_answer(correct, latency_ms)
+        heap = self.learners.get(learner)
+        if heap is None:
+            heap = self.learners[learner] = array('Q')
+
+        seen = len(heap)
+        if seen < len(self.flag_order) and self.flag_order[seen] == flag_id:
+            # 새 국기 도입: 맨 끝에 넣고 위로 정렬
+            stability = INITIAL_STABILITY_MINUTES[grade]
+            difficulty = 5 - 1.5 * (grade - 3)
+            due = now + interval_minutes(stability)
+            heap.append(pack(due, stability, difficulty, flag_id))
+            _sift_up(heap, seen)
+            return due
+
+        # 대부분은 맨 앞(방금 낸 문제) - 아니면 선형 탐색 (학습자당 최대 국기 수만큼)
+        if heap and (heap[0] & FLAG_MASK) == flag_id:
+            pos = 0
+        else:
+            pos = next((i for i, value in enumerate(heap) if value & FLAG_MASK == flag_id), None)
+            if pos is None:
+                raise ValueError(f"아직 도입되지 않은 국기입니다: {flag_id}")
+
+        old_due, stability, difficulty, _ = unpack(heap[pos])
+        last_review = old_due - interval_minutes(stability)
+        stability, difficulty = next_state(stability, difficulty, max(now - last_review, 0), grade)
+        due = now + interval_minutes(stability)
+        value = pack(due, stability, difficulty, flag_id)
+        previous, heap[pos] = heap[pos], value
+        # 예정 시각이 늦어지면 아래로, (틀려서) 앞당겨지면 위로
+        if value > previous:
+            _sift_down(heap, pos)
+        else:
+            _sift_up(heap, pos)
+        return due
+
+    def state(self, learner):
+        """학습자의 국기별 상태 목록 (예정 시각 순)"""
+        return sorted(unpack(value) for value in self.learners.get(learner, ()))
+
+    def memory_bytes(self):
+        """힙 배열 + 사전 항목이 차지하는 대략적인 메모리"""
+        return sys.getsizeof(self.learners) + sum(sys.getsizeof(heap) for heap in self.learners.values())
+
+    def save(self, path=STATE_FILE):
+        """이진 파일로 저장: [학습자 ID Q][개수 H][상태 Q × 개수] 반복 (임시 파일에 쓴 뒤 원자적으로 교체)"""
+        fd, tmp_path = tempfile.mkstemp(dir=Path(path).parent, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            for learner, heap in self.learners.items():
+                f.write(struct.pack('<QH', learner, len(heap)))
+                f.write(heap.tobytes())
+        os.replace(tmp_path, path)
+
+    def load(self, path=STATE_FILE):
+        """save()로 저장한 파일 로드"""
+        header = struct.Struct('<QH')
+        with open(path, 'rb') as f:
+            while True:
+                head = f.read(header.size)
+                if len(head) < header.size:
+                    break
+                learner, count = header.unpack(head)
+                heap = array('Q')
+                heap.frombytes(f.read(count * 8))
+                self.learners[learner] = heap
+        return self
+
+def simulate(learners, answers_per_learner, flags, seed=42):
+    """가상 학습자 시뮬레이션 → 통계 dict"""
+    rng = random.Random(seed)
+    scheduler = Scheduler(flags)
+    # 국기별 실제 난이도 (0 쉬움 ~ 1 어려움) - 도입 순서가 뒤일수록 어렵게
+    true_difficulty = {flag: (i / len(flags)) * 0.6 + rng.random() * 0.4 for i, flag in enumerate(flags)}
+    clock = now_minutes()
+
+    picks = 0
+    pick_time = 0.0
+    answer_time = 0.0
+    correct_count = 0
+    start = time.perf_counter()
+    for learner in range(learners):
+        now = clock
+        for _ in range(answers_per_learner):
+            t0 = time.perf_counter()
+            flag = scheduler.next_flag(learner, now)
+            t1 = time.perf_counter()
+            correct = rng.random() > true_difficulty[flag] * 0.7
+            scheduler.answer(learner, flag, correct, rng.randint(1000, 10000), now)
+            t2 = time.perf_counter()
+            pick_time += t1 - t0
+            answer_time += t2 - t1
+            picks += 1
+            correct_count += correct
+            # 문제 사이 간격 1~30분, 가끔 하루 이상 쉼
+            now += rng.randint(1, 30) if rng.random() > 0.05 else rng.randint(1440, 5 * 1440)
+
+    elapsed = time.perf_counter() - start
+    return {
+        'scheduler': scheduler,
+        'picks': picks,
+        'seconds': elapsed,
+        'pick_us': pick_time / picks * 1e6 if picks else 0,
+        'answer_us': answer_time / picks * 1e6 if picks else 0,
+        'accuracy': correct_count / picks if picks else 0,
+    }
+
+def main():
+    """메인 실행 함수: 시뮬레이션 벤치마크"""
+    parser = argparse.ArgumentParser(description="간격 반복 스케줄러 시뮬레이션 벤치마크")
+    parser.add_argument('--learners', type=int, default=100000, help="가상 학습자 수")
+    parser.add_argument('--answers', type=int, default=20, help="학습자당 답변 수")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--save', action='store_true', help=f"결과 상태를 {STATE_FILE}에 저장")
+    args = parser.parse_args()
+
+    print("🧠 간격 반복 스케줄러 시뮬레이션")
+    print("=" * 60)
+
+    if QUIZ_CSV.exists():
+        flags = load_flag_order()
+        print(f"✅ 카탈로그 국기 {len(flags)}개")
+    else:
+        flags = list(range(1, 256))
+        print(f"⚠️  퀴즈 CSV 없음 - 가상 국기 {len(flags)}개 사용")
+
+    result = simulate(args.learners, args.answers, flags, args.seed)
+    scheduler = result['scheduler']
+    memory = scheduler.memory_bytes()
+    states = sum(len(heap) for heap in scheduler.learners.values())
+
+    print(f"\n📊 학습자 {args.learners:,}명 × 답변 {args.answers}개 = {result['picks']:,}건 ({result['seconds']:.1f}초)")
+    print(f"⚡ 처리량: {result['picks'] / result['seconds']:,.0f} 답변/s")
+    print(f"⏱️  다음 문제 선택 {result['pick_us']:.2f}µs, 답변 반영 {result['answer_us']:.2f}µs")
+    print(f"🎯 정답률: {result['accuracy']:.1%}")
+    print(f"💾 상태 {states:,}개, 스케줄러 메모리 {memory / 1024 / 1024:.1f}MB "
+          f"(학습자당 {memory / max(args.learners, 1):.0f}B), 최대 RSS "
+          f"{resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f}MB")
+
+    sample = scheduler.state(0)[:3]
+    for due, stability, difficulty, flag in sample:
+        print(f"  학습자 0 · 국기 {flag}: 안정도 {stability / 1440:.2f}일, 난이도 {difficulty:.1f}, 예정 {due}")
+
+    if args.save:
+        scheduler.save()
+        print(f"📁 상태 저장: {STATE_FILE}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+SVG 렌더링 비용 프로파일러 + 비용 기반 스케줄러
+- SVG 구조(요소 수, path 데이터 길이, 그라데이션, 필터, 내장 래스터 이미지 등)로 렌더링 비용 점수 계산
+- 비용이 큰 작업부터 워커에 배분 (Longest-Job-First) → 무거운 파일 하나가 마지막에 남아 전체가 늘어지지 않음
+- 파일별 타임아웃은 비용 점수에서 계산, 시간 초과 시 다른 백엔드로 재시도
+- 비용 이상치와 시간 초과 파일은 실행 리포트(perf_events.jsonl의 outliers 이벤트)에 기록
+"""
+import os
+import re
+import statistics
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import asset_index
+import instrumentation
+
+SVG_DIR = Path("canva_upload_ready/flag_images/svg")
+
+# 비용 점수 가중치 (기본 1 = 단순한 국기 1장)
+COST_WEIGHTS = {
+    'kilobytes': 0.05,          # 파일 크기 (파싱 비용)
+    'elements': 0.01,           # 요소 수
+    'path_kilobytes': 0.2,      # path 데이터 길이 (곡선 분할/채우기 비용)
+    'gradients': 0.5,
+    'clips': 0.5,               # clipPath / mask (오프스크린 합성)
+    'filters': 5.0,             # 블러 등 필터 (픽셀 단위 연산)
+    'images': 2.0,              # 내장 래스터 이미지 디코딩
+    'raster_kilobytes': 0.1,
+    'texts': 0.3,               # 글꼴 조회 + 글리프 렌더링
+}
+OUTLIER_FACTOR = 20             # 중앙값의 이 배수 이상이면 이상치
+SECONDS_PER_COST = 0.5          # 비용 1당 허용 시간
+MIN_TIMEOUT = 10
+MAX_TIMEOUT = 120
+
+TAG_PATTERN = re.compile(rb'<([a-zA-Z][\w:.-]*)')
+PATH_DATA_PATTERN = re.compile(rb'\s(?:d|points)\s*=\s*"([^"]*)"')
+DATA_URI_PATTERN = re.compile(rb'href\s*=\s*["\']data:image/[^;]+;base64,([^"\']*)')
+
+def profile_svg(path):
+    """SVG 1개의 구조 특징과 비용 점수"""
+    data = Path(path).read_bytes()
+    tags = {}
+    for match in TAG_PATTERN.finditer(data):
+        name = match.group(1).lower().split(b':')[-1]
+        tags[name] = tags.get(name, 0) + 1
+
+    features = {
+        'kilobytes': len(data) / 1024,
+        'elements': sum(tags.values()),
+        'path_kilobytes': sum(len(m.group(1)) for m in PATH_DATA_PATTERN.finditer(data)) / 1024,
+        'gradients': tags.get(b'lineargradient', 0) + tags.get(b'radialgradient', 0),
+        'clips': tags.get(b'clippath', 0) + tags.get(b'mask', 0),
+        'filters': tags.get(b'filter', 0),
+        'images': tags.get(b'image', 0),
+        'raster_kilobytes': sum(len(m.group(1)) * 3 // 4 for m in DATA_URI_PATTERN.finditer(data)) / 1024,
+        'texts': tags.get(b'text', 0),
+    }
+    features['cost'] = round(1 + sum(COST_WEIGHTS[key] * value for key, value in features.items()), 3)
+    return features
+
+def timeout_for(cost):
+    """비용 점수 → 파일별 타임아웃 (초)"""
+    return min(MAX_TIMEOUT, max(MIN_TIMEOUT, cost * SECONDS_PER_COST))
+
+def find_outliers(profiles):
+    """비용이 중앙값의 OUTLIER_FACTOR배 이상인 파일 목록 (비용 큰 순)"""
+    if not profiles:
+        return []
+    median = statistics.median(profile['cost'] for profile in profiles.values())
+    return sorted((path for path, profile in profiles.items() if profile['cost'] >= median * OUTLIER_FACTOR),
+                  key=lambda path: -profiles[path]['cost'])
+
+def run_longest_first(units, run, workers=None):
+    """(비용, 작업) 목록을 비용 큰 순으로 워커에 배분 → 완료되는 순서대로 (작업, 결과 또는 예외) 반환"""
+    ordered = sorted(units, key=lambda unit: -unit[0])
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        # 제출 순서 = 시작 순서이므로 정렬 후 제출하면 긴 작업이 먼저 시작됨
+        futures = {pool.submit(run, unit): unit for _, unit in ordered}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result()
+            except Exception as e:
+                yield futures[future], e
+
+def record_outliers(name, entries):
+    """이상치 목록을 실행 리포트에 기록"""
+    instrumentation.emit({'type': 'outliers', 'name': name, 'files': entries})
+
+def main():
+    """메인 실행 함수: SVG 전체 비용 분석 및 이상치 출력"""
+    print("🔬 SVG 렌더링 비용 분석")
+    print("=" * 60)
+
+    svg_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else SVG_DIR
+    svg_files = [path for path, _ in asset_index.get_index().walk(svg_dir) if path.suffix == '.svg']
+    if not svg_files:
+        print(f"❌ SVG 파일을 찾을 수 없습니다: {svg_dir}")
+        return False
+
+    profiles = {path: profile_svg(path) for path in svg_files}
+    costs = sorted(profile['cost'] for profile in profiles.values())
+    print(f"📊 SVG {len(profiles)}개: 비용 중앙값 {statistics.median(costs):.2f}, 최대 {costs[-1]:.2f}")
+
+    print("\n🐢 비용 상위 10개:")
+    for path in sorted(profiles, key=lambda p: -profiles[p]['cost'])[:10]:
+        profile = profiles[path]
+        print(f"  - {path.name:<40} 비용 {profile['cost']:>7.2f} "
+              f"(요소 {profile['elements']}, path {profile['path_kilobytes']:.0f}KB, "
+              f"그라데이션 {profile['gradients']}, 필터 {profile['filters']}, 이미지 {profile['images']})")
+
+    outliers = find_outliers(profiles)
+    if outliers:
+        print(f"\n⚠️  이상치 {len(outliers)}개 (중앙값의 {OUTLIER_FACTOR}배 이상 - 배치에서 빼고 먼저 개별 변환):")
+        for path in outliers:
+            print(f"  - {path.name:<40} 비용 {profiles[path]['cost']:>7.2f}, "
+                  f"타임아웃 {timeout_for(profiles[path]['cost']):.0f}초")
+    return True
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+4K/8K 국기 PNG 스트립 단위 렌더링 (프로세스당 메모리 상한 유지)
+- SVG viewBox를 가로 띠(strip) 단위로 잘라 백엔드로 하나씩 래스터화
+- 각 띠 PNG의 압축 데이터를 풀어 그대로 하나의 PNG IDAT 스트림으로 이어 붙임 (전체 이미지를 메모리에 올리지 않음)
+- 띠 높이는 RSS 상한(--max-rss)에서 계산: 상한이 작을수록 띠를 얇게
+- 여러 장을 프로세스 풀로 동시에 렌더링해도 워커당 메모리가 상한을 넘지 않음
+"""
+import argparse
+import os
+import re
+import struct
+import subprocess
+import tempfile
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:
+    # Windows: 백엔드 최대 RSS는 측정하지 않음
+    resource = None
+
+import raster_backends
+
+TILE_THRESHOLD = 3840               # 이 크기 이상이면 convert_svg_to_png가 스트립 렌더링 사용
+MAX_RSS_MB = 256                    # 렌더링 워커 1개의 메모리 상한 기본값
+BASE_RSS_BYTES = 48 * 1024 * 1024   # 백엔드 자체 메모리 (라이브러리, SVG 파싱 결과)
+SURFACE_COPIES = 3                  # 띠 1개당 픽셀 버퍼 사본 수 (래스터 표면 + PNG 인코딩 + 여유)
+MIN_STRIP_ROWS = 16
+IDAT_CHUNK_BYTES = 256 * 1024
+COMPRESS_LEVEL = 6
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+CHANNELS = {0: 1, 2: 3, 4: 2, 6: 4}     # PNG 색 형식 → 채널 수 (팔레트 형식은 띠마다 달라질 수 있어 제외)
+
+SVG_TAG_PATTERN = re.compile(r'<svg\b[^>]*>', re.S)
+VIEWBOX_PATTERN = re.compile(r'\sviewBox\s*=\s*["\']\s*([-\d.eE]+)[\s,]+([-\d.eE]+)[\s,]+([\d.eE]+)[\s,]+([\d.eE]+)')
+LENGTH_PATTERN = r'\s{}\s*=\s*["\']\s*([\d.]+)(?:px)?\s*["\']'
+ROOT_ATTR_PATTERN = re.compile(r'\s(?:width|height|viewBox|preserveAspectRatio)\s*=\s*(?:"[^"]*"|\'[^\']*\')')
+
+def svg_geometry(svg_text):
+    """SVG 좌표계 (x, y, 가로, 세로) - viewBox 우선, 없으면 width/height"""
+    tag = SVG_TAG_PATTERN.search(svg_text)
+    if tag is None:
+        raise ValueError("<svg> 태그를 찾을 수 없습니다")
+    match = VIEWBOX_PATTERN.search(tag.group(0))
+    if match:
+        return tuple(float(value) for value in match.groups())
+    width = re.search(LENGTH_PATTERN.format('width'), tag.group(0))
+    height = re.search(LENGTH_PATTERN.format('height'), tag.group(0))
+    if width and height:
+        return 0.0, 0.0, float(width.group(1)), float(height.group(1))
+    raise ValueError("SVG 크기(viewBox 또는 width/height)를 알 수 없습니다")
+
+def crop_svg(svg_text, box, width, height):
+    """SVG 루트 좌표계를 box 영역으로 바꾼 사본 (출력 크기 width×height, 비율 고정 없음)"""
+    tag = SVG_TAG_PATTERN.search(svg_text)
+    x, y, box_width, box_height = box
+    new_tag = ROOT_ATTR_PATTERN.sub('', tag.group(0)).replace(
+        '<svg', f'<svg width="{width}" height="{height}" viewBox="{x!r} {y!r} {box_width!r} {box_height!r}" '
+                f'preserveAspectRatio="none"', 1)
+    return svg_text[:tag.start()] + new_tag + svg_text[tag.end():]
+
+def output_size(geometry, size):
+    """size×size 상자에 비율을 유지해 들어가는 (가로, 세로) - 기존 변환과 같은 기준"""
+    _, _, box_width, box_height = geometry
+    if box_width >= box_height:
+        return size, max(1, round(size * box_height / box_width))
+    return max(1, round(size * box_width / box_height)), size
+
+def strip_rows(width, max_rss_mb=MAX_RSS_MB):
+    """RSS 상한 안에 들어가는 띠 높이 (픽셀 행 수)"""
+    budget = max_rss_mb * 1024 * 1024 - BASE_RSS_BYTES
+    return max(MIN_STRIP_ROWS, budget // (width * 4 * SURFACE_COPIES))
+
+def iter_png_chunks(f):
+    """PNG 파일 → (청크 종류, 데이터) 이터레이터"""
+    if f.read(8) != PNG_SIGNATURE:
+        raise ValueError("PNG 파일이 아닙니다")
+    while True:
+        header = f.read(8)
+        if len(header) < 8:
+            return
+        length, kind = struct.unpack('>I4s', header)
+        data = f.read(length)
+        f.read(4)   # CRC
+        yield kind, data
+        if kind == b'IEND':
+            return
+
+def unfilter_first_row(row, bpp):
+    """띠 첫 행을 위 행에 의존하지 않는 필터로 변환 (원래 PNG에서 위 행은 0으로 취급됨)"""
+    kind = row[0]
+    if kind in (0, 1):
+        return row
+    if kind == 2:
+        # Up: 위 행이 0이면 원본 그대로
+        return b'\x00' + row[1:]
+    if kind == 4:
+        # Paeth: 위 행이 0이면 예측값은 항상 왼쪽 픽셀 → Sub와 같음
+        return b'\x01' + row[1:]
+    # Avg: 왼쪽 픽셀의 절반만 더해서 원본 복원
+    raw = bytearray(row[1:])
+    for i in range(bpp, len(raw)):
+        raw[i] = (raw[i] + (raw[i - bpp] >> 1)) & 0xFF
+    return b'\x00' + bytes(raw)
+
+class PngStreamWriter:
+    """필터가 적용된 행 데이터를 받아 IDAT 청크로 바로 압축해 쓰는 PNG 인코더"""
+
+    def __init__(self, f, width, height, bit_depth, color_type):
+        self.f = f
+        self.compressor = zlib.compressobj(COMPRESS_LEVEL)
+        self.pending = []
+        self.pending_size = 0
+        f.write(PNG_SIGNATURE)
+        self._chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, bit_depth, color_type, 0, 0, 0))
+
+    def _chunk(self, kind, data):
+        self.f.write(struct.pack('>I', len(data)) + kind + data
+                     + struct.pack('>I', zlib.crc32(data, zlib.crc32(kind))))
+
+    def write(self, filtered):
+        """필터 바이트가 붙은 행 데이터 추가"""
+        data = self.compressor.compress(filtered)
+        if data:
+            self.pending.append(data)
+            self.pending_size += len(data)
+            if self.pending_size >= IDAT_CHUNK_BYTES:
+                self._flush()
+
+    def _flush(self):
+        if self.pending:
+            self._chunk(b'IDAT', b''.join(self.pending))
+            self.pending = []
+            self.pending_size = 0
+
+    def close(self):
+        """남은 압축 데이터와 IEND 기록"""
+        self.pending.append(self.compressor.flush())
+        self._flush()
+        self._chunk(b'IEND', b'')
+
+def append_strip(writer, strip_png, width, rows, header=None):
+    """띠 PNG 1개의 행 데이터를 writer에 이어 붙임 → 띠의 IHDR (첫 띠와 형식이 다르면 ValueError)"""
+    decompressor = zlib.decompressobj()
+    first_row = b''
+    stride = None
+    strip_header = None
+    with open(strip_png, 'rb') as f:
+        for kind, data in iter_png_chunks(f):
+            if kind == b'IHDR':
+                strip_header = struct.unpack('>IIBBBBB', data)
+                strip_width, strip_height, bit_depth, color_type, _, _, interlace = strip_header
+                if (strip_width, strip_height) != (width, rows):
+                    raise ValueError(f"띠 크기가 다릅니다: {strip_width}x{strip_height} (예상 {width}x{rows})")
+                if color_type not in CHANNELS or interlace:
+                    raise ValueError(f"지원하지 않는 PNG 형식 (색 형식 {color_type}, 인터레이스 {interlace})")
+                if header is not None and header[2:4] != strip_header[2:4]:
+                    raise ValueError("띠마다 PNG 색 형식이 다릅니다")
+                bits = bit_depth * CHANNELS[color_type]
+                stride = 1 + (width * bits + 7) // 8
+                bpp = max(1, bits // 8)
+            elif kind == b'IDAT':
+                data = decompressor.decompress(data)
+                if stride is not None and len(first_row) < stride:
+                    # 첫 행이 다 모일 때까지 모았다가 필터만 고쳐서 기록
+                    first_row += data
+                    if len(first_row) < stride:
+                        continue
+                    data = first_row[stride:]
+                    writer.write(unfilter_first_row(first_row[:stride], bpp))
+                writer.write(data)
+    tail = decompressor.flush()
+    if tail:
+        writer.write(tail)
+    if strip_header is None:
+        raise ValueError("띠 PNG에 IHDR가 없습니다")
+    return strip_header
+
+def render_tiled(svg_path, png_path, size, backend=None, max_rss_mb=MAX_RSS_MB, timeout=None):
+    """SVG 1개를 띠 단위로 렌더링해 PNG 1개로 저장 → (가로, 세로, 띠 수)
+
+    timeout(초)은 전체 렌더링 시간 상한: 띠마다 남은 시간을 백엔드 타임아웃으로 넘기고,
+    다 쓰면 subprocess.TimeoutExpired (한 번에 렌더링하는 경로와 같은 예외).
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    backend = backend or raster_backends.get_backend()
+    if backend is None:
+        raise RuntimeError("사용 가능한 래스터화 백엔드가 없습니다")
+
+    svg_text = Path(svg_path).read_text(encoding='utf-8')
+    geometry = svg_geometry(svg_text)
+    x, y, box_width, box_height = geometry
+    width, height = output_size(geometry, size)
+    # 띠가 가로보다 길어지면 백엔드가 상자에 맞추느라 축소하므로 가로 이하로 제한
+    rows_per_strip = min(strip_rows(width, max_rss_mb), width)
+
+    png_path = Path(png_path)
+    png_path.parent.mkdir(parents=True, exist_ok=True)
+    header = None
+    strips = 0
+    with tempfile.TemporaryDirectory(prefix="tiled_render_") as tmp:
+        strip_svg = Path(tmp) / "strip.svg"
+        strip_png = Path(tmp) / "strip.png"
+        out_tmp = Path(tmp) / "output.png"
+
+        # 띠 PNG의 색 형식을 알아야 IHDR를 쓸 수 있으므로 첫 띠를 렌더링한 뒤 출력 시작
+        with open(out_tmp, 'wb') as out:
+            writer = None
+            for top in range(0, height, rows_per_strip):
+                rows = min(rows_per_strip, height - top)
+                box = (x, y + box_height * top / height, box_width, box_height * rows / height)
+                strip_svg.write_text(crop_svg(svg_text, box, width, rows), encoding='utf-8')
+                strip_png.unlink(missing_ok=True)
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise subprocess.TimeoutExpired(f"render_tiled {svg_path}", timeout)
+                # ImageMagick은 내용에 따라 색 형식을 바꾸므로 RGBA 8비트로 고정
+                backend.render(strip_svg, f"PNG32:{strip_png}" if backend.name == 'imagemagick' else strip_png,
+                               width, remaining)
+                if writer is None:
+                    with open(strip_png, 'rb') as f:
+                        _, _, bit_depth, color_type, _, _, _ = struct.unpack(
+                            '>IIBBBBB', next(data for kind, data in iter_png_chunks(f) if kind == b'IHDR'))
+                    writer = PngStreamWriter(out, width, height, bit_depth, color_type)
+                header = append_strip(writer, strip_png, width, rows, header)
+                strips += 1
+            writer.close()
+        os.replace(out_tmp, png_path)
+    return width, height, strips
+
+def peak_child_rss_mb():
+    """지금까지 끝난 자식 프로세스(백엔드) 중 최대 RSS (MB) - resource 모듈이 없으면 0"""
+    if resource is None:
+        return 0.0
+    return resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+
+def _render_job(svg_path, png_path, size, max_rss_mb):
+    """프로세스 풀 작업 1개 → (가로, 세로, 띠 수, 백엔드 최대 RSS)"""
+    width, height, strips = render_tiled(svg_path, png_path, size, max_rss_mb=max_rss_mb)
+    return width, height, strips, peak_child_rss_mb()
+
+def main():
+    """메인 실행 함수: SVG 여러 개를 큰 PNG로 병렬 렌더링"""
+    parser = argparse.ArgumentParser(description="4K/8K 국기 PNG 스트립 렌더링")
+    parser.add_argument('svgs', nargs='+', help="SVG 파일들")
+    parser.add_argument('--size', type=int, default=7680, help="긴 변 픽셀 수 (기본 7680)")
+    parser.add_argument('--output-dir', default="flag_images_large")
+    parser.add_argument('--max-rss', type=int, default=MAX_RSS_MB, help="워커 1개의 메모리 상한 (MB)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    print("🖼️ 대형 국기 PNG 스트립 렌더링")
+    print("=" * 60)
+
+    if raster_backends.get_backend() is None:
+        print("❌ 사용 가능한 래스터화 백엔드가 없습니다.")
+        return False
+
+    output_dir = Path(args.output_dir)
+    rows = strip_rows(args.size, args.max_rss)
+    print(f"📐 {args.size}px, 띠 높이 {rows}행, 워커 {args.workers}개 × 상한 {args.max_rss}MB")
+
+    failed = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {pool.submit(_render_job, svg, output_dir / f"{Path(svg).stem}_{args.size}.png",
+                               args.size, args.max_rss): svg for svg in args.svgs}
+        for future in as_completed(futures):
+            svg = futures[future]
+            try:
+                width, height, strips, peak_mb = future.result()
+                print(f"✅ {Path(svg).name}: {width}x{height} (띠 {strips}개, 백엔드 최대 RSS {peak_mb:.0f}MB)")
+            except Exception as e:
+                failed += 1
+                print(f"❌ {Path(svg).name}: {e}")
+
+    print(f"\n📊 성공 {len(args.svgs) - failed}개, 실패 {failed}개 → {output_dir}")
+    return failed == 0
+
+if __name__ == "__main__":
+    if main():
+        print("\n🎉 대형 PNG 렌더링이 완료되었습니다!")
+    else:
+        print("\n💥 대형 PNG 렌더링 중 오류가 발생했습니다.")
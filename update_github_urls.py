@@ -2,10 +2,13 @@
 """
 CSV 파일의 GitHub URL을 실제 저장소 URL로 업데이트하는 스크립트
 """
-import csv
-import shutil
 from pathlib import Path
 
+import asset_store
+import csv_stream
+import instrumentation
+
+@instrumentation.timed('url_update')
 def update_github_urls():
     """CSV의 GitHub URL을 실제 저장소 URL로 업데이트"""
     print("🔗 GitHub URL 업데이트 중...")
@@ -17,42 +20,25 @@ def update_github_urls():
     github_pages_url = "https://davidlikescat.github.io/003_CC_Flags"
 
     csv_file = Path("flag_quiz_data.csv")
-    updated_csv_file = Path("flag_quiz_data_updated_urls.csv")
+    backup_file = Path("flag_quiz_data_placeholder_urls.csv")
 
     if not csv_file.exists():
         print(f"❌ CSV 파일을 찾을 수 없습니다: {csv_file}")
         return False
 
-    # CSV 파일 읽기
-    with open(csv_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        headers = reader.fieldnames
-        rows = list(reader)
-
-    print(f"📊 업데이트할 데이터: {len(rows)}개 행")
-
-    # URL 업데이트
-    updated_rows = []
-    for row in rows:
-        if 'image_url' in row:
-            # 기존 플레이스홀더 URL을 실제 GitHub Pages URL로 교체
-            flag_path = row['flag_image_path']
-            row['image_url'] = f"{github_pages_url}/canva_upload_ready/flag_images/svg/{flag_path}"
-        updated_rows.append(row)
-
-    # 새 CSV 파일 저장
-    with open(updated_csv_file, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=headers)
-        writer.writeheader()
-        writer.writerows(updated_rows)
-
-    # 백업 후 원본 파일 교체
-    backup_file = Path("flag_quiz_data_placeholder_urls.csv")
-    if backup_file.exists():
-        backup_file.unlink()
+    def plan(headers):
+        """image_url 컬럼이 있으면 실제 URL로 바꾸는 행 변환 함수 반환"""
+        if 'image_url' not in headers:
+            return headers, lambda row: row
+        path_index = headers.index('flag_image_path')
+        url_index = headers.index('image_url')
+        url_prefix = f"{github_pages_url}/canva_upload_ready/flag_images/svg/"
+        # 기존 플레이스홀더 URL을 실제 GitHub Pages URL로 교체
+        return headers, lambda row: row[:url_index] + (url_prefix + row[path_index],) + row[url_index + 1:]
 
-    shutil.move(csv_file, backup_file)
-    shutil.move(updated_csv_file, csv_file)
+    # 한 행씩 읽어서 URL을 바꾸고 바로 쓴 뒤 백업 후 원본 파일 교체
+    count = csv_stream.rewrite_csv(csv_file, plan, backup_file)
+    print(f"📊 업데이트한 데이터: {count}개 행")
 
     print("✅ GitHub URL 업데이트 완료!")
     print(f"  - 백업: {backup_file}")
@@ -60,7 +46,7 @@ def update_github_urls():
 
     # 샘플 출력
     print("\n🔗 업데이트된 URL 샘플:")
-    for i, row in enumerate(updated_rows[:3]):
+    for row in csv_stream.head(csv_file):
         print(f"  {row['quiz_id']:3s}: {row['image_url']}")
     print("  ...")
 
@@ -74,7 +60,7 @@ def update_canva_csv():
     dest_csv = Path("canva_upload_ready/csv_data/flag_quiz_data.csv")
 
     if source_csv.exists() and dest_csv.parent.exists():
-        shutil.copy2(source_csv, dest_csv)
+        asset_store.publish(source_csv, dest_csv)
         print("✅ Canva 업로드 폴더 CSV 동기화 완료")
 
 def main():
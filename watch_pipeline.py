@@ -0,0 +1,495 @@
+#!/usr/bin/env python3
+"""
+소스 변경 감시 모드: 바뀐 부분에 영향받는 단계만 다시 실행
+- 감시 대상: 원본 SVG, countries.json, 설정 파일(country_regions.json, 난이도 구간/인지도 점수)
+- Linux는 inotify(ctypes)로 이벤트를 받고, 사용할 수 없으면 asset_index 스냅샷 비교 폴링으로 대체
+- 연속 이벤트(저장 → 이름 변경 등)는 잠깐 모아서(debounce) 한 번에 처리
+- 단계 의존성 그래프를 따라 영향받는 국가(slug)만 전달 → PNG 1장, CSV 몇 행, 카드 1장만 다시 생성
+"""
+import argparse
+import ctypes
+import ctypes.util
+import errno
+import graphlib
+import os
+import select
+import struct
+import time
+from pathlib import Path
+
+import answer_analytics
+import asset_index
+import asset_store
+import classify_flags_by_difficulty
+import convert_svg_to_png
+import country_metadata
+import delta_export
+import instrumentation
+import optimize_for_canva
+import pageview_scores
+import quiz_catalog
+import render_quiz_cards
+from flag_renderer import TIER_FILE_PATTERN
+
+SVG_SOURCE_CANDIDATES = [
+    Path("country-flags/svg_renamed"),          # 원본이 있으면 원본을 감시하고 canva_upload_ready로 동기화
+    Path("canva_upload_ready/flag_images/svg"),
+]
+CANVA_SVG_DIR = Path("canva_upload_ready/flag_images/svg")
+PNG_DIR = Path("canva_upload_ready/flag_images/png")
+PNG_SIZE = 512
+
+DEBOUNCE_SECONDS = 0.5      # 마지막 이벤트 후 이만큼 조용하면 처리 시작
+MAX_DELAY_SECONDS = 5.0     # 이벤트가 계속 와도 이 시간이 지나면 처리
+POLL_INTERVAL = 1.0
+
+# 단계 의존성 그래프: 단계 → 결과를 받아 다시 실행할 하위 단계
+STAGE_GRAPH = {
+    'classify': [],                 # 난이도 재분류 (원본 폴더를 다시 쓰므로 그 변경은 다음 이벤트로 전달됨)
+    'sync': ['png', 'colors'],      # 원본 SVG → canva_upload_ready
+    'png': ['cards'],
+    'colors': [],                   # 국기 주요 색 (country_meta)
+    'names': ['exports'],           # countries.json → 카탈로그 국가명/선택지
+    'regions': [],                  # country_regions.json → country_meta 대륙/지역
+    'exports': ['cards'],           # 카탈로그 → CSV export + delta
+    'cards': [],
+}
+STAGE_ORDER = list(graphlib.TopologicalSorter(
+    {stage: [parent for parent, children in STAGE_GRAPH.items() if stage in children] for stage in STAGE_GRAPH}
+).static_order())
+
+# 변경된 소스 종류 → 처음 실행할 단계
+SOURCE_STAGES = {
+    'svg': 'sync',
+    'countries': 'names',
+    'regions': 'regions',
+    'tiers': 'classify',
+}
+CONFIG_FILES = {
+    **{path: 'countries' for path in quiz_catalog.COUNTRIES_JSON_CANDIDATES},
+    country_metadata.REGIONS_FILE: 'regions',
+    answer_analytics.TIERS_FILE: 'tiers',
+    pageview_scores.SCORES_FILE: 'tiers',
+}
+
+# inotify (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct('iIII')        # wd, mask, cookie, len
+
+def _key(path):
+    """경로 비교용 키 (asset_index와 같은 작업 폴더 기준 POSIX 경로)"""
+    return Path(os.path.normpath(path)).as_posix()
+
+def svg_source_dir():
+    """감시할 원본 SVG 폴더 (원본 폴더가 없으면 canva_upload_ready SVG)"""
+    for candidate in SVG_SOURCE_CANDIDATES:
+        if candidate.exists():
+            return candidate
+    return SVG_SOURCE_CANDIDATES[-1]
+
+def svg_slug(path):
+    """SVG/PNG 경로 → 국가 slug (난이도 번호 접두어가 있으면 제거)"""
+    path = Path(path)
+    match = TIER_FILE_PATTERN.match(path.with_suffix('.svg').name)
+    return match.group(1) if match else path.stem
+
+class SourceMap:
+    """변경된 경로 → (소스 종류, slug) 분류"""
+
+    def __init__(self, svg_dir):
+        self.svg_dir = _key(svg_dir)
+        self.configs = {_key(path): kind for path, kind in CONFIG_FILES.items()}
+
+    def classify(self, path):
+        """관심 없는 경로면 None"""
+        key = _key(path)
+        if key in self.configs:
+            return self.configs[key], None
+        if key.startswith(self.svg_dir + '/') and key.endswith('.svg'):
+            return 'svg', svg_slug(key)
+        return None
+
+    def watch_dirs(self):
+        """감시할 폴더 목록 (설정 파일은 부모 폴더를 감시: 편집기가 새 파일로 교체 저장하므로)"""
+        return sorted({self.svg_dir} | {os.path.dirname(key) or '.' for key in self.configs})
+
+class InotifyWatcher:
+    """inotify 기반 감시 (ctypes로 libc 직접 호출)"""
+
+    def __init__(self, source_map):
+        self.source_map = source_map
+        self.libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 실패")
+        self.dirs = {}                  # watch descriptor → 폴더
+        for path in source_map.watch_dirs():
+            if path == source_map.svg_dir:
+                self.add_tree(path)
+            else:
+                self.add_watch(path)
+
+    def add_watch(self, path):
+        """폴더 1개 감시 등록 (없는 폴더는 건너뜀)"""
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            code = ctypes.get_errno()
+            if code in (errno.ENOENT, errno.ENOTDIR):
+                return
+            raise OSError(code, f"inotify_add_watch 실패: {path}")
+        self.dirs[wd] = path
+
+    def add_tree(self, root):
+        """폴더와 하위 폴더 전체 감시 등록 (inotify는 재귀 감시를 지원하지 않음)"""
+        self.add_watch(root)
+        for dirpath, dirnames, _ in os.walk(root):
+            for name in dirnames:
+                self.add_watch(_key(os.path.join(dirpath, name)))
+
+    def read_events(self):
+        """대기 중인 이벤트 → 관심 있는 변경 경로 집합"""
+        changed = set()
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+                offset += length
+
+                if mask & IN_Q_OVERFLOW:
+                    # 이벤트가 넘쳐 일부를 놓쳤으므로 감시 대상 전체를 변경된 것으로 처리
+                    changed |= all_source_paths(self.source_map)
+                    continue
+                directory = self.dirs.get(wd)
+                if directory is None or not name:
+                    continue
+                path = _key(os.path.join(directory, name))
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO) and path.startswith(self.source_map.svg_dir + '/'):
+                        # 새 하위 폴더: 감시 등록 후 이미 들어 있는 파일도 변경으로 처리
+                        self.add_tree(path)
+                        changed |= {_key(p) for p, _ in asset_index.get_index().walk(path)}
+                    continue
+                if self.source_map.classify(path):
+                    changed.add(path)
+
+    def wait(self, timeout=None):
+        """변경이 생길 때까지 대기 (timeout 초, None이면 무한) → 변경 경로 집합"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            ready, _, _ = select.select([self.fd], [], [], remaining)
+            changed = self.read_events() if ready else set()
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self):
+        """inotify 파일 디스크립터 닫기"""
+        os.close(self.fd)
+
+class PollingWatcher:
+    """폴링 기반 감시 (inotify를 쓸 수 없을 때): asset_index 스냅샷을 주기적으로 비교"""
+
+    def __init__(self, source_map, interval=POLL_INTERVAL):
+        self.source_map = source_map
+        self.interval = interval
+        self.snapshot = self.take_snapshot()
+
+    def take_snapshot(self):
+        """감시 대상 파일 → (크기, 수정시각)"""
+        index = asset_index.get_index()
+        index.refresh_dir(self.source_map.svg_dir, recursive=True, check_files=True)
+        snapshot = {_key(path): tuple(entry[:2]) for path, entry in index.walk(self.source_map.svg_dir)
+                    if path.suffix == '.svg'}
+        for key in self.source_map.configs:
+            try:
+                st = os.stat(key)
+            except FileNotFoundError:
+                continue
+            snapshot[key] = (st.st_size, st.st_mtime_ns)
+        return snapshot
+
+    def wait(self, timeout=None):
+        """변경이 생길 때까지 주기적으로 비교 → 변경 경로 집합"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            current = self.take_snapshot()
+            changed = {key for key in current.keys() | self.snapshot.keys()
+                       if current.get(key) != self.snapshot.get(key)}
+            self.snapshot = current
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            time.sleep(self.interval if deadline is None else
+                       max(0.0, min(self.interval, deadline - time.monotonic())))
+
+    def close(self):
+        """정리할 자원 없음"""
+
+def all_source_paths(source_map):
+    """감시 대상 전체 경로 (이벤트 유실 시 전체 재확인용)"""
+    paths = {_key(path) for path, _ in asset_index.get_index().walk(source_map.svg_dir) if path.suffix == '.svg'}
+    return paths | {key for key in source_map.configs if os.path.exists(key)}
+
+def create_watcher(source_map, force_polling=False, interval=POLL_INTERVAL):
+    """inotify 감시자 생성 (지원하지 않는 환경이면 폴링)"""
+    if not force_polling:
+        try:
+            return InotifyWatcher(source_map)
+        except (OSError, AttributeError) as e:
+            print(f"⚠️  inotify를 사용할 수 없어 폴링으로 감시합니다: {e}")
+    return PollingWatcher(source_map, interval)
+
+def collect_changes(watcher, debounce=DEBOUNCE_SECONDS, max_delay=MAX_DELAY_SECONDS):
+    """첫 변경 후 debounce초 동안 조용해질 때까지(최대 max_delay초) 이벤트를 모아 반환"""
+    changed = watcher.wait()
+    deadline = time.monotonic() + max_delay
+    while time.monotonic() < deadline:
+        more = watcher.wait(min(debounce, deadline - time.monotonic()))
+        if not more:
+            break
+        changed |= more
+    return changed
+
+def plan_stages(changed, source_map):
+    """변경 경로 → {처음 실행할 단계: slug 집합}"""
+    pending = {}
+    for path in changed:
+        classified = source_map.classify(path)
+        if classified is None:
+            continue
+        kind, slug = classified
+        slugs = pending.setdefault(SOURCE_STAGES[kind], set())
+        if slug is not None:
+            slugs.add(slug)
+    return pending
+
+class PipelineContext:
+    """단계 실행에 필요한 공용 상태 (카탈로그 연결은 필요할 때 한 번만 열기)"""
+
+    def __init__(self, svg_dir):
+        self.svg_dir = Path(svg_dir)
+        self.svg_paths = {}             # slug → 마지막으로 동기화(또는 변경)된 canva SVG 경로
+        self._conn = None
+
+    @property
+    def conn(self):
+        """카탈로그 DB 연결 (처음이면 기존 CSV 가져오기, 그 뒤로는 외부에서 수정된 CSV가 있으면 다시 가져오기)"""
+        if self._conn is None:
+            self._conn, _ = quiz_catalog.open_catalog()
+        else:
+            quiz_catalog.sync_from_csvs(self._conn)
+        return self._conn
+
+    def svg_path(self, slug):
+        """slug의 최신 canva SVG 경로 (없으면 None)
+
+        동기화 결과에 기록된 경로를 우선 사용하고, 없으면 평면('<slug>.svg')과
+        난이도 폴더('<tier>/<접두어>_<slug>.svg') 사본 중 가장 최근에 바뀐 파일을 사용.
+        """
+        path = self.svg_paths.get(slug)
+        if path is not None and path.exists():
+            return path
+        candidates = [path for path, _ in asset_index.get_index().walk(CANVA_SVG_DIR)
+                      if path.suffix == '.svg' and svg_slug(path) == slug]
+        if not candidates:
+            return None
+        return max(candidates, key=lambda candidate: candidate.stat().st_mtime_ns)
+
+def stage_classify(slugs, context):
+    """난이도 구간 설정이 바뀌면 전체 재분류 (국가 단위로 나눌 수 없는 유일한 단계)"""
+    classify_flags_by_difficulty.create_difficulty_classification()
+    return set()
+
+def stage_sync(slugs, context):
+    """원본 SVG 폴더를 canva_upload_ready로 증분 동기화 (원본이 곧 canva 폴더면 그대로 통과)"""
+    if _key(context.svg_dir) != _key(CANVA_SVG_DIR):
+        manifest = optimize_for_canva.load_manifest()
+        changed = []
+        counts = optimize_for_canva.sync_tree(context.svg_dir, CANVA_SVG_DIR, manifest, changed)
+        optimize_for_canva.save_manifest(manifest)
+        optimize_for_canva.print_sync_counts("SVG 동기화", counts)
+        # 바뀐 국기가 난이도 폴더 사본이면 PNG/색 단계가 그 사본을 읽도록 실제 쓴 경로를 기록
+        for target in sorted(changed, key=lambda target: target.stat().st_mtime_ns):
+            context.svg_paths[svg_slug(target)] = target
+    else:
+        asset_index.get_index().refresh_dir(CANVA_SVG_DIR, recursive=True, check_files=True)
+    return slugs
+
+def png_targets(slugs):
+    """slug → 이미 만들어져 있는 PNG 경로 목록 (국가명, 난이도 번호, 세트 번호 파일명 모두)"""
+    targets = {}
+    for path in asset_index.get_index().files(PNG_DIR, '.png') if PNG_DIR.exists() else []:
+        name = path.name
+        if name.startswith('Set_') and name.endswith(').png'):
+            slug = name[name.index('(') + 1:-5]
+        else:
+            slug = svg_slug(path)
+        if slug in slugs:
+            targets.setdefault(slug, []).append(path)
+    return targets
+
+def stage_png(slugs, context):
+    """바뀐 국기의 PNG만 다시 변환 (기존에 없던 PNG는 만들지 않음)"""
+    rendered = set()
+    for slug, paths in sorted(png_targets(slugs).items()):
+        svg_path = context.svg_path(slug)
+        if svg_path is None:
+            print(f"⚠️  SVG가 없어 PNG를 갱신하지 않습니다: {slug}")
+            continue
+        if all(convert_svg_to_png.convert_svg_to_png(svg_path, path, PNG_SIZE) for path in paths):
+            rendered.add(slug)
+            instrumentation.progress(f"  🔄 {slug}: PNG {len(paths)}개 갱신")
+    return rendered
+
+def stage_colors(slugs, context):
+    """바뀐 국기의 주요 색만 다시 추출해 country_meta 갱신"""
+    existing = {row['slug'] for row in context.conn.execute("SELECT slug FROM country_meta")}
+    paths = {slug: context.svg_path(slug) for slug in sorted(slugs & existing)}
+    updates = [(','.join(country_metadata.flag_colors(path)), slug) for slug, path in paths.items() if path]
+    with context.conn:
+        context.conn.executemany("UPDATE country_meta SET colors = ? WHERE slug = ?", updates)
+    return {slug for _, slug in updates}
+
+def stage_names(slugs, context):
+    """countries.json과 카탈로그 국가명 비교 → 바뀐 국가명과 그 이름을 쓰는 선택지만 수정"""
+    conn = context.conn
+    countries = quiz_catalog.load_countries_json()
+    affected = set()
+    with conn:
+        for row in conn.execute("SELECT slug, code, name FROM countries WHERE code IS NOT NULL").fetchall():
+            new_name = countries.get(row['code'])
+            if not new_name or new_name == row['name']:
+                continue
+            conn.execute("UPDATE countries SET name = ? WHERE slug = ?", (new_name, row['slug']))
+            affected.add(row['slug'])
+            for option in ('option_a', 'option_b', 'option_c', 'option_d'):
+                for question in conn.execute(f"SELECT slug FROM questions WHERE {option} = ?", (row['name'],)):
+                    affected.add(question['slug'])
+                conn.execute(f"UPDATE questions SET {option} = ? WHERE {option} = ?", (new_name, row['name']))
+            print(f"  ✏️  {row['name']} → {new_name}")
+    return affected
+
+def stage_regions(slugs, context):
+    """country_regions.json 변경 → 대륙/세부 지역이 달라진 국가만 country_meta 갱신"""
+    conn = context.conn
+    regions = country_metadata.load_regions()
+    current = country_metadata.load_metadata(conn)
+    updates = []
+    for slug, meta in current.items():
+        region = regions.get(meta['code'] or '', {})
+        if (region.get('continent'), region.get('subregion')) != (meta['continent'], meta['subregion']):
+            updates.append((region.get('continent'), region.get('subregion'), slug))
+    with conn:
+        conn.executemany("UPDATE country_meta SET continent = ?, subregion = ? WHERE slug = ?", updates)
+    return {slug for _, _, slug in updates}
+
+def stage_exports(slugs, context):
+    """카탈로그 → CSV export, 마지막 배포 대비 바뀐 행만 delta로 저장"""
+    if not slugs:
+        return set()
+    delta_export.export_deltas(context.conn)
+    quiz_catalog.export_all(context.conn)
+    if quiz_catalog.CANVA_QUIZ_CSV.parent.exists():
+        asset_store.publish(quiz_catalog.QUIZ_CSV, quiz_catalog.CANVA_QUIZ_CSV)
+    return slugs
+
+def stage_cards(slugs, context):
+    """영향받은 국가의 퀴즈 카드만 다시 렌더링 (카드를 만든 적이 없으면 건너뜀)"""
+    if not render_quiz_cards.OUTPUT_DIR.exists():
+        return set()
+    render_quiz_cards.render_all_cards(slugs=slugs)
+    return slugs
+
+STAGES = {
+    'classify': stage_classify,
+    'sync': stage_sync,
+    'png': stage_png,
+    'colors': stage_colors,
+    'names': stage_names,
+    'regions': stage_regions,
+    'exports': stage_exports,
+    'cards': stage_cards,
+}
+
+def run_stages(pending, context, dry_run=False):
+    """의존성 순서대로 단계 실행, 각 단계가 반환한 slug만 하위 단계로 전달"""
+    pending = {stage: set(slugs) for stage, slugs in pending.items()}
+    for stage in STAGE_ORDER:
+        if stage not in pending:
+            continue
+        slugs = pending.pop(stage)
+        label = f"{stage} ({len(slugs)}개 국가)" if slugs else stage
+        if dry_run:
+            print(f"  📝 {label}")
+            affected = slugs
+        else:
+            print(f"  ▶️  {label}")
+            with instrumentation.span(f"watch_{stage}", countries=len(slugs)):
+                affected = STAGES[stage](slugs, context)
+        for child in STAGE_GRAPH[stage]:
+            if affected:
+                pending.setdefault(child, set()).update(affected)
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="소스 변경을 감시하고 영향받는 단계만 다시 실행")
+    parser.add_argument('--poll', action='store_true', help="inotify 대신 폴링으로 감시")
+    parser.add_argument('--interval', type=float, default=POLL_INTERVAL, help="폴링 간격 (초)")
+    parser.add_argument('--debounce', type=float, default=DEBOUNCE_SECONDS, help="이벤트를 모으는 대기 시간 (초)")
+    parser.add_argument('--dry-run', action='store_true', help="실행할 단계만 출력")
+    parser.add_argument('--quiet', action='store_true', help="파일별 출력 생략")
+    args = parser.parse_args()
+    if args.quiet:
+        instrumentation.set_quiet()
+
+    print("👀 파이프라인 감시 모드")
+    print("=" * 60)
+
+    svg_dir = svg_source_dir()
+    source_map = SourceMap(svg_dir)
+    watcher = create_watcher(source_map, args.poll, args.interval)
+    context = PipelineContext(svg_dir)
+    print(f"📁 SVG: {svg_dir}/ ({type(watcher).__name__})")
+    print(f"⚙️  설정: {', '.join(sorted(source_map.configs))}")
+    print("단계 순서: " + " → ".join(STAGE_ORDER))
+    print("(Ctrl+C로 종료)")
+
+    try:
+        while True:
+            changed = collect_changes(watcher, args.debounce)
+            pending = plan_stages(changed, source_map)
+            if not pending:
+                continue
+            print(f"\n🔔 변경 {len(changed)}개: {', '.join(sorted(changed)[:5])}{' ...' if len(changed) > 5 else ''}")
+            start = time.perf_counter()
+            try:
+                run_stages(pending, context, args.dry_run)
+            except Exception as e:
+                # 한 번의 실패로 감시를 멈추지 않음
+                print(f"❌ 단계 실행 실패: {e}")
+                continue
+            print(f"✅ 처리 완료 ({time.perf_counter() - start:.2f}초)")
+    except KeyboardInterrupt:
+        print("\n👋 감시 종료")
+    finally:
+        watcher.close()
+    return True
+
+if __name__ == "__main__":
+    main()